@@ -1,5 +1,107 @@
+import threading
+import time
+
 from celery import Celery
+from celery.signals import after_task_publish, before_task_publish, task_postrun, task_prerun, worker_ready
+
+from apps.celery_app.audit import find_unconsumed_result_tasks
+from config import TRACING_ENABLED
+from logger import setup_logger
+from metrics import CELERY_ENQUEUE_LATENCY
+from tracing import create_span, current_context, extract, finish_span
 
 app = Celery()
 app.config_from_object("apps.celery_app.celery_config")
 app.autodiscover_tasks(["apps.celery_app.tasks.email.tasks.*"])
+
+logger = setup_logger("CELERY_APP")
+# before/after_task_publish ayni thread icinde ardisik calisir
+_publish_state = threading.local()
+# task_prerun'da baslayan spanler task_postrun'da task id ile bulunur
+_task_spans: dict = {}
+
+
+@worker_ready.connect
+def audit_task_results(sender, **kwargs):
+    """
+    Worker hazir oldugunda, sonucu saklanip okunmayan task olup olmadigini kontrol eder
+    """
+    unconsumed_tasks = find_unconsumed_result_tasks(app)
+    if unconsumed_tasks:
+        logger.error(
+            "Tasks store results that nobody consumes. Set ignore_result=True or add them to RESULT_CONSUMED_TASKS",
+            extra={"tasks": unconsumed_tasks},
+        )
+
+
+@before_task_publish.connect
+def publish_started(sender=None, headers=None, **kwargs):
+    """
+    Task mesajinin yayinlanmaya basladigi zamani kaydeder
+    """
+    if headers and "id" in headers:
+        _publish_state.started = (headers["id"], time.perf_counter())
+
+
+@after_task_publish.connect
+def publish_finished(sender=None, headers=None, **kwargs):
+    """
+    Task mesajinin broker'a yayinlanma suresini metriklere ekler
+    """
+    task_id, started = getattr(_publish_state, "started", (None, None))
+    if headers and task_id is not None and headers.get("id") == task_id:
+        CELERY_ENQUEUE_LATENCY.labels(task=sender).observe(time.perf_counter() - started)
+        _publish_state.started = (None, None)
+
+
+def trace_publish_started(sender=None, headers=None, routing_key=None, **kwargs):
+    """
+    Yayinlanan task icin producer span'i olusturur, traceparent'i mesaj basliklarina ekler
+    Span aktif yapilmaz; yayin hata verirse after_task_publish calismaz ve baglam kirlenmez
+    """
+    if headers is None:
+        return
+    span = create_span(
+        f"publish {sender}",
+        "producer",
+        {"messaging.system": "celery", "messaging.destination": routing_key or "", "celery.task_id": headers.get("id")},
+    )
+    headers["traceparent"] = span.context.to_traceparent()
+    _publish_state.span = span
+
+
+def trace_publish_finished(sender=None, **kwargs):
+    span = getattr(_publish_state, "span", None)
+    if span is not None:
+        _publish_state.span = None
+        finish_span(span)
+
+
+def trace_task_started(sender=None, task_id=None, task=None, **kwargs):
+    """
+    Task govdesini, mesajdaki traceparent'in altinda bir consumer span'i ile sarar
+    """
+    request = task.request
+    traceparent = getattr(request, "traceparent", None) or (request.headers or {}).get("traceparent")
+    span = create_span(sender.name, "consumer", {"celery.task_id": task_id}, parent=extract(traceparent))
+    _task_spans[task_id] = (span, current_context.set(span.context))
+
+
+def trace_task_finished(sender=None, task_id=None, state=None, **kwargs):
+    span_state = _task_spans.pop(task_id, None)
+    if span_state is None:
+        return
+    span, token = span_state
+    current_context.reset(token)
+    span.set_attribute("celery.state", state or "")
+    if state == "FAILURE":
+        span.error = "Task failed"
+    finish_span(span)
+
+
+if TRACING_ENABLED:
+    # Tracing kapaliyken sinyallere baglanilmaz, yayin ve task calismasina ek maliyet getirmez
+    before_task_publish.connect(trace_publish_started)
+    after_task_publish.connect(trace_publish_finished)
+    task_prerun.connect(trace_task_started)
+    task_postrun.connect(trace_task_finished)
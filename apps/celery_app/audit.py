@@ -0,0 +1,15 @@
+from celery import Celery
+
+from apps.celery_app.constants import RESULT_CONSUMED_TASKS
+
+
+def find_unconsumed_result_tasks(celery_app: Celery) -> list[str]:
+    """
+    Sonucunu result backend'e yazan fakat RESULT_CONSUMED_TASKS icinde olmayan tasklari doner
+    Bos olmayan liste; kimsenin okumadigi sonuclarin Redis'te biriktigi anlamina gelir
+    """
+    return sorted(
+        name
+        for name, task in celery_app.tasks.items()
+        if not name.startswith("celery.") and not task.ignore_result and name not in RESULT_CONSUMED_TASKS
+    )
@@ -1,33 +1,69 @@
 from kombu import Exchange, Queue
 from datetime import timedelta
-from config import REDIS_ADDR, REDIS_PORT, redis_db
+from config import (
+    CELERY_RESULT_EXPIRES,
+    CELERY_WORKER_MAX_MEMORY_PER_CHILD,
+    CELERY_WORKER_MAX_TASKS_PER_CHILD,
+    CELERY_WORKER_PREFETCH_MULTIPLIER,
+    REDIS_ADDR,
+    REDIS_DB,
+    REDIS_KEY_MODE,
+    REDIS_KEY_PREFIX,
+    REDIS_PORT,
+    redis_db,
+)
 
-broker_url = f"redis://{REDIS_ADDR}:{REDIS_PORT}/{redis_db}"
-result_backend = f"redis://{REDIS_ADDR}:{REDIS_PORT}/{redis_db}"
+# prefixed modunda Celery de uygulamanin kullandigi DB'ye yazar, anahtarlari REDIS_KEY_PREFIX ile ayrilir
+celery_redis_db = REDIS_DB if REDIS_KEY_MODE == "prefixed" else redis_db
+broker_url = f"redis://{REDIS_ADDR}:{REDIS_PORT}/{celery_redis_db}"
+result_backend = f"redis://{REDIS_ADDR}:{REDIS_PORT}/{celery_redis_db}"
+# Sonucu okunmayan tasklar backend'e yazmaz, sonucu gereken task ignore_result=False ile acar
+task_ignore_result = True
+result_expires = CELERY_RESULT_EXPIRES
 
-worker_max_tasks_per_child = 10
-worker_max_memory_per_child = 100000
+worker_max_tasks_per_child = CELERY_WORKER_MAX_TASKS_PER_CHILD
+worker_max_memory_per_child = CELERY_WORKER_MAX_MEMORY_PER_CHILD
 task_acks_late = True
-worker_prefetch_multiplier = 1
+worker_prefetch_multiplier = CELERY_WORKER_PREFETCH_MULTIPLIER
 broker_heartbeat = 30
 broker_connection_retry_on_startup = True
 worker_log_format = "[%(asctime)s: %(levelname)s/%(processName)s] %(message)s"
 worker_task_log_format = "[%(asctime)s: %(levelname)s/%(processName)s] [%(task_name)s(%(task_id)s)] %(message)s"
 task_default_queue = "default-queue"
 
+# Redis broker x-max-priority argumanini dikkate almaz. Bu nedenle gecikmeye duyarli mailler (TFA, aktivasyon)
+# ile toplu hatirlatma mailleri ayri kuyruklarda tutulur. "priority" stratejisi ile worker, -Q ile verilen
+# sirayla kuyruklari bosaltir; email-priority her zaman email-bulk'tan once tuketilir
+broker_transport_options = {"queue_order_strategy": "priority"}
+if REDIS_KEY_MODE == "prefixed":
+    broker_transport_options["global_keyprefix"] = f"{REDIS_KEY_PREFIX}:celery:"
+    result_backend_transport_options = {"global_keyprefix": f"{REDIS_KEY_PREFIX}:celery:"}
+
 task_queues = [
-    Queue(
-        "default-queue", Exchange("default-queue"), routing_key="default-queue", queue_arguments={"x-max-priority": 7}
-    ),
-    Queue(
-        "email-actions", Exchange("email-actions"), routing_key="email-actions", queue_arguments={"x-max-priority": 10}
-    ),
+    Queue("email-priority", Exchange("email-priority"), routing_key="email-priority"),
+    Queue("email-bulk", Exchange("email-bulk"), routing_key="email-bulk"),
+    Queue("default-queue", Exchange("default-queue"), routing_key="default-queue"),
+    # Onceki surumde tum mail tasklari email-actions kuyruguna gidiyordu. Deploy aninda kuyrukta kalan mesajlarin
+    # tuketilmesi icin bir surum daha dinlenir, yeni task bu kuyruga yonlendirilmez. Sonraki surumde kaldirilacak
+    Queue("email-actions", Exchange("email-actions"), routing_key="email-actions"),
 ]
 
 task_routes = {
-    "apps.celery_app.tasks.email.tasks.*": {
-        "queue": "email-actions",
-        "routing_key": "email-actions",
+    "apps.celery_app.tasks.email.tasks.send_tfa_code_mail": {
+        "queue": "email-priority",
+        "routing_key": "email-priority",
+    },
+    "apps.celery_app.tasks.email.tasks.send_activate_account_mail": {
+        "queue": "email-priority",
+        "routing_key": "email-priority",
+    },
+    "apps.celery_app.tasks.email.tasks.send_todo_estimate_mail": {
+        "queue": "email-bulk",
+        "routing_key": "email-bulk",
+    },
+    "apps.celery_app.tasks.email.tasks.check_end_dates": {
+        "queue": "default-queue",
+        "routing_key": "default-queue",
     },
 }
 
@@ -35,6 +71,5 @@ beat_schedule = {
     "user_task_check_beat": {
         "task": "apps.celery_app.tasks.email.tasks.check_end_dates",
         "schedule": timedelta(hours=12),
-        "options": {"priority": 5},
     }
 }
@@ -13,4 +13,8 @@ task_retry_kwargs = {
     "retry_backoff": TASK_RETRY_COUNTDOWN,
     "retry_jitter": True,
 }
+# Sonucu result backend'den okunan tasklar
+# ignore_result=False olan her task burada listelenmelidir, bkz. audit.find_unconsumed_result_tasks
+RESULT_CONSUMED_TASKS: frozenset[str] = frozenset()
+
 TEMPLATES_DIR = Path(__file__).resolve().parent / "mail_templates"
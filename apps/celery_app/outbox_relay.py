@@ -0,0 +1,82 @@
+import time
+
+from apps.celery_app import app
+from apps.models.db import DBMailOutbox
+from config import OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_POLL_INTERVAL
+from database import db_session
+from logger import setup_logger
+from tracing import extract, start_span
+
+logger = setup_logger("OUTBOX_RELAY")
+
+
+def relay_batch(batch_size: int = OUTBOX_BATCH_SIZE) -> tuple[int, int]:
+    """
+    Outbox tablosundan bir grup kaydi tek broker baglantisi ile Celery'e iletir
+    Iletilen kayitlar silinir, (iletilen kayit sayisi, okunan kayit sayisi) doner
+
+    Broker baglanti hatasinda tur sonlanir, kalan kayitlar deneme sayisi artmadan bir sonraki turda tekrar denenir
+    Kayda ozel hatalarda (orn. serilestirme) kaydin deneme sayisi artar ve siradaki kayda gecilir
+    OUTBOX_MAX_ATTEMPTS denemeye ulasan kayit ERROR ile log'lanip silinir
+
+    Iletim en az bir kez (at-least-once) garantilidir; commit oncesi bir hata olursa
+    ayni mail tekrar gonderilebilir
+    """
+    with db_session() as session:
+        rows: list[DBMailOutbox] = (
+            session.query(DBMailOutbox)
+            .order_by(DBMailOutbox.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        sent = failed = 0
+        try:
+            with app.producer_or_acquire() as producer:
+                broker_errors = producer.connection.connection_errors + producer.connection.channel_errors
+                for row in rows:
+                    # Yayin, kaydi olusturan istegin trace'i altinda yapilir
+                    parent = extract((row.headers or {}).get("traceparent"))
+                    try:
+                        with start_span("outbox relay", attributes={"celery.task_name": row.task_name}, parent=parent):
+                            app.send_task(row.task_name, args=row.args, producer=producer)
+                    except broker_errors:
+                        raise
+                    except Exception:
+                        failed += 1
+                        row.attempts += 1
+                        log_data = {"outbox_id": row.id, "task_name": row.task_name, "attempts": row.attempts}
+                        if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+                            logger.error("Outbox task is dropped after max attempts", exc_info=True, extra=log_data)
+                            session.delete(row)
+                        else:
+                            logger.warning("Outbox task could not be published", exc_info=True, extra=log_data)
+                        continue
+                    session.delete(row)
+                    sent += 1
+        except Exception:
+            logger.error(
+                "Outbox relay could not publish tasks", exc_info=True, extra={"pending": len(rows) - sent - failed}
+            )
+        return sent, len(rows)
+
+
+def run() -> None:
+    """
+    Outbox tablosunu surekli olarak bosaltir
+    Tablo bos veya broker erisilemez ise OUTBOX_POLL_INTERVAL kadar bekler
+    """
+    logger.info("Outbox relay started", extra={"batch_size": OUTBOX_BATCH_SIZE})
+    while True:
+        try:
+            sent, fetched = relay_batch()
+        except Exception:
+            logger.error("Outbox relay database error", exc_info=True)
+            sent, fetched = 0, 0
+
+        if fetched < OUTBOX_BATCH_SIZE or sent < fetched:
+            time.sleep(OUTBOX_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    run()
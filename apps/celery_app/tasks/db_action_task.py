@@ -1,5 +1,10 @@
-from celery import Task
-from database import db_session
+from celery import Task, states
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from logger import setup_logger
+
+logger = setup_logger("DB_ACTION_TASK")
 
 
 class DBActionTask(Task):
@@ -8,18 +13,32 @@ class DBActionTask(Task):
     edilmesi icin yazilmis base sinif
 
     Kullanildigi her taske bir db session acar
+    Session before_start ile alinir, after_return ile commit/rollback yapilip kapatilir
+    ve task_id kaydi silinir. Boylece worker omru boyunca sessions sozlugu buyumez
     """
 
     def __init__(self):
-        self.sessions = {}
+        self.sessions: dict[str, Session] = {}
 
     def before_start(self, task_id, args, kwargs):
-        self.sessions[task_id] = db_session()
+        self.sessions[task_id] = SessionLocal(expire_on_commit=False)
         super().before_start(task_id, args, kwargs)
 
     def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        session = self.sessions.pop(task_id, None)
+        if session is not None:
+            try:
+                if status == states.SUCCESS:
+                    session.commit()
+                else:
+                    session.rollback()
+            except Exception:
+                logger.error("Task session could not be finalized", exc_info=True, extra={"task_id": task_id})
+                session.rollback()
+            finally:
+                session.close()
         super().after_return(status, retval, task_id, args, kwargs, einfo)
 
     @property
-    def session(self):
+    def session(self) -> Session:
         return self.sessions[self.request.id]
@@ -0,0 +1,31 @@
+from sqlalchemy.orm import Session
+
+from apps.models.db import DBTaskStatus, DBUser
+from apps.models.exceptions.query import StatusNotFound, UserNotFound
+
+
+def get_status(session: Session, user_id: int, status_id: int) -> DBTaskStatus:
+    """
+    Celery taskleri icin senkron status sorgusu
+    Session, DBActionTask tarafindan saglanir
+    """
+    status = (
+        session.query(DBTaskStatus)
+        .where((DBTaskStatus.user_id == user_id) & (DBTaskStatus.id == status_id))
+        .limit(1)
+        .one_or_none()
+    )
+    if status is None:
+        raise StatusNotFound("Status not found!")
+    return status
+
+
+def get_active_user(session: Session, user_id: int) -> DBUser:
+    """
+    Celery taskleri icin senkron kullanici sorgusu
+    Session, DBActionTask tarafindan saglanir
+    """
+    user = session.query(DBUser).where(DBUser.id == user_id).limit(1).one_or_none()
+    if user is None:
+        raise UserNotFound("User not found!")
+    return user
@@ -0,0 +1,190 @@
+import asyncio
+import time
+
+import redis.asyncio as redis
+from fastapi import FastAPI
+from sqlalchemy import Engine, text
+
+from apps.celery_app import app as celery_app
+from apps.controllers.RedisController import RedisController
+from apps.controllers.utils import check_mail_server
+from config import HEALTH_CHECK_INTERVAL, MAIL_HEALTH_CHECK_INTERVAL
+from database import engine, replica_engines
+from logger import setup_logger
+
+logger = setup_logger("HEALTH_CONTROLLER")
+
+
+class HealthController:
+    """
+    Bagimliliklarin saglik durumunu arka planda kontrol edip onbellekte tutar
+    Health endpointleri sadece bu onbellegi okur, probe istekleri DB/Redis/broker'a gitmez
+
+    Hazirlik (readiness) veritabani ve Redis'e baglidir
+    Broker ve mail sunucusu bilgi amaclidir; mailler outbox'ta bekleyebildigi icin API'yi durdurmaz
+    """
+
+    _status: dict = {}
+    _checked_at: float = 0.0
+    _task: asyncio.Task | None = None
+    _mail_status: dict = {"ok": False}
+    _mail_checked_at: float | None = None
+    _mail_task: asyncio.Task | None = None
+
+    @staticmethod
+    def check_engine(target: Engine) -> dict:
+        """
+        Engine'e SELECT 1 gonderir ve baglanti havuzu bilgisini doner
+        """
+        pool = target.pool
+        pool_info = {
+            "size": getattr(pool, "size", lambda: None)(),
+            "checked_in": getattr(pool, "checkedin", lambda: None)(),
+            "checked_out": getattr(pool, "checkedout", lambda: None)(),
+            "overflow": getattr(pool, "overflow", lambda: None)(),
+        }
+        try:
+            with target.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return {"ok": True, "pool": pool_info}
+        except Exception as exc:
+            return {"ok": False, "pool": pool_info, "error": type(exc).__name__}
+
+    @classmethod
+    def check_database(cls) -> dict:
+        """
+        Primary veritabanini ve (tanimliysa) replikalari kontrol eder
+        Okumalar primary'e dusebildigi icin replikalar hazir olma durumunu etkilemez
+        """
+        result = cls.check_engine(engine)
+        if replica_engines:
+            result["replicas"] = {replica.pool.label: cls.check_engine(replica) for replica in replica_engines}
+        return result
+
+    @staticmethod
+    async def check_redis() -> dict:
+        """
+        RedisController havuzlarindaki her DB index'i (shard modunda her node) ve Redis Cluster icin ping atar
+        """
+        results = {}
+        for db_index, pool in list(RedisController._pools.items()):
+            pool_info = {
+                "available": len(getattr(pool, "_available_connections", [])),
+                "in_use": len(getattr(pool, "_in_use_connections", [])),
+                "max": pool.max_connections,
+            }
+            try:
+                client = redis.Redis(connection_pool=pool)
+                ok = bool(await asyncio.wait_for(client.ping(), timeout=2))
+                results[str(db_index)] = {"ok": ok, "pool": pool_info}
+            except Exception as exc:
+                results[str(db_index)] = {"ok": False, "pool": pool_info, "error": type(exc).__name__}
+
+        cluster = RedisController._cluster
+        if cluster is not None:
+            try:
+                ok = bool(await asyncio.wait_for(cluster.ping(), timeout=2))
+                results["cluster"] = {"ok": ok, "nodes": len(cluster.get_nodes())}
+            except Exception as exc:
+                results["cluster"] = {"ok": False, "error": type(exc).__name__}
+        return results
+
+    @staticmethod
+    def check_broker() -> dict:
+        """
+        Celery broker baglantisini kontrol eder
+        """
+        try:
+            with celery_app.connection_for_write() as conn:
+                conn.ensure_connection(max_retries=1, timeout=2)
+            return {"ok": True}
+        except Exception as exc:
+            return {"ok": False, "error": type(exc).__name__}
+
+    @classmethod
+    async def check_mail(cls) -> None:
+        """
+        Mail sunucusuna baglanip giris yapar ve sonucu _mail_status'a yazar
+        """
+        try:
+            await check_mail_server()
+            if not cls._mail_status["ok"]:
+                logger.info("Mail server active")
+            cls._mail_status = {"ok": True}
+        except Exception as exc:
+            if cls._mail_status["ok"] or cls._mail_checked_at is None:
+                logger.warning("Mail server is not ready. Mails wait in the outbox/queue until it is reachable")
+            cls._mail_status = {"ok": False, "error": type(exc).__name__}
+        cls._mail_checked_at = time.monotonic()
+
+    @classmethod
+    def schedule_mail_check(cls) -> None:
+        """
+        Mail kontrolu MAIL_HEALTH_CHECK_INTERVAL saniyede bir ayri bir gorevde calisir
+        SMTP baglantisi 15 saniyeye kadar surebildigi icin diger kontroller onu beklemez
+        """
+        if cls._mail_task is not None and not cls._mail_task.done():
+            return
+        if cls._mail_checked_at is None or time.monotonic() - cls._mail_checked_at >= MAIL_HEALTH_CHECK_INTERVAL:
+            cls._mail_task = asyncio.create_task(cls.check_mail())
+
+    @classmethod
+    async def refresh(cls, app: FastAPI) -> None:
+        """
+        Tum kontrolleri eszamanli calistirip onbellegi gunceller
+        Mail sunucusu icin son kontrolun sonucu kullanilir
+        """
+        cls.schedule_mail_check()
+        database, redis_status, broker = await asyncio.gather(
+            asyncio.to_thread(cls.check_database),
+            cls.check_redis(),
+            asyncio.to_thread(cls.check_broker),
+        )
+        ready = database["ok"] and all(item["ok"] for item in redis_status.values())
+        cls._status = {
+            "ready": ready,
+            "database": database,
+            "redis": redis_status,
+            "broker": broker,
+            "mail_server": cls._mail_status,
+        }
+        cls._checked_at = time.monotonic()
+        if not ready:
+            logger.warning("Service is not ready", extra=cls._status)
+
+    @classmethod
+    async def run(cls, app: FastAPI, interval: float = HEALTH_CHECK_INTERVAL) -> None:
+        """
+        Onbellegi interval saniyede bir yenileyen arka plan dongusu
+        """
+        while True:
+            try:
+                await cls.refresh(app)
+            except Exception:
+                logger.error("Health check error", exc_info=True)
+            await asyncio.sleep(interval)
+
+    @classmethod
+    def start(cls, app: FastAPI) -> None:
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.create_task(cls.run(app))
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            cls._task = None
+        if cls._mail_task is not None:
+            cls._mail_task.cancel()
+            cls._mail_task = None
+
+    @classmethod
+    def readiness(cls) -> dict:
+        """
+        Onbellekteki durumu doner
+        Onbellek 3 kontrol suresinden eskiyse (arka plan gorevi durmussa) hazir degil kabul edilir
+        """
+        age = time.monotonic() - cls._checked_at
+        if not cls._status or age > HEALTH_CHECK_INTERVAL * 3:
+            return {"ready": False, "detail": "Health status is stale", "age": round(age, 3)}
+        return {**cls._status, "age": round(age, 3)}
@@ -1,6 +1,9 @@
+import base64
+import html
+import secrets
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from html.parser import HTMLParser
+from string import Formatter
 
 from apps.celery_app.constants import TEMPLATES_DIR
 from config import (
@@ -9,97 +12,175 @@ from config import (
     SMTP_SERVER,
     SMTP_USER,
     SMTP_PASSWORD,
+    SMTP_USE_TLS,
     TFA_TOKEN_EXP,
 )
 from logger import setup_logger
+from tracing import trace_methods
 
 mail_logger = setup_logger("MAIL_CONTROLLER")
 
+# Surec boyunca tum mesajlarda ayni boundary kullanilir
+# Parcalar base64 ile kodlandigi icin govdede "--" ile baslayan satir olusmaz
+MIME_BOUNDARY = f"==============={secrets.token_hex(16)}=="
 
-class MailController:
+
+class _PlainTextExtractor(HTMLParser):
     """
-    Mail gonderim islemlerini kontrol eder
+    HTML template'inden plain-text alternatifi cikarir
+    Linkler "metin (adres)" bicimine cevrilir, head icerigi atlanir
     """
 
-    verify_template: str = None
-    tfa_code_template: str = None
-    task_overdue_template: str = None
+    block_tags = {"p", "div", "h1", "h2", "h3", "br", "hr", "tr", "li"}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[str] = [""]
+        self.hrefs: list[str | None] = []
+        self.in_head = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "head":
+            self.in_head = True
+        elif tag == "a":
+            self.hrefs.append(dict(attrs).get("href"))
+        elif tag in self.block_tags:
+            self.lines.append("")
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.in_head = False
+        elif tag == "a" and self.hrefs:
+            href = self.hrefs.pop()
+            if href:
+                self.lines[-1] += f" ({href})"
+        elif tag in self.block_tags:
+            self.lines.append("")
+
+    def handle_data(self, data):
+        if not self.in_head:
+            self.lines[-1] += data
+
+    def get_text(self) -> str:
+        text_lines: list[str] = []
+        for line in self.lines:
+            line = " ".join(line.split())
+            if line or (text_lines and text_lines[-1]):
+                text_lines.append(line)
+        return "\n".join(text_lines).strip() + "\n"
+
+
+class MailTemplate:
+    """
+    Surec basina bir kez okunup parcalanan mail template'i
 
-    def __init__(self, recipient: str, username: str) -> None:
-        self.recipient = recipient
-        self.username = username
-        MailController.set_templates()
+    str.format template'i literal ve alan parcalarina ayrilir, render sadece birlestirme yapar
+    HTML icine giden degerler escape edilir. Plain-text alternatifi de ayni anda hazirlanir
+    """
+
+    def __init__(self, file_name: str, subject: str) -> None:
+        with open(TEMPLATES_DIR / file_name, "r", encoding="utf-8") as f:
+            html_template = f.read()
+
+        extractor = _PlainTextExtractor()
+        extractor.feed(html_template)
+        extractor.close()
+
+        self.html_parts = self.compile(html_template)
+        self.text_parts = self.compile(extractor.get_text())
+        self.headers = (
+            "MIME-Version: 1.0\n"
+            f'Content-Type: multipart/alternative; boundary="{MIME_BOUNDARY}"\n'
+            f"Subject: {subject}\n"
+            f"From: TodoAPI Project <{SMTP_USER}>\n"
+        )
 
-    @classmethod
-    def set_templates(cls) -> None:
+    @staticmethod
+    def compile(template: str) -> list[tuple[str, int | None]]:
         """
-        Mail template bilgilerini ayarlar
+        Template'i (literal, alan indeksi) parcalarina ayirir
         """
-        if cls.verify_template is None:
-            with open(TEMPLATES_DIR / "verify_account.html", "r", encoding="utf-8") as f:
-                cls.verify_template = f.read()
+        parts = []
+        for literal, field_name, _, _ in Formatter().parse(template):
+            parts.append((literal, int(field_name) if field_name is not None else None))
+        return parts
+
+    @staticmethod
+    def render_parts(parts: list[tuple[str, int | None]], values: tuple[str, ...]) -> str:
+        return "".join(literal + values[field] if field is not None else literal for literal, field in parts)
+
+    @staticmethod
+    def encode_part(content_type: str, content: str) -> str:
+        return (
+            f"--{MIME_BOUNDARY}\n"
+            f'Content-Type: {content_type}; charset="utf-8"\n'
+            "Content-Transfer-Encoding: base64\n\n"
+            f"{base64.encodebytes(content.encode('utf-8')).decode('ascii')}"
+        )
 
-        if cls.tfa_code_template is None:
-            with open(TEMPLATES_DIR / "tfa_code.html", "r", encoding="utf-8") as f:
-                cls.tfa_code_template = f.read()
+    def render(self, recipient: str, *values) -> str:
+        """
+        Verilen degerlerle text ve html parcalarini doldurup gonderime hazir mesaji doner
+        """
+        text_values = tuple(str(value) for value in values)
+        html_values = tuple(html.escape(value) for value in text_values)
+        return (
+            f"{self.headers}To: {recipient}\n\n"
+            f"{self.encode_part('text/plain', self.render_parts(self.text_parts, text_values))}"
+            f"{self.encode_part('text/html', self.render_parts(self.html_parts, html_values))}"
+            f"--{MIME_BOUNDARY}--\n"
+        )
+
+
+@trace_methods
+class MailController:
+    """
+    Mail gonderim islemlerini kontrol eder
+    """
+
+    verify_template = MailTemplate("verify_account.html", "TodoAPI: Verify Account")
+    tfa_code_template = MailTemplate("tfa_code.html", "TodoAPI: Two-Factor Authentication")
+    task_overdue_template = MailTemplate("task_overdue.html", "TodoAPI: Task Overdue Notification")
 
-        if cls.task_overdue_template is None:
-            with open(TEMPLATES_DIR / "task_overdue.html", "r", encoding="utf-8") as f:
-                cls.task_overdue_template = f.read()
+    def __init__(self, recipient: str, username: str) -> None:
+        self.recipient = recipient
+        self.username = username
 
-    def send_mail(self, msg: MIMEMultipart) -> None:
+    def send_mail(self, msg: str) -> None:
         """
         Mail Server'a baglanarak maili gonderir
         """
         with smtplib.SMTP(host=SMTP_SERVER, port=SMTP_PORT, timeout=20) as server:
-            server.starttls()
+            if SMTP_USE_TLS:
+                server.starttls()
             server.login(SMTP_USER, SMTP_PASSWORD)
-            server.sendmail(SMTP_USER, self.recipient, msg.as_string())
+            server.sendmail(SMTP_USER, self.recipient, msg)
 
-    def get_tfa_message(self, code: str) -> MIMEMultipart:
+    def get_tfa_message(self, code: str) -> str:
         """
         TFA icin mail bilgilerini doldurup mesaji olusturur
         """
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = "TodoAPI: Two-Factor Authentication"
-        msg["From"] = f"TodoAPI Project <{SMTP_USER}>"
-        msg["To"] = self.recipient
-        html_template = self.tfa_code_template.format(self.username, code, TFA_TOKEN_EXP)
-        html_part = MIMEText(html_template, "html")
-        msg.attach(html_part)
-        return msg
+        return self.tfa_code_template.render(self.recipient, self.username, code, TFA_TOKEN_EXP)
 
-    def get_verify_message(self, verify_link: str) -> MIMEMultipart:
+    def get_verify_message(self, verify_link: str) -> str:
         """
         Kullanici dogrulamasi icin mail bilgilerini doldurup mesaji olusturur
         """
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = "TodoAPI: Verify Account"
-        msg["From"] = f"TodoAPI Project <{SMTP_USER}>"
-        msg["To"] = self.recipient
-        html_template = self.verify_template.format(
+        return self.verify_template.render(
+            self.recipient,
             self.username,
             ACCOUNT_VERIFY_TOKEN_EXP,
             verify_link,
             verify_link,
         )
-        html_part = MIMEText(html_template, "html")
-        msg.attach(html_part)
-        return msg
-
-    def get_task_overdue_message(self, task_name: str, task_estimate_date: str) -> MIMEMultipart:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = "TodoAPI: Task Overdue Notification"
-        msg["From"] = f"TodoAPI Project <{SMTP_USER}>"
-        msg["To"] = self.recipient
-        html_template = self.task_overdue_template.format(
+
+    def get_task_overdue_message(self, task_name: str, task_estimate_date: str) -> str:
+        return self.task_overdue_template.render(
+            self.recipient,
             self.username,
             task_name,
             task_estimate_date,
         )
-        html_part = MIMEText(html_template, "html")
-        msg.attach(html_part)
-        return msg
 
     def send_verify_mail(self, verify_link: str) -> None:
         """
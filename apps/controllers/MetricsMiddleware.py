@@ -0,0 +1,41 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import REQUEST_COUNT, REQUEST_LATENCY
+
+
+class MetricsMiddleware:
+    """
+    Route bazinda istek sayisi ve sure metriklerini toplar
+    BaseHTTPMiddleware yerine saf ASGI middleware olarak yazilmistir, istek govdesine dokunmaz
+
+    Route etiketi path template'idir (/task/get/{task_id}/); eslesmeyen istekler "unmatched" olarak toplanir
+    Boylece etiket sayisi route sayisiyla sinirli kalir
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method=method, route=route_path).observe(time.perf_counter() - start)
+            REQUEST_COUNT.labels(method=method, route=route_path, status=str(status_code)).inc()
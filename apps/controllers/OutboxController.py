@@ -0,0 +1,36 @@
+from celery import Task
+from sqlalchemy.orm import Session
+
+from apps.models.db import DBMailOutbox
+from database import db_session
+from logger import setup_logger
+from tracing import inject, trace_methods
+
+logger = setup_logger("OUTBOX_CONTROLLER")
+
+
+@trace_methods
+class OutboxController:
+    """
+    Mail tasklerini broker yerine outbox tablosuna yazar
+    Istek suresi broker gecikmesinden bagimsiz olur, broker kapaliyken de mail kaybolmaz
+    Kayitlar apps.celery_app.outbox_relay tarafindan Celery'e iletilir
+    """
+
+    @staticmethod
+    def add(session: Session, task: Task, *args) -> None:
+        """
+        Verilen session'in transaction'ina outbox kaydi ekler
+        Kayit, transaction commit edilirse relay tarafindan gonderilir
+        Tracing aciksa istegin trace context'i de kayda eklenir
+        """
+        session.add(DBMailOutbox(task_name=task.name, args=list(args), headers=inject({}) or None))
+
+    @staticmethod
+    async def enqueue(task: Task, *args) -> None:
+        """
+        Yeni bir session ile outbox kaydi olusturur
+        """
+        with db_session() as session:
+            OutboxController.add(session, task, *args)
+        logger.debug("Task added to outbox", extra={"task_name": task.name})
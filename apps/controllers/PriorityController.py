@@ -1,11 +1,13 @@
+from apps.controllers.ReadYourWrites import ReadYourWrites
 from apps.models.db import DBTaskPriority
 from apps.models.exceptions import PriorityNotFound
-from database import db_session
 from logger import setup_logger
+from tracing import trace_methods
 
 logger = setup_logger("PRIORITY_CONTROLLER")
 
 
+@trace_methods
 class PriorityController:
     """
     Priority ile ilgili islemleri kontrol eder
@@ -18,7 +20,7 @@ class PriorityController:
         """
         Verilen spesifik prority'in bilgisini doner
         """
-        with db_session() as session:
+        async with ReadYourWrites.read_session(user_id) as session:
             priority = (
                 session.query(DBTaskPriority)
                 .where((DBTaskPriority.user_id == user_id) & (DBTaskPriority.id == priority_id))
@@ -38,7 +40,7 @@ class PriorityController:
         """
         Verilen kullanici id bilgisine ait priority listesini doner
         """
-        with db_session() as session:
+        async with ReadYourWrites.read_session(user_id) as session:
             priority_list = session.query(DBTaskPriority).where(DBTaskPriority.user_id == user_id).all()
             dictPriority = [priority.priority_info() for priority in priority_list]
             return {"count": len(dictPriority), "results": dictPriority}
@@ -48,7 +50,7 @@ class PriorityController:
         """
         Yeni bir priority olusturur
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             newPriority = DBTaskPriority(title=title, user_id=user_id)
             session.add(newPriority)
             return {"detail": "Priority create successfully!"}
@@ -58,7 +60,7 @@ class PriorityController:
         """
         Mevcut priority bilgisini gunceller
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             task = (
                 session.query(DBTaskPriority)
                 .where((DBTaskPriority.id == priority_id) & (DBTaskPriority.user_id == user_id))
@@ -77,7 +79,7 @@ class PriorityController:
         """
         Priority bilgisini siler
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             priority = (
                 session.query(DBTaskPriority)
                 .where((DBTaskPriority.id == priority_id) & (DBTaskPriority.user_id == user_id))
@@ -0,0 +1,211 @@
+import asyncio
+import base64
+import cProfile
+import hmac
+import json
+import marshal
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from apps.controllers.RedisController import redis_key
+from apps.controllers.utils import get_redis_connection
+from config import (
+    PROFILING_DIR,
+    PROFILING_FORMAT,
+    PROFILING_INTERVAL,
+    PROFILING_REDIS_DB,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_STORAGE,
+    PROFILING_TOKEN,
+    PROFILING_TTL,
+)
+from logger import setup_logger
+
+logger = setup_logger("PROFILING")
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# Istek id'si dosya adi ve Redis anahtari olarak kullanildigi icin sadece guvenli karakterlere izin verilir
+REQUEST_ID_PATTERN = re.compile(rb"[A-Za-z0-9_-]{1,64}")
+
+
+class StackSampler:
+    """
+    Verilen thread'in stack'ini ayri bir thread'den PROFILING_INTERVAL araliklarla ornekler
+    GIL nedeniyle ornekler gecikebilir, her ornek bir oncekinden bu yana gecen sure ile agirliklandirilir
+    Event loop thread'i ornekleneceginden ayni anda islenen diger isteklerin frame'leri de sonuca girebilir
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: defaultdict[tuple[tuple[str, str, int], ...], float] = defaultdict(float)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="request-profiler", daemon=True)
+
+    def run(self) -> None:
+        last = self.start_time
+        while not self.stopped.wait(self.interval):
+            now = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += now - last
+            last = now
+
+    def start(self) -> None:
+        self.start_time = time.perf_counter()
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+        self.duration = time.perf_counter() - self.start_time
+
+    def to_speedscope(self, name: str) -> bytes:
+        """
+        Ornekleri speedscope "sampled" profil bicimine cevirir
+        """
+        frames: dict[tuple[str, str, int], int] = {}
+        samples, weights = [], []
+        for stack, seconds in self.samples.items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(seconds)
+
+        profile = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "todoapi",
+            "shared": {"frames": [{"name": fn, "file": file, "line": line} for fn, file, line in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+        return json.dumps(profile).encode()
+
+
+class ProfilingMiddleware:
+    """
+    Secilen istekleri profiller ve sonucu istek id'si ile dizine veya Redis'e yazar
+    Istek, X-Profile-Token basligi PROFILING_TOKEN ile eslesirse veya PROFILING_SAMPLE_RATE oraninda secilir
+    Profil, X-Request-ID basligi varsa onunla ve rastgele bir ekle, yoksa yeni bir id ile saklanir
+    Kullanilan id cevaba X-Profile-Id olarak eklenir
+
+    Sadece PROFILING_ENABLED acikken eklenir, kapaliyken istek yoluna hic girmez
+    Surec basina ayni anda tek istek profillenir, digerleri profillenmeden gecer
+    """
+
+    _active = threading.Lock()
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    @staticmethod
+    def get_profile_id(scope: Scope) -> str:
+        """
+        Istek id'sine sunucunun urettigi bir ek koyar, ayni id ile gelen istek mevcut profilin uzerine yazamaz
+        """
+        suffix = uuid.uuid4().hex
+        for name, value in scope["headers"]:
+            if name == b"x-request-id" and REQUEST_ID_PATTERN.fullmatch(value):
+                return f"{value.decode()}-{suffix[:12]}"
+        return suffix
+
+    @staticmethod
+    def should_profile(scope: Scope) -> bool:
+        if PROFILING_TOKEN:
+            for name, value in scope["headers"]:
+                if name == b"x-profile-token":
+                    return hmac.compare_digest(value, PROFILING_TOKEN.encode())
+        return PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not ProfilingMiddleware._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.get_profile_id(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        if PROFILING_FORMAT == "pstats":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), PROFILING_INTERVAL)
+            profiler.start()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            try:
+                if isinstance(profiler, cProfile.Profile):
+                    profiler.disable()
+                    profiler.create_stats()
+                    data = marshal.dumps(profiler.stats)
+                else:
+                    profiler.stop()
+                    data = profiler.to_speedscope(f"{scope['method']} {scope['path']}")
+            finally:
+                ProfilingMiddleware._active.release()
+
+            try:
+                await self.store(profile_id, data)
+                logger.info(
+                    "Request profile stored",
+                    extra={"profile_id": profile_id, "method": scope["method"], "path": scope["path"]},
+                )
+            except Exception:
+                logger.error("Request profile could not be stored", exc_info=True, extra={"profile_id": profile_id})
+
+    @staticmethod
+    async def store(profile_id: str, data: bytes) -> None:
+        """
+        Profili PROFILING_STORAGE ayarina gore dizine veya Redis'e yazar, ayni id'li mevcut profil ezilmez
+        """
+        extension = "pstats" if PROFILING_FORMAT == "pstats" else "speedscope.json"
+        if PROFILING_STORAGE == "redis":
+            # Redis havuzlari decode_responses=True ile acildigi icin ikili veri base64 ile saklanir
+            redis = await get_redis_connection(PROFILING_REDIS_DB)
+            await redis.set(
+                redis_key(f"profile:{profile_id}.{extension}"),
+                base64.b64encode(data).decode("ascii"),
+                ex=PROFILING_TTL,
+                nx=True,
+            )
+            return
+
+        def write() -> None:
+            directory = BASE_DIR / PROFILING_DIR
+            os.makedirs(directory, exist_ok=True)
+            with open(directory / f"{profile_id}.{extension}", "xb") as f:
+                f.write(data)
+
+        await asyncio.to_thread(write)
@@ -0,0 +1,48 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import REQUEST_DB_TIME_THRESHOLD, REQUEST_QUERY_COUNT_THRESHOLD
+from database import QueryStats, query_stats
+from logger import setup_logger
+
+logger = setup_logger("QUERY_STATS")
+
+
+class QueryStatsMiddleware:
+    """
+    Her istek icin calisan sorgu sayisini ve toplam veritabani suresini toplar
+    Canli QueryStats nesnesi istek basinda request.state.db_stats olarak eklenir, handler ve dependency'ler
+    o ana kadarki degerleri okuyabilir. Istek bittiginde son degerler request.state.db_query_count ve
+    request.state.db_time olarak da yazilir (dis middleware'ler icin)
+    Esik degerleri asilirsa yapilandirilmis bir log kaydi olusturulur
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        state = scope.setdefault("state", {})
+        state["db_stats"] = stats
+        token = query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            query_stats.reset(token)
+            state["db_query_count"] = stats.count
+            state["db_time"] = stats.duration
+
+            if stats.count > REQUEST_QUERY_COUNT_THRESHOLD or stats.duration > REQUEST_DB_TIME_THRESHOLD:
+                route = scope.get("route")
+                logger.warning(
+                    "Request exceeded database thresholds",
+                    extra={
+                        "method": scope["method"],
+                        "route": getattr(route, "path", scope["path"]),
+                        "query_count": stats.count,
+                        "db_time": round(stats.duration, 4),
+                    },
+                )
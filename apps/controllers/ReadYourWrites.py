@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.orm import Session
+
+from apps.controllers.RedisController import redis_key
+from apps.controllers.utils import get_redis_connection
+from config import DB_READ_YOUR_WRITES_REDIS_DB, DB_READ_YOUR_WRITES_SECONDS
+from database import db_read_session, db_session, replica_engines
+from logger import setup_logger
+
+logger = setup_logger("READ_YOUR_WRITES")
+
+
+class ReadYourWrites:
+    """
+    Yazma yapan kullanicinin okumalarini DB_READ_YOUR_WRITES_SECONDS boyunca primary'e yonlendirir
+    Replikalar gecikmeli oldugu icin kullanici yeni yazdigi veriyi replikadan okuyamayabilir
+
+    Yazma zamani tum worker'larin gordugu Redis'te last_write:{user_id} anahtarina sure kadar TTL ile yazilir
+    Surec ici kopya sadece hizli yoldur; bu surecte yazma yapan kullanici icin Redis'e gidilmez
+    Redis'e ulasilamazsa okuma primary'e gider
+    """
+
+    # user_id -> son yazma zamani (monotonic), en eski kayit en bastadir
+    _last_writes: OrderedDict[str, float] = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return bool(replica_engines) and DB_READ_YOUR_WRITES_SECONDS > 0
+
+    @classmethod
+    def wrote_recently(cls, user_id: int | str) -> bool:
+        written_at = cls._last_writes.get(str(user_id))
+        return written_at is not None and time.monotonic() - written_at < DB_READ_YOUR_WRITES_SECONDS
+
+    @classmethod
+    def _remember(cls, user_id: str) -> None:
+        now = time.monotonic()
+        with cls._lock:
+            cls._last_writes[user_id] = now
+            cls._last_writes.move_to_end(user_id)
+            while now - next(iter(cls._last_writes.values())) >= DB_READ_YOUR_WRITES_SECONDS:
+                cls._last_writes.popitem(last=False)
+
+    @classmethod
+    async def mark_write(cls, user_id: int | str) -> None:
+        """
+        Kullanicinin yazma zamanini surec ici kopyaya ve Redis'e kaydeder
+        Redis hatasi yazma islemini bozmaz, sadece log'lanir
+        """
+        if not cls.is_enabled():
+            return
+        cls._remember(str(user_id))
+        try:
+            redis = await get_redis_connection(DB_READ_YOUR_WRITES_REDIS_DB)
+            await redis.set(redis_key("last_write", user_id), "", px=int(DB_READ_YOUR_WRITES_SECONDS * 1000))
+        except Exception:
+            logger.warning("Last write could not be stored", exc_info=True, extra={"user_id": user_id})
+
+    @classmethod
+    async def use_primary(cls, user_id: int | str) -> bool:
+        """
+        Kullanici son DB_READ_YOUR_WRITES_SECONDS saniyede (herhangi bir worker'da) yazma yaptiysa True doner
+        """
+        if not cls.is_enabled():
+            return False
+        if cls.wrote_recently(user_id):
+            return True
+        try:
+            redis = await get_redis_connection(DB_READ_YOUR_WRITES_REDIS_DB)
+            return bool(await redis.exists(redis_key("last_write", user_id)))
+        except Exception:
+            logger.warning("Last write could not be read, using primary", exc_info=True, extra={"user_id": user_id})
+            return True
+
+    @classmethod
+    @asynccontextmanager
+    async def write_session(cls, user_id: int | str) -> AsyncGenerator[Session, None]:
+        """
+        db_session'i acar, commit basarili olursa kullanicinin yazma zamanini kaydeder
+        """
+        with db_session() as session:
+            yield session
+        await cls.mark_write(user_id)
+
+    @classmethod
+    @asynccontextmanager
+    async def read_session(cls, user_id: int | str) -> AsyncGenerator[Session, None]:
+        """
+        Kullaniciya ait okumalar icin db_read_session'i acar, yeni yazma yapan kullanici primary'den okur
+        """
+        with db_read_session(primary=await cls.use_primary(user_id)) as session:
+            yield session
@@ -1,40 +1,493 @@
+import asyncio
+import bisect
+import hashlib
+import time
+from collections import OrderedDict
+
 import redis.asyncio as redis
 from fastapi import HTTPException
 from redis.asyncio import ConnectionPool
+from redis.asyncio.client import PubSub
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.commands import AsyncCoreCommands
+from redis.exceptions import ResponseError
 
 from config import (
     REDIS_ADDR,
+    REDIS_CLIENT_CACHE_ENABLED,
+    REDIS_CLIENT_CACHE_MAX_KEYS,
+    REDIS_CLIENT_CACHE_PREFIXES,
+    REDIS_CLIENT_CACHE_TTL,
+    REDIS_DB,
+    REDIS_KEY_MODE,
+    REDIS_KEY_PREFIX,
+    REDIS_NODES,
     REDIS_PASSWORD,
     REDIS_PORT,
+    REDIS_TOPOLOGY,
     REDIS_USERNAME,
 )
 from logger import setup_logger
+from metrics import (
+    REDIS_CLIENT_CACHE_INVALIDATIONS,
+    REDIS_CLIENT_CACHE_REQUESTS,
+    REDIS_CLIENT_CACHE_SIZE,
+    REDIS_COMMAND_LATENCY,
+)
+from tracing import start_span
 
 logger = setup_logger("REDIS_CONTROLLER")
 
+CLIENT_CACHE_PING_INTERVAL = 1.0
+# Tutarli hash halkasinda her node icin sanal nokta sayisi
+SHARD_VIRTUAL_NODES = 160
+# Anahtari olmayan, tum shard'lara gonderilen komutlar
+SHARD_BROADCAST_COMMANDS = {"PING", "FLUSHDB", "FLUSHALL"}
+# Birden fazla anahtar alan komutlar, anahtarlarin hepsi ayni shard'da olmalidir
+SHARD_MULTI_KEY_COMMANDS = {"DEL", "UNLINK", "EXISTS", "TOUCH", "MGET"}
+
+
+def parse_nodes() -> list[tuple[str, int]]:
+    """
+    REDIS_NODES ("host:port,host:port") degerini cozumler, bos ise REDIS_ADDR:REDIS_PORT doner
+    """
+    nodes = []
+    for node in REDIS_NODES.split(","):
+        if node.strip():
+            host, _, port = node.strip().rpartition(":")
+            nodes.append((host, int(port)))
+    return nodes or [(REDIS_ADDR, REDIS_PORT)]
+
+
+def hash_tag(key: str) -> str:
+    """
+    Anahtarin shard secimi icin kullanilan kismini doner
+    Redis Cluster ile ayni kural: bos olmayan ilk {...} varsa sadece icerigi, yoksa anahtarin tamami
+    """
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+def redis_key(name: str, tag: str | int | None = None) -> str:
+    """
+    Uygulamanin Redis anahtar adini olusturur
+    databases modunda mevcut anahtar adlari korunur: redis_key("tfa_code", 42) -> "tfa_code:42"
+    prefixed modunda REDIS_KEY_PREFIX eklenir ve tag hash tag olarak yazilir: "todoapi:tfa_code:{42}"
+    Ayni tag'e sahip anahtarlar (ayni kullanicinin TFA kodu ve mail kilidi gibi) Redis Cluster'da ayni slot'a duser,
+    birlikte kullanildiklari cok anahtarli komutlar (DEL, pipeline) tek node'a gider
+    """
+    if REDIS_KEY_MODE == "prefixed":
+        return f"{REDIS_KEY_PREFIX}:{name}" if tag is None else f"{REDIS_KEY_PREFIX}:{name}:{{{tag}}}"
+    return name if tag is None else f"{name}:{tag}"
+
+
+class ClientSideCache:
+    """
+    Sik okunup seyrek yazilan kucuk anahtarlar icin surec ici, Redis destekli (CLIENT TRACKING) onbellek
+    Sadece REDIS_CLIENT_CACHE_PREFIXES oneklerine uyan anahtarlar onbellege alinir
+
+    Her Redis node'u (cluster ve shard modunda her primary) icin ayri bir baglanti BCAST modunda tracking'i acar
+    ve gecersizlestirme mesajlarini kendine yonlendirir (RESP2, __redis__:invalidate kanali). Boylece oneklere uyan
+    anahtar hangi DB'de, hangi istemci tarafindan yazilirsa yazilsin Redis mesaj gonderir.
+    Mesajlarda DB bilgisi olmadigi icin anahtar tum DB'lerde silinir
+
+    Baglanti koparsa onbellek bosaltilir ve yeniden baglanana kadar okumalar dogrudan Redis'e gider
+    Yazma ile gecersizlestirme mesajinin bu surece ulasmasi arasinda (milisaniyeler) eski deger okunabilir
+    """
+
+    _entries: OrderedDict[tuple[str, str], tuple[str | None, float]] = OrderedDict()
+    _pending: dict[tuple[str, str], object] = {}
+    _dbs: set[str] = set()
+    _prefixes: tuple[str, ...] = tuple(
+        redis_key(prefix.strip()) for prefix in REDIS_CLIENT_CACHE_PREFIXES.split(",") if prefix.strip()
+    )
+    _synced: bool = False
+    _tracking: set[tuple[str, int]] = set()
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def is_cacheable(cls, key: str) -> bool:
+        return REDIS_CLIENT_CACHE_ENABLED and key.startswith(cls._prefixes)
+
+    @classmethod
+    async def get(cls, client: redis.Redis, db: str, key: str) -> str | None:
+        """
+        Anahtari onbellekten, yoksa Redis'ten okur
+        GET suresince gelen gecersizlestirme, eski degerin onbellege yazilmasini engeller
+        """
+        if not cls.is_cacheable(key):
+            return await client.get(key)
+        if not cls._synced:
+            REDIS_CLIENT_CACHE_REQUESTS.labels(db=db, result="bypass").inc()
+            return await client.get(key)
+
+        cache_key = (db, key)
+        entry = cls._entries.get(cache_key)
+        if entry is not None and entry[1] > time.monotonic():
+            cls._entries.move_to_end(cache_key)
+            REDIS_CLIENT_CACHE_REQUESTS.labels(db=db, result="hit").inc()
+            return entry[0]
+
+        REDIS_CLIENT_CACHE_REQUESTS.labels(db=db, result="miss").inc()
+        # invalidate sadece _dbs'deki DB'lerin marker'larini siler, DB GET'ten once eklenmelidir
+        cls._dbs.add(db)
+        marker = cls._pending[cache_key] = object()
+        try:
+            value = await client.get(key)
+        finally:
+            stored = cls._pending.get(cache_key) is marker
+            if stored:
+                del cls._pending[cache_key]
+
+        if stored and cls._synced:
+            cls._entries[cache_key] = (value, time.monotonic() + REDIS_CLIENT_CACHE_TTL)
+            cls._entries.move_to_end(cache_key)
+            while len(cls._entries) > REDIS_CLIENT_CACHE_MAX_KEYS:
+                cls._entries.popitem(last=False)
+            REDIS_CLIENT_CACHE_SIZE.set(len(cls._entries))
+        return value
+
+    @classmethod
+    def invalidate(cls, keys: list[str] | None) -> None:
+        """
+        Verilen anahtarlari tum DB'lerde siler, keys None ise (FLUSHDB/FLUSHALL) onbellegin tamami silinir
+        """
+        if keys is None:
+            REDIS_CLIENT_CACHE_INVALIDATIONS.labels(kind="flush").inc()
+            cls.clear()
+            return
+
+        REDIS_CLIENT_CACHE_INVALIDATIONS.labels(kind="key").inc(len(keys))
+        for key in keys:
+            for db in cls._dbs:
+                cls._entries.pop((db, key), None)
+                cls._pending.pop((db, key), None)
+        REDIS_CLIENT_CACHE_SIZE.set(len(cls._entries))
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
+        cls._pending.clear()
+        REDIS_CLIENT_CACHE_SIZE.set(0)
+
+    @classmethod
+    async def track(cls, host: str, port: int, node_count: int) -> None:
+        """
+        Verilen node'da tracking baglantisini acip gecersizlestirme mesajlarini isler
+        Baglanti CLIENT_CACHE_PING_INTERVAL saniyede bir ping ile kontrol edilir, koparsa hata firlatir
+        """
+        connection = redis.Connection(
+            host=host,
+            port=port,
+            username=REDIS_USERNAME,
+            password=REDIS_PASSWORD,
+            decode_responses=True,
+        )
+        try:
+            await connection.connect()
+            await connection.send_command("CLIENT", "ID")
+            client_id = await connection.read_response()
+            prefix_args = [arg for prefix in cls._prefixes for arg in ("PREFIX", prefix)]
+            await connection.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefix_args)
+            await connection.read_response()
+            await connection.send_command("SUBSCRIBE", "__redis__:invalidate")
+            await connection.read_response()
+            cls._tracking.add((host, port))
+            # Onbellek, tum node'larda tracking acildiktan sonra kullanilir
+            cls._synced = len(cls._tracking) == node_count
+            logger.info(
+                "Redis client side cache is tracking", extra={"node": f"{host}:{port}", "prefixes": cls._prefixes}
+            )
+
+            last_seen = time.monotonic()
+            while True:
+                response = await connection.read_response(timeout=CLIENT_CACHE_PING_INTERVAL)
+                if response is not None:
+                    last_seen = time.monotonic()
+                    if response[0] == "message":
+                        cls.invalidate(response[2])
+                elif time.monotonic() - last_seen > CLIENT_CACHE_PING_INTERVAL * 3:
+                    raise ConnectionError("Redis client side cache tracking connection is not responding")
+                else:
+                    # Abone moddaki PING cevabi ["pong", ""] mesaji olarak gelir
+                    await connection.send_command("PING")
+        finally:
+            await connection.disconnect()
+
+    @classmethod
+    async def run(cls) -> None:
+        """
+        Tum node'larda tracking baglantilarini calistiran arka plan dongusu
+        Herhangi bir baglanti koparsa digerleri de kapatilir, onbellek bosaltilir ve node listesi yeniden alinir
+        """
+        while True:
+            try:
+                nodes = await RedisController.node_addresses()
+                async with asyncio.TaskGroup() as group:
+                    for host, port in nodes:
+                        group.create_task(cls.track(host, port, len(nodes)))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Redis client side cache is disabled until tracking reconnects", exc_info=True)
+            finally:
+                cls._synced = False
+                cls._tracking.clear()
+                cls.clear()
+            await asyncio.sleep(CLIENT_CACHE_PING_INTERVAL)
+
+    @classmethod
+    def start(cls) -> None:
+        if REDIS_CLIENT_CACHE_ENABLED and (cls._task is None or cls._task.done()):
+            cls._task = asyncio.create_task(cls.run())
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            cls._task = None
+
+
+class InstrumentationMixin:
+    """
+    Komut surelerini DB index'i ve komut adina gore olcer
+    Tracing aciksa her komut icin bir span olusturulur
+    """
+
+    db_label: str
+
+    async def execute_command(self, *args, **options):
+        db = self.db_label
+        command = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            with start_span(
+                f"redis {command}", "client", {"db.system": "redis", "db.redis.database_index": db}
+            ):
+                return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(db=db, command=command).observe(time.perf_counter() - start)
+
+    async def cached_get(self, key: str) -> str | None:
+        """
+        GET komutunun istemci tarafli onbellekli hali
+        REDIS_CLIENT_CACHE_ENABLED kapaliysa veya anahtar oneklere uymuyorsa normal GET calistirilir
+        """
+        return await ClientSideCache.get(self, self.db_label, key)
+
+
+class InstrumentedRedis(InstrumentationMixin, redis.Redis):
+    """
+    Tek Redis sunucusu (veya tek shard) icin olculen istemci
+    """
+
+    @property
+    def db_label(self) -> str:
+        return str(self.connection_pool.connection_kwargs.get("db", 0))
+
+
+class InstrumentedRedisCluster(InstrumentationMixin, RedisCluster):
+    """
+    Redis Cluster icin olculen istemci
+    Asenkron RedisCluster pub/sub desteklemez. Cluster'da PUBLISH tum node'lara iletildigi icin
+    abonelikler ilk node'a acilan ayri bir baglanti ile yapilir
+    """
+
+    db_label = "cluster"
+
+    def pubsub(self) -> PubSub:
+        host, port = parse_nodes()[0]
+        client = redis.Redis(
+            host=host, port=port, username=REDIS_USERNAME, password=REDIS_PASSWORD, decode_responses=True
+        )
+        return client.pubsub()
+
+
+class ShardedPipeline(AsyncCoreCommands):
+    """
+    ShardedRedis icin pipeline. Komutlar shard'lara gore gruplanir, her shard'in pipeline'i eszamanli calistirilir
+    ve cevaplar komut sirasina gore birlestirilir. Boylece her shard icin tek round trip yapilir
+    """
+
+    def __init__(self, client: "ShardedRedis", transaction: bool) -> None:
+        self.client = client
+        self.transaction = transaction
+        self.commands: list[tuple[int, tuple, dict]] = []
+
+    async def __aenter__(self) -> "ShardedPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.commands.clear()
+
+    def execute_command(self, *args, **options) -> "ShardedPipeline":
+        self.commands.append((self.client.shard_index(args), args, options))
+        return self
+
+    async def execute(self) -> list:
+        shards: dict[int, list[int]] = {}
+        for position, (shard, _, _) in enumerate(self.commands):
+            shards.setdefault(shard, []).append(position)
+        if self.transaction and len(shards) > 1:
+            raise ResponseError("CROSSSLOT Keys in transaction don't hash to the same shard")
+
+        async def run_shard(shard: int, positions: list[int]) -> list:
+            async with self.client.shards[shard].pipeline(transaction=self.transaction) as pipe:
+                for position in positions:
+                    _, args, options = self.commands[position]
+                    pipe.execute_command(*args, **options)
+                return await pipe.execute()
+
+        shard_results = await asyncio.gather(*(run_shard(shard, positions) for shard, positions in shards.items()))
+        results: list = [None] * len(self.commands)
+        for positions, values in zip(shards.values(), shard_results):
+            for position, value in zip(positions, values):
+                results[position] = value
+        self.commands.clear()
+        return results
+
+
+class ShardedRedis(InstrumentedRedis):
+    """
+    REDIS_NODES'taki bagimsiz Redis sunuculari arasinda istemci tarafli tutarli hash (consistent hashing) ile
+    anahtar dagitan istemci. Redis Cluster kullanilamayan ortamlar icindir
+
+    Shard, anahtarin hash tag'ine (hash_tag) gore secilir; ayni tag'e sahip anahtarlar ayni shard'dadir
+    Cok anahtarli komutlarda anahtarlar farkli shard'lara duserse CROSSSLOT hatasi verilir
+    Pub/sub (PUBLISH ve abonelikler) her zaman ilk shard'da yapilir. Node eklendiginde veya cikarildiginda
+    anahtarlarin yaklasik 1/N'i baska shard'a gecer, bu anahtarlar yeni shard'da bulunamaz
+    """
+
+    def __init__(self, shards: list[InstrumentedRedis]) -> None:
+        super().__init__(connection_pool=shards[0].connection_pool)
+        self.shards = shards
+        ring = []
+        for index, shard in enumerate(shards):
+            kwargs = shard.connection_pool.connection_kwargs
+            name = f"{kwargs['host']}:{kwargs['port']}"
+            ring.extend((self.hash(f"{name}#{point}"), index) for point in range(SHARD_VIRTUAL_NODES))
+        ring.sort()
+        self.ring: list[tuple[int, int]] = ring
+        self.ring_hashes = [point for point, _ in ring]
+
+    @staticmethod
+    def hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def shard_for_key(self, key: str) -> int:
+        position = bisect.bisect(self.ring_hashes, self.hash(hash_tag(key))) % len(self.ring)
+        return self.ring[position][1]
+
+    def shard_index(self, args: tuple) -> int:
+        """
+        Komutun gonderilecegi shard'i doner
+        """
+        command = str(args[0]).upper()
+        if command == "PUBLISH" or len(args) < 2:
+            return 0
+        shard = self.shard_for_key(str(args[1]))
+        if command in SHARD_MULTI_KEY_COMMANDS:
+            if any(self.shard_for_key(str(key)) != shard for key in args[2:]):
+                raise ResponseError("CROSSSLOT Keys in request don't hash to the same shard")
+        return shard
+
+    async def execute_command(self, *args, **options):
+        if str(args[0]).upper() in SHARD_BROADCAST_COMMANDS:
+            results = await asyncio.gather(*(shard.execute_command(*args, **options) for shard in self.shards))
+            return all(results)
+        return await self.shards[self.shard_index(args)].execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> ShardedPipeline:
+        return ShardedPipeline(self, transaction)
+
+    def pubsub(self, **kwargs) -> PubSub:
+        return self.shards[0].pubsub(**kwargs)
+
 
 class RedisController:
     """
     Redis islemlerini yoneten sinif
     Havuz mekanizmasi kullanir
+
+    REDIS_KEY_MODE=databases iken her mantiksal DB index'i icin ayri havuz acilir
+    REDIS_KEY_MODE=prefixed iken verilen index yok sayilir, tum islemler REDIS_DB uzerindeki tek havuzu kullanir
+    ve anahtarlar redis_key ile REDIS_KEY_PREFIX onekiyle ayrilir
+
+    REDIS_TOPOLOGY=cluster iken REDIS_NODES ile verilen Redis Cluster'a, REDIS_TOPOLOGY=sharded iken
+    REDIS_NODES'taki sunuculara tutarli hash ile baglanilir (ikisi de prefixed anahtar modu gerektirir)
     """
 
-    _pools: dict[int, ConnectionPool] = {}
+    _pools: dict[int | str, ConnectionPool] = {}
+    _cluster: InstrumentedRedisCluster | None = None
+    _sharded: ShardedRedis | None = None
 
     def __init__(self, db_index: int = 0) -> None:
         self.host: str = REDIS_ADDR
         self.port: int = REDIS_PORT
-        self.db_index: int = db_index
-        self._redis: redis.Redis | None = None
+        self.db_index: int = db_index if REDIS_KEY_MODE == "databases" else REDIS_DB
+        self._redis: InstrumentedRedis | InstrumentedRedisCluster | None = None
+
+    @classmethod
+    def node_client(cls, host: str, port: int) -> InstrumentedRedis:
+        """
+        Shard modunda verilen node'un havuzunu kullanan istemciyi doner, havuzlar "host:port" ile tutulur
+        """
+        name = f"{host}:{port}"
+        if name not in cls._pools:
+            cls._pools[name] = redis.ConnectionPool(
+                host=host,
+                port=port,
+                db=REDIS_DB,
+                username=REDIS_USERNAME,
+                password=REDIS_PASSWORD,
+                decode_responses=True,
+                socket_timeout=10,
+            )
+        return InstrumentedRedis(connection_pool=cls._pools[name])
+
+    @classmethod
+    async def node_addresses(cls) -> list[tuple[str, int]]:
+        """
+        Komutlarin gonderildigi node'larin adreslerini doner (cluster modunda primary node'lar)
+        """
+        if REDIS_TOPOLOGY == "cluster":
+            cluster = await RedisController().get_redis()
+            return [(node.host, node.port) for node in cluster.get_primaries()]
+        if REDIS_TOPOLOGY == "sharded":
+            return parse_nodes()
+        return [(REDIS_ADDR, REDIS_PORT)]
 
     async def connect(self) -> None:
         """Redis baglantisini baslatir (eger yoksa)"""
+        if REDIS_TOPOLOGY == "cluster":
+            if RedisController._cluster is None:
+                RedisController._cluster = InstrumentedRedisCluster(
+                    startup_nodes=[ClusterNode(host, port) for host, port in parse_nodes()],
+                    username=REDIS_USERNAME,
+                    password=REDIS_PASSWORD,
+                    decode_responses=True,
+                    socket_timeout=10,
+                )
+            self._redis = RedisController._cluster
+            return
+
+        if REDIS_TOPOLOGY == "sharded":
+            # Hash halkasi bir kez olusturulur, tum cagrilar ayni istemciyi kullanir
+            if RedisController._sharded is None:
+                RedisController._sharded = ShardedRedis([self.node_client(host, port) for host, port in parse_nodes()])
+            self._redis = RedisController._sharded
+            return
+
         if self.db_index not in RedisController._pools:
             RedisController._pools[self.db_index] = redis.ConnectionPool(
                 host=self.host, port=self.port, db=self.db_index, decode_responses=True
             )
 
-        self._redis = redis.Redis(
+        self._redis = InstrumentedRedis(
             connection_pool=RedisController._pools[self.db_index],
             username=REDIS_USERNAME,
             password=REDIS_PASSWORD,
@@ -46,8 +499,10 @@ class RedisController:
         if self._redis is None:
             await self.connect()
 
-        assert isinstance(self._redis, redis.Redis)  # mypy
-        if not await self._redis.ping():
+        assert self._redis is not None  # mypy
+        # Cluster/shard modunda PING tum node'lara gider, her cagrida N round trip eder ve tek bir node'un
+        # kopmasi tum islemleri bozar. Bu modlarda node'larin durumu HealthController ile izlenir
+        if REDIS_TOPOLOGY == "single" and not await self._redis.ping():
             logger.error("Redis Server connection refused")
             raise HTTPException(status_code=500, detail="Redis Server Error")
         return self._redis
@@ -59,4 +514,9 @@ class RedisController:
             await pool.disconnect()
             logger.info(f"Redis connection closed for DB_{db_index}")
         cls._pools.clear()
+        cls._sharded = None
+        if cls._cluster is not None:
+            await cls._cluster.aclose()
+            cls._cluster = None
+            logger.info("Redis cluster connection closed")
         logger.info("Redis pool is clean")
@@ -1,11 +1,13 @@
+from apps.controllers.ReadYourWrites import ReadYourWrites
 from apps.models.db import DBTaskStatus
 from apps.models.exceptions import StatusNotFound, DefaultStatusFound
-from database import db_session
 from logger import setup_logger
+from tracing import trace_methods
 
 logger = setup_logger("STATUS_CONTROLLER")
 
 
+@trace_methods
 class StatusController:
     """
     Status ile ilgili islemleri kontrol eder
@@ -18,7 +20,7 @@ class StatusController:
         """
         verilen spesifik statunun bilgisini doner
         """
-        with db_session() as session:
+        async with ReadYourWrites.read_session(user_id) as session:
             status = (
                 session.query(DBTaskStatus)
                 .where((DBTaskStatus.user_id == user_id) & (DBTaskStatus.id == status_id))
@@ -36,7 +38,7 @@ class StatusController:
         """
         verilen kullanci id bilgisine ait statu listesini doner
         """
-        with db_session() as session:
+        async with ReadYourWrites.read_session(user_id) as session:
             status_list = session.query(DBTaskStatus).where(DBTaskStatus.user_id == user_id).all()
             dictStatus = [status.status_info() for status in status_list]
             return {"count": len(dictStatus), "results": dictStatus}
@@ -53,7 +55,7 @@ class StatusController:
         Bu sayede hangi statunun bitis statusu oldugu bilinir.
         Kullanici controller ile bunu degistiremez. Sadece adini guncelleyebilir.
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             new_status = DBTaskStatus(title=title, user_id=user_id, default_status=default_status)
             session.add(new_status)
             return {"detail": "Status create successfully!"}
@@ -63,7 +65,7 @@ class StatusController:
         """
         Mevcut status bilgisini gunceller
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             status = (
                 session.query(DBTaskStatus)
                 .where((DBTaskStatus.user_id == user_id) & (DBTaskStatus.id == status_id))
@@ -82,7 +84,7 @@ class StatusController:
         """
         Status bilgisini siler
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             status = (
                 session.query(DBTaskStatus)
                 .where((DBTaskStatus.id == status_id) & (DBTaskStatus.user_id == user_id))
@@ -1,3 +1,4 @@
+from apps.controllers.ReadYourWrites import ReadYourWrites
 from apps.models.body.Task import BodyTask
 from apps.models.db import DBTask, DBTaskPriority, DBTaskStatus
 from apps.models.exceptions import (
@@ -5,12 +6,13 @@ from apps.models.exceptions import (
     StatusNotFound,
     TaskNotFound,
 )
-from database import db_session
 from logger import setup_logger
+from tracing import trace_methods
 
 logger = setup_logger("TASK_CONTROLLER")
 
 
+@trace_methods
 class TaskController:
     """
     Task veritabani islemlerini kontrol eder
@@ -28,7 +30,7 @@ class TaskController:
         """
         Kullaniciya ait task bilgisini getirir
         """
-        with db_session() as session:
+        async with ReadYourWrites.read_session(user_id) as session:
             task = (
                 session.query(DBTask).where((DBTask.user_id == user_id) & (DBTask.id == task_id)).limit(1).one_or_none()
             )
@@ -43,7 +45,7 @@ class TaskController:
         """
         Kullancinin task bilgilerini doner
         """
-        with db_session() as session:
+        async with ReadYourWrites.read_session(user_id) as session:
             tasks = session.query(DBTask).where((DBTask.user_id == user_id)).all()
             dictTasks = [task.task_info() for task in tasks]
             return {"count": len(dictTasks), "results": dictTasks}
@@ -53,7 +55,7 @@ class TaskController:
         """
         Kullaniciya ait bir task olusturur
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             priority = (
                 session.query(DBTaskPriority).where(DBTaskPriority.id == task_data.priority).limit(1).one_or_none()
             )
@@ -81,7 +83,7 @@ class TaskController:
         """
         Kullanciya ait taski gunceller
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             uTask = (
                 session.query(DBTask).where((DBTask.user_id == user_id) & (DBTask.id == task_id)).limit(1).one_or_none()
             )
@@ -98,7 +100,7 @@ class TaskController:
         """
         Kullaniciya ait taski siler
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             task = (
                 session.query(DBTask).where((DBTask.user_id == user_id) & (DBTask.id == task_id)).limit(1).one_or_none()
             )
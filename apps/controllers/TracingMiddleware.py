@@ -0,0 +1,46 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tracing import extract, start_span
+
+
+class TracingMiddleware:
+    """
+    Her istek icin bir server span'i olusturur, controller/DB/Redis/Celery spanleri bunun altinda toplanir
+    Istekte traceparent basligi varsa trace o baglamdan devam eder
+    Sadece TRACING_ENABLED acikken eklenir
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        with start_span(
+            f"{scope['method']} {scope['path']}",
+            "server",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            parent=extract(traceparent),
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Route eslestikten sonra span adi path template'i ile degistirilir, isim sayisi sinirli kalir
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{scope['method']} {route.path}"
+                    span.set_attribute("http.route", route.path)
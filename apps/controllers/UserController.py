@@ -1,14 +1,17 @@
 from apps.models.body.User import BodyUser
 from apps.models.db import DBUser
 from apps.models.exceptions import UserNotFound
+from .ReadYourWrites import ReadYourWrites
 from .StatusController import StatusController
 from .PriorityController import PriorityController
 from database import db_session
 from logger import setup_logger
+from tracing import trace_methods
 
 logger = setup_logger("USER_CONTROLLER")
 
 
+@trace_methods
 class UserController:
     """
     Kullanici veritabani islemlerini yonetir
@@ -25,7 +28,7 @@ class UserController:
         """
         Kullanici bilgisini doner
         """
-        with db_session() as session:
+        async with ReadYourWrites.read_session(id) as session:
             user = session.query(DBUser).where(DBUser.id == id).limit(1).one_or_none()
             if user:
                 return user.user_info()
@@ -52,7 +55,7 @@ class UserController:
         Kullaniciyi verilen bilgilerle gunceller
         """
 
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             user = session.query(DBUser).where(DBUser.id == user_id).limit(1).one_or_none()
             if user:
                 for column, value in user_data.model_dump(exclude_unset=True, exclude_none=True).items():
@@ -71,7 +74,7 @@ class UserController:
         """
         Kullaniciyi siler
         """
-        with db_session() as session:
+        async with ReadYourWrites.write_session(user_id) as session:
             user = session.query(DBUser).where(DBUser.id == user_id).limit(1).one_or_none()
             if user:
                 session.delete(user)
@@ -3,14 +3,14 @@ from jose import JWTError, jwt
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import RedirectResponse
 
-from apps.controllers.utils import get_redis_connection
-from config import JTI_REDIS_DB, JWT_SECRET_KEY, TOKEN_ALGORITHM
+from apps.controllers.auth.TokenRevocation import TokenRevocation
+from config import JWT_SECRET_KEY, TOKEN_ALGORITHM
 
 
 class AuthMiddleware(BaseHTTPMiddleware):
     """
     Istek basligindaki authorization token kullanilmissa veya kullanici hesabini silmis ise,
-    suanki aktif hesaptan cikisi saglanir. Bu nedenle her istekte blacklist jti ve user kontrol yapilir.
+    suanki aktif hesaptan cikisi saglanir. Bu nedenle her istekte blacklist jti ve token versiyonu kontrol edilir.
 
     Hem authorization token manipulasyonunu engeller hem de farkli tarayici/cihazdan cikis yapilmasi durumunda
     atilan herhangi bir istekte anlik olarak diger tarayicilardan/cihazlardan cikisi yapilir
@@ -29,10 +29,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
             access_token = access_token[7:]
             try:
                 payload = jwt.decode(access_token, JWT_SECRET_KEY, algorithms=[TOKEN_ALGORITHM])
-                jti = payload.get("jti")
-                user_id = payload.get("sub")
-                redis = await get_redis_connection(JTI_REDIS_DB)
-                if await redis.exists(f"blacklist_jti:{jti}") or await redis.exists(f"blacklist_user:{user_id}"):
+                # Iptal kontrolleri abonelik senkronken bellekteki kopyadan yapilir, Redis'e gidilmez
+                if await TokenRevocation.is_token_revoked(payload):
                     if request.url.path != "/user/logout":  # Logout yonlendirmesindeki sonsuz donguyu onler
                         response = RedirectResponse(url="/user/logout", status_code=307)
                         return response
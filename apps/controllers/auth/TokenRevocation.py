@@ -0,0 +1,232 @@
+import asyncio
+import time
+
+from apps.controllers.RedisController import redis_key
+from apps.controllers.utils import get_redis_connection
+from config import ACCESS_TOKEN_EXP, JTI_REDIS_DB, REDIS_TOPOLOGY, REVOCATION_MAX_LAG, REVOCATION_PING_INTERVAL
+from logger import setup_logger
+
+logger = setup_logger("TOKEN_REVOCATION")
+
+TOKEN_VERSIONS_KEY = redis_key("token_versions")
+TOKEN_VERSIONS_CHANNEL = redis_key("token_versions")
+# Iptal edilen access token JTI'leri, skor son kullanma zamanidir (epoch). Yeni baslayan surec kopyasini buradan yukler
+BLACKLIST_JTI_KEY = redis_key("blacklist_jti_recent")
+BLACKLIST_JTI_CHANNEL = redis_key("blacklist_jti")
+# Eski blacklist_user:{id} anahtarlarinin versiyona tasinmasini tek surecin yapmasi icin kullanilir
+MIGRATION_KEY = redis_key("token_versions:migrated")
+
+
+class TokenRevocation:
+    """
+    Token iptal kontrollerini yonetir
+    Kullanici bazli iptal token versiyonu ile yapilir. Tokenlere olusturulduklari andaki kullanici versiyonu
+    "ver" claim'i olarak eklenir, versiyonu guncel versiyondan kucuk olan tokenler iptal edilmis sayilir
+
+    Versiyonlar JTI_REDIS_DB'deki token_versions hash'inde tutulur (user_id -> versiyon)
+    Logout ile iptal edilen access token JTI'leri de blacklist_jti:{jti} anahtarina ek olarak yayinlanir
+
+    Her surec versiyonlarin ve iptal edilen access token JTI'lerinin bir kopyasini bellekte tutar
+    ve pub/sub ile gunceller, kontroller Redis'e gitmez
+    Abonelik kopuk veya REVOCATION_MAX_LAG saniyeden fazla geride ise dogrudan Redis'e bakilir
+    """
+
+    _versions: dict[str, int] = {}
+    _blacklisted_jtis: dict[str, float] = {}
+    _connected: bool = False
+    _last_seen: float = 0.0
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def is_synced(cls) -> bool:
+        return cls._connected and time.monotonic() - cls._last_seen < REVOCATION_MAX_LAG
+
+    @classmethod
+    async def get_version(cls, user_id: str) -> int:
+        """
+        Kullanicinin guncel token versiyonunu doner, kaydi olmayan kullanicinin versiyonu 0'dir
+        """
+        if cls.is_synced():
+            return cls._versions.get(user_id, 0)
+        redis = await get_redis_connection(JTI_REDIS_DB)
+        version = await redis.hget(TOKEN_VERSIONS_KEY, user_id)
+        return int(version or 0)
+
+    @classmethod
+    async def is_revoked(cls, payload: dict) -> bool:
+        """
+        Cozulmus JWT payload'inin versiyonu kullanicinin guncel versiyonundan eskiyse True doner
+        "ver" claim'i olmayan eski tokenler 0 versiyonlu kabul edilir
+        """
+        return int(payload.get("ver", 0)) < await cls.get_version(str(payload.get("sub")))
+
+    @classmethod
+    async def is_jti_blacklisted(cls, payload: dict) -> bool:
+        """
+        Cozulmus JWT payload'inin JTI'si blacklist'te ise True doner
+        Bellekteki kopya sadece access tokenleri icerir, diger tokenler (refresh, "typ" claim'i olmayan eski tokenler)
+        ve abonelik senkron degilken dogrudan Redis'e bakilir
+        """
+        jti = payload.get("jti")
+        if payload.get("typ") == "access" and cls.is_synced():
+            expires_at = cls._blacklisted_jtis.get(jti)
+            return expires_at is not None and expires_at > time.time()
+        redis = await get_redis_connection(JTI_REDIS_DB)
+        return bool(await redis.exists(redis_key("blacklist_jti", jti)))
+
+    @classmethod
+    async def is_token_revoked(cls, payload: dict) -> bool:
+        """
+        Versiyon ve JTI blacklist kontrolunu birlikte yapar (AuthMiddleware)
+        Bellekteki kopya kullanilamiyorsa iki kontrol tek pipeline ile gonderilir. Cluster/shard modunda
+        anahtarlar farkli node'larda olsa bile her node icin tek round trip yapilir
+        """
+        if payload.get("typ") == "access" and cls.is_synced():
+            return await cls.is_revoked(payload) or await cls.is_jti_blacklisted(payload)
+
+        redis = await get_redis_connection(JTI_REDIS_DB)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hget(TOKEN_VERSIONS_KEY, str(payload.get("sub")))
+            pipe.exists(redis_key("blacklist_jti", payload.get("jti")))
+            version, blacklisted = await pipe.execute()
+        return int(payload.get("ver", 0)) < int(version or 0) or bool(blacklisted)
+
+    @classmethod
+    async def blacklist_access_jti(cls, jti: str) -> None:
+        """
+        Access token JTI'sini ACCESS_TOKEN_EXP suresince blacklist'e ekler ve diger sureclere yayinlar
+        Anahtar yazma, yukleme kumesi ve yayin tek round trip'te gonderilir
+        """
+        ttl = ACCESS_TOKEN_EXP * 60
+        expires_at = time.time() + ttl
+        redis = await get_redis_connection(JTI_REDIS_DB)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.setex(redis_key("blacklist_jti", jti), ttl, "")
+            pipe.zadd(BLACKLIST_JTI_KEY, {jti: expires_at})
+            pipe.zremrangebyscore(BLACKLIST_JTI_KEY, "-inf", time.time())
+            pipe.publish(BLACKLIST_JTI_CHANNEL, f"{jti}:{expires_at}")
+            await pipe.execute()
+        cls._blacklisted_jtis[jti] = expires_at
+
+    @classmethod
+    async def revoke_user(cls, user_id: str) -> int:
+        """
+        Kullanicinin versiyonunu arttirarak o ana kadar olusturulmus tum tokenlerini iptal eder
+        Degisiklik diger sureclere pub/sub ile bildirilir
+        """
+        redis = await get_redis_connection(JTI_REDIS_DB)
+        version = await redis.hincrby(TOKEN_VERSIONS_KEY, user_id, 1)
+        await redis.publish(TOKEN_VERSIONS_CHANNEL, f"{user_id}:{version}")
+        cls._apply(user_id, version)
+        return version
+
+    @classmethod
+    def _apply(cls, user_id: str, version: int) -> None:
+        # Mesajlar gecikmeli veya sirasiz gelebilir, versiyon hicbir zaman geri alinmaz
+        if version > cls._versions.get(user_id, 0):
+            cls._versions[user_id] = version
+
+    @classmethod
+    def _prune_jtis(cls) -> None:
+        now = time.time()
+        for jti in [jti for jti, expires_at in cls._blacklisted_jtis.items() if expires_at <= now]:
+            del cls._blacklisted_jtis[jti]
+
+    @classmethod
+    async def _load(cls, redis) -> None:
+        """
+        Hash'i ve suresi dolmamis JTI'leri yerel kopyaya yukler
+        """
+        for user_id, version in (await redis.hgetall(TOKEN_VERSIONS_KEY)).items():
+            cls._apply(user_id, int(version))
+        now = time.time()
+        await redis.zremrangebyscore(BLACKLIST_JTI_KEY, "-inf", now)
+        for jti, expires_at in await redis.zrangebyscore(BLACKLIST_JTI_KEY, now, "+inf", withscores=True):
+            cls._blacklisted_jtis[jti] = expires_at
+
+    @classmethod
+    def _handle(cls, channel: str, data: str) -> None:
+        key, _, value = data.rpartition(":")
+        if channel == TOKEN_VERSIONS_CHANNEL:
+            cls._apply(key, int(value))
+        elif channel == BLACKLIST_JTI_CHANNEL:
+            cls._blacklisted_jtis[key] = float(value)
+
+    @classmethod
+    async def migrate_blacklist_users(cls) -> None:
+        """
+        Onceki surumde hesap silmede yazilan blacklist_user:{id} anahtarlarini versiyona cevirir
+        Anahtarlar REFRESH_TOKEN_EXP gun sonra kendiliginden silindigi icin bu islem o sureden sonra kaldirilabilir
+        """
+        # Cluster/shard modu prefixed anahtar modu gerektirir, eski anahtarlar bu kurulumlarda bulunmaz
+        if REDIS_TOPOLOGY != "single":
+            return
+        redis = await get_redis_connection(JTI_REDIS_DB)
+        if not await redis.set(MIGRATION_KEY, "", nx=True):
+            return
+        migrated = 0
+        async for key in redis.scan_iter(match="blacklist_user:*", count=1000):
+            await cls.revoke_user(key.split(":", 1)[1])
+            await redis.delete(key)
+            migrated += 1
+        if migrated:
+            logger.info("Blacklisted users are migrated to token versions", extra={"users": migrated})
+
+    @classmethod
+    async def run(cls) -> None:
+        """
+        token_versions ve blacklist_jti kanallarina abone olup yerel kopyayi guncel tutan arka plan dongusu
+        Once abone olunup sonra Redis'teki durum okunur, aradaki guncellemeler kaybolmaz
+        Baglanti REVOCATION_PING_INTERVAL saniyede bir ping ile kontrol edilir, suresi dolan JTI'ler silinir
+        """
+        try:
+            await cls.migrate_blacklist_users()
+        except Exception:
+            logger.error("Blacklisted users could not be migrated", exc_info=True)
+
+        while True:
+            pubsub = None
+            try:
+                redis = await get_redis_connection(JTI_REDIS_DB)
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(TOKEN_VERSIONS_CHANNEL, BLACKLIST_JTI_CHANNEL)
+                await cls._load(redis)
+                cls._connected = True
+                cls._last_seen = time.monotonic()
+                logger.info(
+                    "Token revocation cache is synced",
+                    extra={"users": len(cls._versions), "jtis": len(cls._blacklisted_jtis)},
+                )
+
+                next_ping = time.monotonic() + REVOCATION_PING_INTERVAL
+                while True:
+                    message = await pubsub.get_message(timeout=max(0.0, next_ping - time.monotonic()))
+                    if message is not None:
+                        cls._last_seen = time.monotonic()
+                        if message["type"] == "message":
+                            cls._handle(message["channel"], message["data"])
+                    if time.monotonic() >= next_ping:
+                        await pubsub.ping()
+                        cls._prune_jtis()
+                        next_ping = time.monotonic() + REVOCATION_PING_INTERVAL
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Token revocation subscription is lost, checks fall back to Redis", exc_info=True)
+            finally:
+                cls._connected = False
+                if pubsub is not None:
+                    await pubsub.aclose()
+            await asyncio.sleep(REVOCATION_PING_INTERVAL)
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.create_task(cls.run())
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            cls._task = None
@@ -7,22 +7,26 @@ from itsdangerous.exc import BadData
 from jose import JWTError, jwt
 
 from apps.celery_app.tasks.email.tasks import send_activate_account_mail, send_tfa_code_mail
+from apps.controllers.auth.TokenRevocation import TokenRevocation
 from apps.controllers.auth.utils import (
+    acquire_mail_slot,
+    acquire_tfa_mail_slot,
     authenticate_user,
     create_authorized_response,
     create_tfa_code_with_user_info,
     create_tokens,
     create_verify_token_with_user_info,
+    release_mail_slot,
 )
+from apps.controllers.OutboxController import OutboxController
+from apps.controllers.RedisController import redis_key
 from apps.controllers.utils import create_custom_json_response, get_redis_connection
 from apps.models.db.UserModel import DBUser
 from apps.models.exceptions.query import UserNotFound
 from config import (
-    ACCESS_TOKEN_EXP,
     ACCOUNT_VERIFY_TOKEN_EXP,
     JTI_REDIS_DB,
     JWT_SECRET_KEY,
-    REFRESH_TOKEN_EXP,
     SITE_BASE_ADDR,
     TFA_LOGIN_REDIS_DB,
     TFA_SECRET_KEY,
@@ -30,12 +34,14 @@ from config import (
 )
 from database import db_session
 from logger import setup_logger
+from tracing import trace_methods
 
 from .utils import get_refresh_jti_and_exp
 
 logger = setup_logger("AUTH_CONTROLLER")
 
 
+@trace_methods
 class UserAuthController:
     @staticmethod
     async def login(username: str, password: str, ip_addr: str):
@@ -94,9 +100,8 @@ class UserAuthController:
 
         redis_client = await get_redis_connection(JTI_REDIS_DB)
 
-        if not (await redis_client.exists(f"blacklist_jti:{jti_access_token}")):
-            redis_jti_access_exp = ACCESS_TOKEN_EXP * 60
-            await redis_client.setex(f"blacklist_jti:{jti_access_token}", redis_jti_access_exp, "")
+        if not (await redis_client.exists(redis_key("blacklist_jti", jti_access_token))):
+            await TokenRevocation.blacklist_access_jti(jti_access_token)
         else:
             logger.info("User access token used", extra={"username": username, "ip": ip_addr})
             return await create_custom_json_response({"detail": "Access token used!"}, 400, ["refresh_token"])
@@ -104,18 +109,29 @@ class UserAuthController:
         if refresh_token is not None:
             refresh_jti, redis_refresh_jti_exp = await get_refresh_jti_and_exp(refresh_token)
             if refresh_jti:
-                await redis_client.setex(f"blacklist_jti:{refresh_jti}", redis_refresh_jti_exp, "")
+                await redis_client.setex(redis_key("blacklist_jti", refresh_jti), redis_refresh_jti_exp, "")
 
         delete_cookie_list = ["refresh_token", "tfa_token"]
         if delete_user == "true":
             logger.info("User delete request for logout", extra={"username": username, "ip": ip_addr})
             delete_cookie_list.append("delete_user")
-            user_id = payload_access_token.get("sub")
-            await redis_client.setex(f"blacklist_user:{user_id}", REFRESH_TOKEN_EXP * 86400, "")
+            await TokenRevocation.revoke_user(payload_access_token.get("sub"))
 
         logger.info("User logout successful", extra={"username": username, "ip": ip_addr})
         return await create_custom_json_response({"detail": "Logout Successful"}, 200, delete_cookie_list)
 
+    @staticmethod
+    async def logout_all_devices(user_id: str, username: str, ip_addr: str):
+        """
+        Kullanicinin tum cihazlardaki oturumlarini kapatir
+        Token versiyonu arttirilir, o ana kadar olusturulmus tum access ve refresh tokenler gecersiz olur
+        """
+        await TokenRevocation.revoke_user(user_id)
+        logger.info("User logged out from all devices", extra={"username": username, "ip": ip_addr})
+        return await create_custom_json_response(
+            {"detail": "Logged out from all devices"}, 200, ["refresh_token", "tfa_token"]
+        )
+
     @staticmethod
     async def user_token_refresh(ip_addr: str, refresh_token: str):
         """
@@ -128,17 +144,21 @@ class UserAuthController:
             username = payload.get("name")
             redis = await get_redis_connection(JTI_REDIS_DB)
 
-            if await redis.exists(f"blacklist_jti:{jti}"):
+            if await redis.exists(redis_key("blacklist_jti", jti)):
                 logger.info("User refresh token used", extra={"username": username, "ip": ip_addr})
                 return await create_custom_json_response({"detail": "Refresh token used!"}, 401, ["refresh_token"])
 
+            if await TokenRevocation.is_revoked(payload):
+                logger.info("User refresh token revoked", extra={"username": username, "ip": ip_addr})
+                return await create_custom_json_response({"detail": "Refresh token revoked!"}, 401, ["refresh_token"])
+
             user_id = payload.get("sub")
             old_exp_date = payload.get("exp")
             redis_exp_date = int(old_exp_date - time.time())
             redis_exp_date = 0 if redis_exp_date <= 0 else redis_exp_date
-            last_access_token = await create_tokens(user_id, username, False)
+            last_access_token = await create_tokens(user_id, username, False, version=payload.get("ver", 0))
 
-            await redis.setex(f"blacklist_jti:{jti}", redis_exp_date, "")
+            await redis.setex(redis_key("blacklist_jti", jti), redis_exp_date, "")
 
             response_headers = {"Authorization": f"Bearer {last_access_token}"}
             logger.info("Last access token is created", extra={"username": username, "ip": ip_addr})
@@ -161,25 +181,26 @@ class UserAuthController:
             user_id = payload.get("sub")
             redis = await get_redis_connection(JTI_REDIS_DB)
 
-            if await redis.exists(f"blacklist_jti:{jti}"):
+            if await redis.exists(redis_key("blacklist_jti", jti)):
                 logger.info("TFA token is used", extra={"user_id": user_id, "ip": ip_addr})
                 return await create_custom_json_response(
                     {"detail": "TFA Token is used!"}, 401, delete_cookie_list=["tfa_token", "refresh_token"]
                 )
 
-            if not (await UserAuthController.code_verify(f"tfa_code:{user_id}", code)):
+            if not (await UserAuthController.code_verify(redis_key("tfa_code", user_id), code)):
                 logger.info("TFA Code is not valid", extra={"user_id": user_id, "ip": ip_addr})
                 return await create_custom_json_response(
                     {"detail": "TFA Code is not valid!"}, 401, delete_cookie_list=["refresh_token"]
                 )
-            await redis.delete(f"tfa_code:{user_id}")
+            tfa_redis = await get_redis_connection(TFA_LOGIN_REDIS_DB)
+            await tfa_redis.delete(redis_key("tfa_code", user_id), redis_key("mail_dedup:tfa", user_id))
             username = payload.get("name")
             old_exp_date = payload.get("exp")
 
             redis_exp_date = int(old_exp_date - time.time())
             redis_exp_date = 0 if redis_exp_date <= 0 else redis_exp_date
 
-            await redis.setex(f"blacklist_jti:{jti}", redis_exp_date, "")
+            await redis.setex(redis_key("blacklist_jti", jti), redis_exp_date, "")
             authorized_response = await create_authorized_response(user_id, username, delete_cookie_list=["tfa_token"])
 
             logger.info("Login with TFA is successful", extra={"username": username, "ip": ip_addr})
@@ -202,7 +223,7 @@ class UserAuthController:
             user_id = token_info["user_id"]
             verify_token_jti = token_info["jti"]
             redis = await get_redis_connection(JTI_REDIS_DB)
-            if not (await redis.exists(f"blacklist_jti:{verify_token_jti}")):
+            if not (await redis.exists(redis_key("blacklist_jti", verify_token_jti))):
                 with db_session() as session:
                     user = session.query(DBUser).where(DBUser.id == user_id).limit(1).one_or_none()
                     if user:
@@ -210,7 +231,7 @@ class UserAuthController:
                     else:
                         raise UserNotFound("User not found!")
 
-                await redis.setex(f"blacklist_jti:{verify_token_jti}", ACCOUNT_VERIFY_TOKEN_EXP * 3600, "")
+                await redis.setex(redis_key("blacklist_jti", verify_token_jti), ACCOUNT_VERIFY_TOKEN_EXP * 3600, "")
                 logger.info("User approved", extra={"user_id": user_id, "ip": ip_addr})
                 return JSONResponse({"detail": "User approved!"}, status_code=200)
 
@@ -227,9 +248,16 @@ class UserAuthController:
         """
         Controller tarafinda aktivasyon mail gonderim islemini tetikler
         """
-        email, username, token = await create_verify_token_with_user_info(user_id)
-        verify_link = SITE_BASE_ADDR + "/auth/verify/" + token
-        send_activate_account_mail.apply_async(args=(verify_link, email, username))
+        if await acquire_mail_slot("activation", user_id):
+            try:
+                email, username, token = await create_verify_token_with_user_info(user_id)
+                verify_link = SITE_BASE_ADDR + "/auth/verify/" + token
+                await OutboxController.enqueue(send_activate_account_mail, verify_link, email, username)
+            except Exception:
+                await release_mail_slot("activation", user_id)
+                raise
+        else:
+            logger.info("Duplicate activation mail suppressed", extra={"user_id": user_id})
         return JSONResponse(
             {"detail": "Your account is not verified! The verification link has been sent to your mail address"},
             status_code=401,
@@ -239,9 +267,18 @@ class UserAuthController:
     async def send_tfa_mail_for_auth(user_id: int):
         """
         Controller tarafinda TFA code mail gonderim islemini tetikler
+        Gonderim hakki baska bir istekteyse (kod gonderilmis veya gonderilmekte) yeni kod uretilmez
         """
-        email, username, code = await create_tfa_code_with_user_info(user_id)
-        send_tfa_code_mail.apply_async(args=(code, email, username))
+        if not await acquire_tfa_mail_slot(user_id):
+            logger.info("Duplicate TFA mail suppressed", extra={"user_id": user_id})
+            return
+
+        try:
+            email, username, code = await create_tfa_code_with_user_info(user_id)
+            await OutboxController.enqueue(send_tfa_code_mail, code, email, username)
+        except Exception:
+            await release_mail_slot("tfa", user_id)
+            raise
 
     @staticmethod
     async def code_verify(key: str, code: str):
@@ -249,5 +286,5 @@ class UserAuthController:
         Verilen TFA kodunun dogrulugunu kontrol eder
         """
         redis_client = await get_redis_connection(TFA_LOGIN_REDIS_DB)
-        value: str = await redis_client.get(key)
+        value: str = await redis_client.cached_get(key)
         return value is not None and value == code
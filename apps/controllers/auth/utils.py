@@ -14,6 +14,8 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from logger import setup_logger
 
+from apps.controllers.auth.TokenRevocation import TokenRevocation
+from apps.controllers.RedisController import redis_key
 from apps.controllers.utils import get_redis_connection
 from apps.models.db.UserModel import DBUser
 from apps.models.exceptions.query import UserNotFound
@@ -25,6 +27,7 @@ from config import (
     TFA_SECRET_KEY,
     REFRESH_TOKEN_EXP,
     TFA_LOGIN_REDIS_DB,
+    MAIL_DEDUP_WINDOW,
 )
 from database import db_session
 
@@ -68,22 +71,37 @@ async def authenticate_user(username: str, password: str) -> DBUser | bool:
 
 
 async def create_tokens(
-    user_id: str, username: str, include_refresh_token: bool = True, code_type: str = "0"
+    user_id: str, username: str, include_refresh_token: bool = True, code_type: str = "0", version: int = 0
 ) -> tuple[str]:
     """
     Kullaniciya ait, belirli paremetrelerle erisim tokenleri olusturur
+    version, kullanicinin guncel token versiyonudur (TokenRevocation) ve tokenlere "ver" olarak eklenir
     """
     if code_type == "0":
         """
         code_type 0 ise, kullanici girisi dogrulanmistir ve tokenler gereklidir
         """
         access_token_exp = datetime.now(tz=timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXP)
-        access_token_encode = {"sub": user_id, "name": username, "exp": access_token_exp, "jti": str(uuid4())}
+        access_token_encode = {
+            "sub": user_id,
+            "name": username,
+            "exp": access_token_exp,
+            "jti": str(uuid4()),
+            "ver": version,
+            "typ": "access",
+        }
         access_token = jwt.encode(access_token_encode, JWT_SECRET_KEY, algorithm=TOKEN_ALGORITHM)
 
         if include_refresh_token:
             refresh_token_exp = datetime.now(tz=timezone.utc) + timedelta(days=REFRESH_TOKEN_EXP)
-            refresh_token_encode = {"sub": user_id, "name": username, "exp": refresh_token_exp, "jti": str(uuid4())}
+            refresh_token_encode = {
+                "sub": user_id,
+                "name": username,
+                "exp": refresh_token_exp,
+                "jti": str(uuid4()),
+                "ver": version,
+                "typ": "refresh",
+            }
             refresh_token = jwt.encode(refresh_token_encode, JWT_SECRET_KEY, algorithm=TOKEN_ALGORITHM)
             return access_token, refresh_token
 
@@ -130,7 +148,8 @@ async def create_authorized_response(
     Kullanici yetkilendirme islemleri icin ozellestirilmis cevaplar olusturur
     """
     if auth_type == "direct":
-        access_token, refresh_token = await create_tokens(user_id, username)
+        version = await TokenRevocation.get_version(user_id)
+        access_token, refresh_token = await create_tokens(user_id, username, version=version)
 
         response = JSONResponse(
             {"access_token": access_token, "token_type": "bearer", "login_type": auth_type},
@@ -200,7 +219,7 @@ async def get_tfa_code_exp(tfa_token: str):
         user_id = payload.get("sub")
 
         redis_client = await get_redis_connection(TFA_LOGIN_REDIS_DB)
-        key = f"tfa_code:{user_id}"
+        key = redis_key("tfa_code", user_id)
         exp = await redis_client.ttl(key)
         if exp is None or exp <= 0:
             return JSONResponse({"key": key, "exp": 0})
@@ -230,5 +249,32 @@ async def create_tfa_code_with_user_info(user_id: int):
     redis_client = await get_redis_connection(TFA_LOGIN_REDIS_DB)
     code = "".join(random.SystemRandom().choice(string.ascii_uppercase + string.digits) for _ in range(6))
     second = TFA_TOKEN_EXP * 60
-    await redis_client.setex(f"tfa_code:{user_id}", second, code)
+    await redis_client.setex(redis_key("tfa_code", user_id), second, code)
     return user.email, user.visibility_name, code
+
+
+async def acquire_mail_slot(mail_type: str, user_id: int, window: int = MAIL_DEDUP_WINDOW) -> bool:
+    """
+    Kullanici ve mail tipi icin window saniyelik gonderim hakki alir (SET NX EX)
+    Ayni pencere icinde tekrar cagrilirsa False doner ve mail gonderilmemelidir
+    """
+    redis_client = await get_redis_connection(TFA_LOGIN_REDIS_DB)
+    return bool(await redis_client.set(redis_key(f"mail_dedup:{mail_type}", user_id), "", nx=True, ex=window))
+
+
+async def release_mail_slot(mail_type: str, user_id: int) -> None:
+    """
+    acquire_mail_slot ile alinan hakki birakir
+    Mail kuyruga eklenemezse cagrilir, aksi halde kullanici pencere boyunca mail alamaz
+    """
+    redis_client = await get_redis_connection(TFA_LOGIN_REDIS_DB)
+    await redis_client.delete(redis_key(f"mail_dedup:{mail_type}", user_id))
+
+
+async def acquire_tfa_mail_slot(user_id: int) -> bool:
+    """
+    TFA maili icin gonderim hakki alir, hak baskasindaysa gecerli bir kod gonderilmis veya gonderilmektedir
+    Pencere kod suresini (TFA_TOKEN_EXP) asamaz, basarili TFA login'de kod ile birlikte silinir
+    Hak tutulurken kod anahtarina bakilmaz; hakki alan istek kodu henuz yazmamis olabilir
+    """
+    return await acquire_mail_slot("tfa", user_id, min(MAIL_DEDUP_WINDOW, TFA_TOKEN_EXP * 60))
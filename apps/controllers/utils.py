@@ -1,3 +1,4 @@
+import asyncio
 import socket
 from logging import Logger
 from smtplib import SMTP, SMTPAuthenticationError, SMTPConnectError, SMTPException
@@ -7,7 +8,7 @@ from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
-from config import SMTP_PORT, SMTP_SERVER, SMTP_USER, SMTP_PASSWORD
+from config import SMTP_PORT, SMTP_SERVER, SMTP_USER, SMTP_PASSWORD, SMTP_USE_TLS
 from logger import setup_logger
 
 from .RedisController import RedisController
@@ -79,16 +80,26 @@ async def create_custom_json_response(
     return response
 
 
+def probe_mail_server() -> None:
+    """
+    Mail sunucusuna baglanip giris yapar
+    Bloklayan bir islemdir, event loop icinde dogrudan cagrilmamalidir
+    """
+    with SMTP(host=SMTP_SERVER, port=SMTP_PORT, timeout=15) as server:
+        if SMTP_USE_TLS:
+            server.starttls()
+        server.login(SMTP_USER, SMTP_PASSWORD)
+
+
 async def check_mail_server() -> None:
     """
     Mail sunucusunun aktifligini kontrol eder
+    SMTP baglantisi ayri bir thread'de yapilir, event loop bloklanmaz
     """
     log_data = {"mail_server": SMTP_SERVER, "port": SMTP_PORT, "SMTP_USER": SMTP_USER}
 
     try:
-        with SMTP(host=SMTP_SERVER, port=SMTP_PORT, timeout=15) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
+        await asyncio.to_thread(probe_mail_server)
 
     except socket.gaierror:
         logger.error("Mail server socket error", exc_info=True, extra=log_data)
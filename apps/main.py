@@ -1,3 +1,6 @@
+import asyncio
+import os
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
@@ -6,36 +9,60 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from apps.controllers.auth.MiddleWare import AuthMiddleware
-from apps.controllers.RedisController import RedisController
-from apps.controllers.utils import check_mail_server
+from apps.controllers.auth.TokenRevocation import TokenRevocation
+from apps.controllers.HealthController import HealthController
+from apps.controllers.MetricsMiddleware import MetricsMiddleware
+from apps.controllers.ProfilingMiddleware import ProfilingMiddleware
+from apps.controllers.QueryStatsMiddleware import QueryStatsMiddleware
+from apps.controllers.RedisController import ClientSideCache, RedisController
+from apps.controllers.TracingMiddleware import TracingMiddleware
 from apps.models.db.utils import create_dbs
 from apps.views.AuthView import view_auth
+from apps.views.HealthView import view_health
+from apps.views.MetricsView import view_metrics
 from apps.views.PriorityView import view_priority
 from apps.views.StatusView import view_status
 from apps.views.TaskView import view_task
 from apps.views.UserView import view_user
+from config import METRICS_ENABLED, PROFILING_ENABLED, STARTUP_TIME_TARGET, TRACING_ENABLED
 from logger import setup_logger
+from metrics import mark_process_dead
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     FastAPI uygulamasi calistigi anda yapilacak on kontrolleri calistirir
+    Redis ve veritabani kontrolleri eszamanli yapilir, mail sunucusunu HealthController arka planda kontrol eder
     """
+    startup_start = time.perf_counter()
+    manager = RedisController(0)
     try:
-        manager = RedisController(0)
-        await manager.get_redis()
+        await asyncio.gather(manager.get_redis(), create_dbs())
         logger.info("Redis server active")
-        await create_dbs()
         logger.info("Database setup completed")
-        await check_mail_server()
-        logger.info("Mail server active")
-        yield
     except Exception:
         logger.error("FastAPI Lifespan Error", exc_info=True)
         await manager.close()
         raise
 
+    HealthController.start(app)
+    TokenRevocation.start()
+    ClientSideCache.start()
+    startup_time = time.perf_counter() - startup_start
+    if startup_time > STARTUP_TIME_TARGET:
+        logger.warning(
+            "Startup time exceeded target", extra={"startup_time": startup_time, "target": STARTUP_TIME_TARGET}
+        )
+    else:
+        logger.info("Startup completed", extra={"startup_time": startup_time})
+
+    yield
+    HealthController.stop()
+    TokenRevocation.stop()
+    ClientSideCache.stop()
+    mark_process_dead(os.getpid())
+
 
 app = FastAPI(lifespan=lifespan)
 logger = setup_logger("MAIN_LOGGER")
@@ -49,9 +76,14 @@ async def http_exception_accept_handler(request: Request, exc: RequestValidation
     Bu hatalar isteklerde gonderilen body datanin gecerli olmadigi
     veya beklenen model ile uyusmadiginda olusur
     """
-    logger.error("User body data validation error", exc_info=True)
+    errors = exc.errors()
+    # Istemci hatasidir, traceback formatlamak yerine sadece hata tipleri yazilir
+    logger.warning(
+        "User body data validation error",
+        extra={"path": request.url.path, "error_types": [err["type"] for err in errors]},
+    )
     msg_list: dict[str, str] = {}
-    for err in exc.errors():
+    for err in errors:
         if err["type"] == "missing":
             try:
                 columnName = err["loc"][1]
@@ -85,9 +117,24 @@ app.add_middleware(
 )
 
 app.add_middleware(AuthMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+
+if METRICS_ENABLED:
+    # En son eklenen middleware en distadir, AuthMiddleware suresi de olcume dahil olur
+    app.add_middleware(MetricsMiddleware)
+
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+if PROFILING_ENABLED:
+    # Kapaliyken middleware hic eklenmez, istek yoluna ek maliyet getirmez
+    app.add_middleware(ProfilingMiddleware)
 
 logger.debug("CORS & MiddleWare Configured!")
 
+app.include_router(view_health)
+if METRICS_ENABLED:
+    app.include_router(view_metrics)
 app.include_router(view_auth)
 app.include_router(view_user)
 app.include_router(view_priority)
@@ -0,0 +1,21 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, String, func
+
+from database import Base
+
+
+class DBMailOutbox(Base):
+    """
+    Veritabani mail outbox tablosu modeli
+    Istek icinde broker'a gonderilmek yerine buraya yazilan mail taskleri
+    outbox relay sureci tarafindan Celery'e iletilir
+    """
+
+    __tablename__ = "MailOutbox"
+
+    id = Column(Integer, primary_key=True)
+    task_name = Column(String(200), nullable=False)
+    args = Column(JSON, nullable=False)
+    # Kaydi olusturan istegin trace context'i (traceparent), relay bu baglamda yayinlar
+    headers = Column(JSON, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    date_created = Column(DateTime(timezone=True), server_default=func.now())
@@ -2,5 +2,6 @@ from apps.models.db.UserModel import DBUser
 from apps.models.db.PriorityModel import DBTaskPriority
 from apps.models.db.StatusModel import DBTaskStatus
 from apps.models.db.TaskModel import DBTask
+from apps.models.db.OutboxModel import DBMailOutbox
 
-__all__ = ["DBUser", "DBTask", "DBTaskPriority", "DBTaskStatus"]
+__all__ = ["DBUser", "DBTask", "DBTaskPriority", "DBTaskStatus", "DBMailOutbox"]
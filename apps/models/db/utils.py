@@ -1,10 +1,20 @@
+import asyncio
+
 from database import Base, engine
 
 
+def create_tables() -> None:
+    """
+    Tablolar yoksa olusturur
+    """
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+
+
 async def create_dbs():
     """
     Her baslatilista bu fonksiyon calistirilir.
     Veritabanlari yoksa olusturur
+    create_all senkron calistigi icin ayri bir thread'de yurutulur
     """
-    with engine.begin() as conn:
-        Base.metadata.create_all(conn)
+    await asyncio.to_thread(create_tables)
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class LivenessResponse(BaseModel):
+    status: str
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    age: float
+    database: dict | None = None
+    redis: dict | None = None
+    broker: dict | None = None
+    mail_server: dict | None = None
+    detail: str | None = None
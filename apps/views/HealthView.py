@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from apps.controllers.HealthController import HealthController
+from apps.models.response.health import LivenessResponse, ReadinessResponse
+
+view_health = APIRouter(prefix="/health", tags=["Health"])
+
+
+@view_health.get("/live", response_model=LivenessResponse)
+async def liveness() -> JSONResponse:
+    """
+    Surecin ayakta oldugunu bildirir, hicbir bagimliligi kontrol etmez
+    """
+    return JSONResponse({"status": "ok"}, 200)
+
+
+@view_health.get("/ready", response_model=ReadinessResponse)
+async def readiness() -> JSONResponse:
+    """
+    Onbellekteki bagimlilik durumunu doner
+    Hazir degilse 503 doner, load balancer bu worker'a trafik gondermeyi birakir
+    """
+    status = HealthController.readiness()
+    return JSONResponse(status, 200 if status["ready"] else 503)
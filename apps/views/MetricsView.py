@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from metrics import get_registry
+
+view_metrics = APIRouter(tags=["Metrics"])
+
+
+@view_metrics.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus metriklerini doner
+    Multiprocess modda tum worker sureclerinin degerleri birlestirilir
+    """
+    return Response(generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -66,6 +66,14 @@ async def logout_user(
     return json_response
 
 
+@view_user.post("/logout/all", response_model=SuccessResponse)
+async def logout_all_devices(user: user_depens, request: Request) -> JSONResponse:
+    """
+    Kullanicinin tum cihazlardaki oturumlarini kapatir
+    """
+    return await user_auth_controller.logout_all_devices(user["user_id"], user["username"], request.client.host)
+
+
 @view_user.post("/info/", response_model=User)
 async def get_user(user: user_depens) -> JSONResponse:
     """
@@ -0,0 +1,291 @@
+"""
+API'yi uctan uca yuk altinda olcer
+
+apps.main:app uvicorn ile ayri bir surecte baslatilir. Veritabani varsayilan olarak gecici bir SQLite
+dosyasidir, --db-url ile (bos, benchmark'a ayrilmis) bir PostgreSQL veritabani verilebilir. Redis icin
+varsayilan olarak bellekte calisan RedisStandIn kullanilir, --redis local ile yerel Redis'e baglanilir.
+
+Kullanicilar ve tasklar seed edildikten sonra her sanal kullanici giris yapar ve --mix ile verilen
+agirliklarla login, /task/list/, /task/create/ ve /task/update/ istekleri atar.
+Route basina RPS ve p50/p95/p99 yazdirilir, --output ile commitler arasi karsilastirma icin JSON kaydedilir.
+
+Kullanim: python -m benchmarks.api_load [--duration 30] [--concurrency 50] [--users 50] [--workers 1]
+          [--db-url postgresql://...] [--redis standin|local] [--mix login=1,list=10,create=5,update=4]
+          [--output results.json]
+Karsilastirma: python -m benchmarks.compare eski.json yeni.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.utils import BASE_DIR, RedisStandIn, git_commit, setup_env
+
+ROUTES = ("login", "list", "create", "update")
+PASSWORD = "Benchmark.Password1"
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = dict.fromkeys(ROUTES, 0)
+    for item in mix.split(","):
+        route, _, weight = item.partition("=")
+        if route.strip() not in weights:
+            raise SystemExit(f"Unknown route in --mix: {route}")
+        weights[route.strip()] = int(weight)
+    return weights
+
+
+def seed(users: int, tasks_per_user: int) -> dict:
+    """
+    Onaylanmis (TFA kapali) kullanicilar, bir status, bir priority ve kullanici basina tasklar olusturur
+    Isimler her calistirmada farklidir, ayni PostgreSQL veritabani tekrar kullanilabilir
+    """
+    from apps.controllers.auth.utils import bcrypt_context
+    from apps.models.db import DBTask, DBTaskPriority, DBTaskStatus, DBUser
+    from database import Base, db_session, engine
+
+    Base.metadata.create_all(engine)
+    run_id = f"{int(time.time()) % 1_000_000:06d}"
+    password_hash = bcrypt_context.hash(PASSWORD)
+
+    with db_session() as session:
+        db_users = [
+            DBUser(
+                visibility_name=f"bench{run_id}_{index}",
+                email=f"bench{run_id}_{index}@todoapi.local",
+                password=password_hash,
+                user_approved=True,
+                two_factor_auth=False,
+            )
+            for index in range(users)
+        ]
+        session.add_all(db_users)
+        session.flush()
+
+        status = DBTaskStatus(title=f"Bench {run_id}", user_id=db_users[0].id, default_status=False)
+        priority = DBTaskPriority(title=f"Bench {run_id}", user_id=db_users[0].id)
+        session.add_all([status, priority])
+        session.flush()
+
+        tasks_by_user = {}
+        for user in db_users:
+            tasks = [
+                DBTask(
+                    user_id=user.id,
+                    title=f"Seeded task {index}",
+                    content="Seeded by benchmarks.api_load",
+                    status=status.id,
+                    priority=priority.id,
+                )
+                for index in range(tasks_per_user)
+            ]
+            session.add_all(tasks)
+            session.flush()
+            tasks_by_user[user.visibility_name] = [task.id for task in tasks]
+
+        return {"status_id": status.id, "priority_id": priority.id, "tasks": tasks_by_user}
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """
+    Uygulamayi uvicorn ile baslatir ve /health/live cevap verene kadar bekler
+    """
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "apps.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health/live", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API server did not become live in 60 seconds")
+
+
+async def login(client: httpx.AsyncClient, username: str) -> httpx.Response:
+    return await client.post("/user/login", data={"username": username, "password": PASSWORD})
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    username: str,
+    seeded: dict,
+    weights: dict[str, int],
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+    rng: random.Random,
+) -> None:
+    response = await login(client, username)
+    token = response.json()["access_token"]
+    task_ids = seeded["tasks"][username]
+    routes, route_weights = list(weights), list(weights.values())
+
+    while time.monotonic() < deadline:
+        route = rng.choices(routes, route_weights)[0]
+        headers = {"Authorization": f"Bearer {token}"}
+        start = time.perf_counter()
+        if route == "login":
+            response = await login(client, username)
+        elif route == "list":
+            response = await client.get("/task/list/", headers=headers)
+        elif route == "create":
+            body = {
+                "title": "Benchmark task",
+                "content": "Created by benchmarks.api_load",
+                "status": seeded["status_id"],
+                "priority": seeded["priority_id"],
+                "estimated_end_date": "2030-01-01 12:00:00",
+            }
+            response = await client.post("/task/create/", json=body, headers=headers)
+        else:
+            body = {"content": f"Updated at {time.time()}"}
+            response = await client.patch(f"/task/update/{rng.choice(task_ids)}/", json=body, headers=headers)
+        latencies[route].append((time.perf_counter() - start) * 1000)
+
+        if response.status_code != 200:
+            errors[route] += 1
+        elif route == "login":
+            token = response.json()["access_token"]
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> dict:
+    latencies = sorted(latencies)
+
+    def percentile(q: float) -> float | None:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q))] if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "mean_ms": statistics.fmean(latencies) if latencies else None,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+async def run_load(port: int, seeded: dict, args: argparse.Namespace) -> dict:
+    weights = parse_mix(args.mix)
+    latencies: dict[str, list[float]] = {route: [] for route in ROUTES}
+    errors = dict.fromkeys(ROUTES, 0)
+    rng = random.Random(args.seed)
+    usernames = list(seeded["tasks"])
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        deadline = time.monotonic() + args.duration
+        await asyncio.gather(
+            *(
+                virtual_user(
+                    client, usernames[index % len(usernames)], seeded, weights, deadline, latencies, errors, rng
+                )
+                for index in range(args.concurrency)
+            )
+        )
+        duration = time.perf_counter() - start
+
+    routes = {route: summarize(latencies[route], errors[route], duration) for route in ROUTES if weights[route]}
+    total = summarize([value for values in latencies.values() for value in values], sum(errors.values()), duration)
+    return {"duration": duration, "routes": routes, "total": total}
+
+
+def print_report(result: dict) -> None:
+    def fmt(value: float | None) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+
+    print(f"{'route':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    for route, stats in {**result["routes"], "total": result["total"]}.items():
+        print(
+            f"{route:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+            f"{fmt(stats['p50_ms']):>10}{fmt(stats['p95_ms']):>10}{fmt(stats['p99_ms']):>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks-per-user", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db-url", help="Bos bir PostgreSQL veritabani, verilmezse gecici SQLite kullanilir")
+    parser.add_argument("--redis", choices=("standin", "local"), default="standin")
+    parser.add_argument("--redis-port", type=int, default=6390, help="RedisStandIn portu")
+    parser.add_argument("--mix", default="login=1,list=10,create=5,update=4")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Sonuclarin yazilacagi JSON dosyasi")
+    args = parser.parse_args()
+
+    overrides = {"METRICS_ENABLED": "false", "LOG_LEVEL": "WARNING"}
+    if args.db_url:
+        overrides["DB_CONNECTION_STRING"] = args.db_url
+    redis_standin = None
+    if args.redis == "standin":
+        overrides.update(REDIS_ADDR="127.0.0.1", REDIS_PORT=str(args.redis_port))
+        redis_standin = RedisStandIn("127.0.0.1", args.redis_port).start()
+    setup_env(**overrides)
+
+    seeded = seed(args.users, args.tasks_per_user)
+    server = start_server(args.port, args.workers)
+    try:
+        result = asyncio.run(run_load(args.port, seeded, args))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        if redis_standin is not None:
+            redis_standin.shutdown()
+
+    result["meta"] = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": os.environ["DB_CONNECTION_STRING"].split(":", 1)[0],
+        "redis": args.redis,
+        # db-url parola icerebilir, sonuc dosyasina yazilmaz
+        "args": {key: value for key, value in vars(args).items() if key != "db_url"},
+    }
+    print_report(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+DBActionTask session yasam dongusunun bellek davranisini olcer
+
+Ayni worker sureci icinde binlerce DBActionTask calistirir, belirli araliklarla
+sessions sozlugunun boyutunu ve tracemalloc ile ayrilan bellegi yazdirir.
+Sozluk boyutu 0'da kalmali, bellek ise ilk olcumlerden sonra sabitlenmelidir.
+
+Kullanim: python -m benchmarks.celery_session_memory [--number 10000] [--every 1000]
+"""
+
+import argparse
+import tracemalloc
+
+from benchmarks.utils import setup_env
+
+setup_env()
+
+from apps.celery_app.tasks.email.tasks import check_end_dates  # noqa: E402
+from database import Base, engine  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--every", type=int, default=1000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    # Gecikmis task olmadigi icin check_end_dates broker'a mesaj gondermez, sadece session kullanir
+    check_end_dates.apply()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    print(f"{'tasks':>8}{'sessions':>10}{'current(KiB)':>14}{'peak(KiB)':>12}")
+    for index in range(1, args.number + 1):
+        check_end_dates.apply()
+        if index % args.every == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            print(
+                f"{index:>8}{len(check_end_dates.sessions):>10}"
+                f"{(current - baseline) / 1024:>14.1f}{(peak - baseline) / 1024:>12.1f}"
+            )
+
+    tracemalloc.stop()
+    if check_end_dates.sessions:
+        raise SystemExit(f"Leaked sessions: {len(check_end_dates.sessions)}")
+
+
+if __name__ == "__main__":
+    main()
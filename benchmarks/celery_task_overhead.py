@@ -0,0 +1,69 @@
+"""
+send_todo_estimate_mail veri erisiminin task basina maliyetini olcer
+
+before: asyncio.run ile async controller fonksiyonlari (her task icin iki event loop)
+after: DBActionTask session'i ile senkron sorgular
+
+Kullanim: python -m benchmarks.celery_task_overhead [--number 2000]
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.utils import measure, print_results, setup_env
+
+setup_env()
+
+from apps.celery_app.tasks import queries  # noqa: E402
+from apps.controllers.auth.utils import get_active_user  # noqa: E402
+from apps.controllers.StatusController import StatusController  # noqa: E402
+from apps.models.db import DBTaskStatus, DBUser  # noqa: E402
+from database import Base, db_session, engine  # noqa: E402
+
+
+def seed() -> tuple[int, int]:
+    Base.metadata.create_all(engine)
+    with db_session() as session:
+        user = DBUser(visibility_name="bench_user", email="bench@todoapi.local", password="x")
+        session.add(user)
+        session.flush()
+        status = DBTaskStatus(title="In Progress", user_id=user.id, default_status=False)
+        session.add(status)
+        session.flush()
+        return user.id, status.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    user_id, status_id = seed()
+
+    async def noop():
+        return None
+
+    def event_loop_only():
+        asyncio.run(noop())
+        asyncio.run(noop())
+
+    def before():
+        asyncio.run(StatusController.get_status_info(user_id, status_id))
+        asyncio.run(get_active_user(user_id))
+
+    def after():
+        with db_session() as session:
+            queries.get_status(session, user_id, status_id)
+            queries.get_active_user(session, user_id)
+
+    print_results(
+        {
+            "event_loop_only": measure(event_loop_only, args.number),
+            "before_asyncio_run": measure(before, args.number),
+            "after_sync_session": measure(after, args.number),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Hatirlatma maili yigini altinda TFA mail gecikmesini olcer
+
+Once burst adet send_todo_estimate_mail kuyruga eklenir, ardindan belirli araliklarla
+TFA mailleri gonderilir. Her TFA mailinin kuyruga eklenmesinden SMTPSink'e ulasmasina
+kadar gecen sure raporlanir. --shared-queue ile TFA mailleri eski davranistaki gibi
+hatirlatmalarla ayni kuyruga gonderilerek karsilastirma yapilabilir.
+
+Kullanim: python -m benchmarks.celery_tfa_latency --burst 2000 --tfa 20 [--shared-queue]
+"""
+
+import argparse
+import time
+
+from benchmarks.celery_throughput import start_worker
+from benchmarks.utils import SMTPSink, setup_env
+
+setup_env(SMTP_USE_TLS="false")
+
+from apps.celery_app import app  # noqa: E402
+from apps.celery_app.tasks.email.tasks import send_tfa_code_mail, send_todo_estimate_mail  # noqa: E402
+from apps.models.db import DBTaskStatus, DBUser  # noqa: E402
+from config import SMTP_PORT, SMTP_SERVER, TFA_TOKEN_EXP  # noqa: E402
+from database import Base, db_session, engine  # noqa: E402
+
+TFA_SUBJECT = "TodoAPI: Two-Factor Authentication"
+
+
+def seed() -> tuple[int, int]:
+    Base.metadata.create_all(engine)
+    with db_session() as session:
+        user = DBUser(visibility_name="latency_user", email="latency@todoapi.local", password="x")
+        session.add(user)
+        session.flush()
+        status = DBTaskStatus(title="Waiting", user_id=user.id, default_status=False)
+        session.add(status)
+        session.flush()
+        return user.id, status.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--burst", type=int, default=2000)
+    parser.add_argument("--tfa", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.1, help="TFA mailleri arasindaki sure (sn)")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--shared-queue", action="store_true")
+    args = parser.parse_args()
+
+    user_id, status_id = seed()
+    sink = SMTPSink(SMTP_SERVER, SMTP_PORT).start()
+    app.control.purge()
+    worker = start_worker(max_tasks_per_child=1000, prefetch=1, concurrency=args.concurrency, pool="prefork")
+    tfa_options = {"queue": "email-bulk", "routing_key": "email-bulk"} if args.shared_queue else {}
+
+    try:
+        send_tfa_code_mail.apply_async(args=("WARMUP", "latency@todoapi.local", "latency_user"))
+        if not sink.wait_for(1, timeout=60):
+            raise RuntimeError("Worker did not consume the warmup task")
+        sink.reset()
+
+        for index in range(args.burst):
+            send_todo_estimate_mail.apply_async((user_id, status_id, f"Task {index}", "2000-01-01 00:00:00"))
+
+        sent_at = []
+        for index in range(args.tfa):
+            sent_at.append(time.perf_counter())
+            send_tfa_code_mail.apply_async(
+                args=(f"{index:06d}", "latency@todoapi.local", "latency_user"), **tfa_options
+            )
+            time.sleep(args.interval)
+
+        received = []
+        deadline = time.monotonic() + TFA_TOKEN_EXP * 60
+        while time.monotonic() < deadline:
+            received = [at for at, subject in sink.messages if subject == TFA_SUBJECT]
+            if len(received) >= args.tfa:
+                break
+            time.sleep(0.05)
+    finally:
+        worker.terminate()
+        worker.wait(timeout=30)
+        sink.shutdown()
+
+    # TFA mailleri ayni kuyrukta FIFO, ayri kuyrukta ise pratikte gonderim sirasiyla tuketilir
+    latencies = sorted((done - start) * 1000 for start, done in zip(sent_at, received))
+    if not latencies:
+        raise SystemExit(f"No TFA mail delivered within TFA_TOKEN_EXP ({TFA_TOKEN_EXP} min)")
+    print(f"mode={'shared' if args.shared_queue else 'priority'} burst={args.burst} tfa={len(latencies)}/{args.tfa}")
+    print(
+        f"latency ms: p50={latencies[len(latencies) // 2]:.1f} "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1]:.1f} max={latencies[-1]:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Email tasklerinin worker throughput ve bellek kullanimini olcer
+
+Yerel Redis broker'i ve gercek bir worker sureci (eager degil) kullanir,
+SMTP sunucusu yerine SMTPSink calistirilir. Her recycle/prefetch kombinasyonu
+icin ayri bir worker baslatilir; tasks/sn ve worker surec agacinin RSS degerleri raporlanir.
+
+Kullanim:
+python -m benchmarks.celery_throughput --tasks 2000 --max-tasks-per-child 10,100,1000 --prefetch 1,4
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import BASE_DIR, SMTPSink, process_tree_rss_kib, setup_env
+
+setup_env(SMTP_USE_TLS="false")
+
+from apps.celery_app import app  # noqa: E402
+from apps.celery_app.tasks.email.tasks import send_tfa_code_mail  # noqa: E402
+from config import SMTP_PORT, SMTP_SERVER  # noqa: E402
+
+
+def start_worker(max_tasks_per_child: int, prefetch: int, concurrency: int, pool: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        CELERY_WORKER_MAX_TASKS_PER_CHILD=str(max_tasks_per_child),
+        CELERY_WORKER_PREFETCH_MULTIPLIER=str(prefetch),
+    )
+    queues = ",".join(queue.name for queue in app.conf.task_queues)
+    command = [
+        sys.executable,
+        "-m",
+        "celery",
+        "-A",
+        "apps.celery_app.app",
+        "worker",
+        "-c",
+        str(concurrency),
+        f"--pool={pool}",
+        "-Q",
+        queues,
+        "--loglevel=warning",
+        "--without-gossip",
+        "--without-mingle",
+    ]
+    return subprocess.Popen(command, cwd=BASE_DIR, env=env)
+
+
+def run_case(sink: SMTPSink, tasks: int, max_tasks_per_child: int, prefetch: int, concurrency: int, pool: str) -> dict:
+    app.control.purge()
+    sink.reset()
+    worker = start_worker(max_tasks_per_child, prefetch, concurrency, pool)
+    try:
+        send_tfa_code_mail.apply_async(args=("WARMUP", "bench@todoapi.local", "bench_user"))
+        if not sink.wait_for(1, timeout=60):
+            raise RuntimeError("Worker did not consume the warmup task")
+        sink.reset()
+
+        start = time.perf_counter()
+        for index in range(tasks):
+            send_tfa_code_mail.apply_async(args=(f"{index:06d}", "bench@todoapi.local", "bench_user"))
+        enqueued = time.perf_counter()
+
+        rss_samples = []
+        deadline = time.monotonic() + max(60, tasks)
+        while sink.received < tasks and time.monotonic() < deadline:
+            rss = process_tree_rss_kib(worker.pid)
+            if rss is not None:
+                rss_samples.append(rss)
+            time.sleep(0.2)
+        finished = time.perf_counter()
+
+        return {
+            "max_tasks_per_child": max_tasks_per_child,
+            "prefetch": prefetch,
+            "concurrency": concurrency,
+            "pool": pool,
+            "tasks": tasks,
+            "completed": sink.received,
+            "enqueue_per_sec": tasks / (enqueued - start),
+            "tasks_per_sec": sink.received / (finished - start),
+            "rss_max_kib": max(rss_samples, default=None),
+            "rss_last_kib": rss_samples[-1] if rss_samples else None,
+        }
+    finally:
+        worker.terminate()
+        worker.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--max-tasks-per-child", default="10,100,1000")
+    parser.add_argument("--prefetch", default="1,4")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--pool", default="prefork")
+    parser.add_argument("--output", help="Sonuclarin yazilacagi JSON dosyasi")
+    args = parser.parse_args()
+
+    sink = SMTPSink(SMTP_SERVER, SMTP_PORT).start()
+    results = []
+    recycle_values = [int(value) for value in args.max_tasks_per_child.split(",")]
+    prefetch_values = [int(value) for value in args.prefetch.split(",")]
+    for max_tasks_per_child, prefetch in itertools.product(recycle_values, prefetch_values):
+        result = run_case(sink, args.tasks, max_tasks_per_child, prefetch, args.concurrency, args.pool)
+        results.append(result)
+        print(
+            f"max_tasks_per_child={max_tasks_per_child:<6} prefetch={prefetch:<3} "
+            f"completed={result['completed']}/{result['tasks']} "
+            f"tasks/s={result['tasks_per_sec']:.1f} rss_max={result['rss_max_kib']} KiB"
+        )
+    sink.shutdown()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+benchmarks.api_load ile kaydedilmis iki sonuc dosyasini route bazinda karsilastirir
+benchmarks.hot_helpers dosyalari (results anahtari) fonksiyon bazinda karsilastirilir
+
+Kullanim: python -m benchmarks.compare eski.json yeni.json [--threshold 10] [--alloc-threshold 10]
+p95 artisi veya RPS dususu threshold yuzdesini asan route'lar isaretlenir, varsa cikis kodu 1 olur
+hot_helpers icin mean/p95 artisi threshold'u, alloc_peak_bytes artisi alloc-threshold'u asarsa isaretlenir
+"""
+
+import argparse
+import json
+
+
+def change(old: float | None, new: float | None) -> float | None:
+    if not old or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def format_change(value: float | None, percent: float | None) -> str:
+    return f"{value or 0:.1f} ({percent:+.1f}%)" if percent is not None else "-"
+
+
+def compare_routes(old: dict, new: dict, threshold: float) -> bool:
+    """
+    api_load sonuclarini karsilastirir, gerileme varsa True doner
+    """
+    print(f"{'route':<10}{'rps':>22}{'p50(ms)':>22}{'p95(ms)':>22}{'p99(ms)':>22}")
+    regressed = False
+    for route, new_stats in {**new["routes"], "total": new["total"]}.items():
+        old_stats = old["routes"].get(route) if route != "total" else old["total"]
+        if old_stats is None:
+            continue
+
+        columns = [
+            format_change(new_stats[key], change(old_stats[key], new_stats[key]))
+            for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+        ]
+
+        rps_change = change(old_stats["rps"], new_stats["rps"])
+        p95_change = change(old_stats["p95_ms"], new_stats["p95_ms"])
+        marker = ""
+        if (rps_change is not None and rps_change < -threshold) or (p95_change is not None and p95_change > threshold):
+            marker = "  <- regression"
+            regressed = True
+        print(f"{route:<10}" + "".join(f"{column:>22}" for column in columns) + marker)
+    return regressed
+
+
+def compare_results(old: dict, new: dict, threshold: float, alloc_threshold: float) -> bool:
+    """
+    hot_helpers sonuclarini karsilastirir, gerileme varsa True doner
+    Bellek olcumu olmayan eski dosyalarda peak kolonu "-" yazilir ve kontrol edilmez
+    """
+    name_width = max(len(name) for name in new["results"]) + 2
+    print(f"{'name':<{name_width}}{'mean(us)':>22}{'p95(us)':>22}{'peak(B)':>22}")
+    regressed = False
+    for name, new_stats in new["results"].items():
+        old_stats = old["results"].get(name)
+        if old_stats is None:
+            continue
+
+        changes = {
+            key: change(old_stats.get(key), new_stats.get(key)) for key in ("mean_us", "p95_us", "alloc_peak_bytes")
+        }
+        columns = [format_change(new_stats.get(key), percent) for key, percent in changes.items()]
+
+        marker = ""
+        if any(changes[key] is not None and changes[key] > threshold for key in ("mean_us", "p95_us")) or (
+            changes["alloc_peak_bytes"] is not None and changes["alloc_peak_bytes"] > alloc_threshold
+        ):
+            marker = "  <- regression"
+            regressed = True
+        print(f"{name:<{name_width}}" + "".join(f"{column:>22}" for column in columns) + marker)
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10, help="Gerileme kabul edilen yuzde")
+    parser.add_argument(
+        "--alloc-threshold", type=float, default=10, help="hot_helpers icin bellek artisi kabul edilen yuzde"
+    )
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    if ("results" in old) != ("results" in new):
+        raise SystemExit("Files are produced by different benchmarks")
+
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    if "results" in new:
+        regressed = compare_results(old, new, args.threshold, args.alloc_threshold)
+    else:
+        regressed = compare_routes(old, new, args.threshold)
+
+    raise SystemExit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Okuma replikasi yonlendirmesini (db_read_session) SQLite kopyalari ile dogrular ve olcer
+
+Primary SQLite dosyasi hazirlandiktan sonra iki kopyasi replika olarak kullanilir. Kopyalar sonradan guncellenmedigi
+icin sonsuz gecikmeli bir replika gibi davranirlar. Ucuncu replika adresi acilamayan bir dosyadir ve
+baglanti hatasinda siradaki replikaya dusulmesini gosterir.
+
+Okumalarin engine'lere dagilimi, kullanicinin yazmasindan sonra DB_READ_YOUR_WRITES_SECONDS boyunca primary'den
+okunmasi (surec ici kopya silinerek baska bir worker da taklit edilir) ve sure doldugunda tekrar replikaya gidilmesi
+kontrol edilir, ardindan get_status_list suresi raporlanir. Son yazma zamanlari icin yerel bir redis-server sureci
+baslatilir (redis-server PATH'te olmalidir).
+
+Kullanim: python -m benchmarks.db_replica_routing [--strategy round_robin|least_connections] [--window 1.0]
+          [--number 2000] [--port 6393]
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.utils import RedisServerProcess, measure_async, print_results, setup_env
+
+
+async def run(primary: Path, replicas: list[Path], number: int, window: float) -> None:
+    from sqlalchemy import event
+
+    from apps.controllers.ReadYourWrites import ReadYourWrites
+    from apps.controllers.RedisController import RedisController
+    from apps.controllers.StatusController import StatusController
+    from apps.models.db import DBUser
+    from database import Base, db_session, engine, replica_candidates, replica_engines
+
+    Base.metadata.create_all(engine)
+    with db_session() as session:
+        writer = DBUser(visibility_name="bench_writer", email="writer@todoapi.local", password="x")
+        reader = DBUser(visibility_name="bench_reader", email="reader@todoapi.local", password="x")
+        session.add_all([writer, reader])
+        session.flush()
+        writer_id, reader_id = writer.id, reader.id
+    await StatusController.status_create(writer_id, "Done", True)
+    await StatusController.status_create(reader_id, "Done", True)
+    for replica in replicas:
+        shutil.copyfile(primary, replica)
+
+    counts = Counter()
+
+    def counter(label: str):
+        def count(*args) -> None:
+            counts[label] += 1
+
+        return count
+
+    for target in (engine, *replica_engines):
+        event.listen(target, "before_cursor_execute", counter(target.pool.label))
+
+    def titles(result: dict) -> set[str]:
+        return {status["title"] for status in result["results"]}
+
+    await StatusController.status_create(writer_id, "In Progress")
+    assert "In Progress" in titles(await StatusController.get_status_list(writer_id))
+    assert counts["primary"] == sum(counts.values()), counts
+    ReadYourWrites._last_writes.clear()
+    assert "In Progress" in titles(await StatusController.get_status_list(writer_id))
+    assert counts["primary"] == sum(counts.values()), counts
+    print("read after write: primary (same process and other worker)")
+
+    counts.clear()
+    for _ in range(100):
+        await StatusController.get_status_list(reader_id)
+    assert counts["primary"] == 0, counts
+    print("reads per engine: " + ", ".join(f"{label}={count}" for label, count in sorted(counts.items())))
+    print("available replicas: " + ", ".join(replica.pool.label for replica in replica_candidates()))
+
+    await asyncio.sleep(window)
+    assert "In Progress" not in titles(await StatusController.get_status_list(writer_id))
+    print(f"read {window}s after write: replica (stale copy, expected)")
+
+    async def primary_read():
+        await ReadYourWrites.mark_write(writer_id)
+        return await StatusController.get_status_list(writer_id)
+
+    results = {
+        "replica_read": await measure_async(lambda: StatusController.get_status_list(reader_id), number),
+        "primary_read": await measure_async(primary_read, number),
+    }
+    print_results(results)
+    await RedisController.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strategy", choices=("round_robin", "least_connections"), default="round_robin")
+    parser.add_argument("--window", type=float, default=1.0)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=6393)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="todoapi-replica-"))
+    primary = directory / "primary.db"
+    replicas = [directory / f"replica{index}.db" for index in range(2)]
+    unavailable = directory / "missing" / "replica.db"
+    setup_env(
+        DB_CONNECTION_STRING=f"sqlite:///{primary}",
+        DB_REPLICA_CONNECTION_STRINGS=",".join(f"sqlite:///{path}" for path in (*replicas, unavailable)),
+        DB_REPLICA_STRATEGY=args.strategy,
+        DB_READ_YOUR_WRITES_SECONDS=str(args.window),
+        REDIS_PORT=str(args.port),
+        LOG_LEVEL="ERROR",
+    )
+    server = RedisServerProcess(args.port).start()
+    try:
+        asyncio.run(run(primary, replicas, args.number, args.window))
+    finally:
+        server.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
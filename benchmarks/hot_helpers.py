@@ -0,0 +1,135 @@
+"""
+Profillerde one cikan yardimci fonksiyonlar icin mikro benchmarklar
+
+Olculenler: DBTask.task_info, BodyTask dogrulamasi (validate_date icindeki strptime dahil), create_tokens,
+get_current_user (jwt.decode), other_exception_handle metin eslestirmesi, LoggerJsonFormatter.add_fields
+Her biri icin cagri basina sure ve tracemalloc ile bellek tepe degeri / serbest birakilmayan blok sayisi raporlanir.
+--output ile sonuclar commit bilgisiyle JSON olarak kaydedilir, benchmarks.compare ile karsilastirilabilir.
+
+Kullanim: python -m benchmarks.hot_helpers [--number 20000] [--only task_info,create_tokens] [--output sonuc.json]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sqlite3
+from collections.abc import Callable, Coroutine
+from datetime import datetime, timezone
+
+from benchmarks.utils import git_commit, measure, measure_allocations, print_results, setup_env
+
+setup_env()
+
+from sqlalchemy.exc import IntegrityError, OperationalError  # noqa: E402
+
+from apps.controllers.auth.utils import create_tokens, get_current_user  # noqa: E402
+from apps.controllers.TaskController import TaskController  # noqa: E402
+from apps.controllers.utils import other_exception_handle  # noqa: E402
+from apps.models.body.Task import BodyTask  # noqa: E402
+from apps.models.db import DBTask  # noqa: E402
+from logger import LoggerJsonFormatter  # noqa: E402
+
+
+def run_sync(coro: Coroutine):
+    """
+    Icinde gercek bir await olmayan coroutine'i event loop olmadan calistirir
+    Event loop maliyeti olcume karismaz
+    """
+    try:
+        coro.send(None)
+    except StopIteration as exc:
+        return exc.value
+    coro.close()
+    raise RuntimeError("Coroutine suspended, it needs an event loop")
+
+
+def silent_logger() -> logging.Logger:
+    """
+    other_exception_handle'in log maliyeti olcume karismasin diye kapali logger
+    """
+    logger = logging.getLogger("BENCH_SILENT")
+    logger.propagate = False
+    logger.disabled = True
+    return logger
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    now = datetime.now(timezone.utc)
+    task = DBTask(
+        id=1,
+        user_id=1,
+        title="Prepare release notes",
+        content="Collect merged PRs and write the changelog",
+        status=1,
+        priority=1,
+        estimated_end_date=now,
+        date_created=now,
+        date_modified=now,
+    )
+    task_body = {"title": "Benchmark task", "content": "Benchmark content", "status": "1", "priority": "2"}
+    task_body_with_date = {**task_body, "estimated_end_date": "2030-01-01 12:00:00"}
+    access_token = run_sync(create_tokens("1", "bench_user", include_refresh_token=False))
+
+    logger = silent_logger()
+    columns = TaskController.columnDescriptions
+    unique_error = IntegrityError("INSERT", {}, sqlite3.IntegrityError("UNIQUE constraint failed: Task.title"))
+    not_null_error = IntegrityError("INSERT", {}, sqlite3.IntegrityError("NOT NULL constraint failed: Task.title"))
+    other_error = OperationalError("SELECT", {}, sqlite3.OperationalError("database is locked"))
+
+    formatter = LoggerJsonFormatter("%(timestamp)s | [%(level)s] - [%(name)s] - [%(message)s]")
+    record = logging.makeLogRecord(
+        {
+            "name": "AUTH_CONTROLLER",
+            "levelno": logging.INFO,
+            "levelname": "INFO",
+            "msg": "User direct login is successful",
+            "username": "bench_user",
+            "ip": "127.0.0.1",
+        }
+    )
+
+    return {
+        "task_info": task.task_info,
+        "body_task": lambda: BodyTask.model_validate(task_body),
+        "body_task_date": lambda: BodyTask.model_validate(task_body_with_date),
+        "create_tokens": lambda: run_sync(create_tokens("1", "bench_user")),
+        "create_access_token": lambda: run_sync(create_tokens("1", "bench_user", include_refresh_token=False)),
+        "get_current_user": lambda: run_sync(get_current_user(access_token)),
+        "exc_handle_unique": lambda: other_exception_handle(unique_error, {}, columns, logger),
+        "exc_handle_not_null": lambda: other_exception_handle(not_null_error, {}, columns, logger),
+        "exc_handle_other": lambda: other_exception_handle(other_error, {}, columns, logger),
+        "json_add_fields": lambda: formatter.add_fields({}, record, {}),
+        "json_format": lambda: formatter.format(record),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--alloc-number", type=int, default=2000, help="Bellek olcumu icin cagri sayisi")
+    parser.add_argument("--only", help="Virgulle ayrilmis benchmark isimleri")
+    parser.add_argument("--output", help="Sonuclarin yazilacagi JSON dosyasi")
+    args = parser.parse_args()
+
+    cases = build_cases()
+    if args.only:
+        cases = {name: cases[name] for name in args.only.split(",")}
+
+    results = {}
+    for name, func in cases.items():
+        # tracemalloc sureyi bozdugu icin sure ve bellek ayri turlarda olculur
+        results[name] = {**measure(func, args.number), **measure_allocations(func, args.alloc_number)}
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"meta": {"commit": git_commit(), "python": platform.python_version()}, "results": results},
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Log cagrilarinin istek yolundaki (event loop) maliyetini olcer
+
+legacy: logger'a bagli senkron FileHandler + StreamHandler, JSON formatlama ve yazma cagiran thread'de
+current: setup_logger ile kuyruk tabanli pipeline, cagiran thread sadece kuyruga yazar
+
+login senaryosu /user/login akisindaki log kayitlarini (basarili giris, aktivasyon, TFA) eszamanli
+coroutine'lerle uretir ve event loop'un saniyede isleyebildigi istek sayisini raporlar
+
+Kullanim: python -m benchmarks.logging_overhead [--number 20000] [--requests 5000] [--concurrency 100]
+Konsol ciktisi /dev/null'a yonlendirilmelidir: python -m benchmarks.logging_overhead 2>/dev/null
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+from benchmarks.utils import BASE_DIR, measure, print_results, setup_env
+
+setup_env()
+
+from logger import LoggerJsonFormatter, get_dropped_log_count, setup_logger  # noqa: E402
+
+
+def legacy_logger(name: str) -> logging.Logger:
+    """
+    Eski setup_logger davranisi: her logger'a senkron dosya ve konsol handler'i
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    formatter = LoggerJsonFormatter("%(timestamp)s | [%(level)s] - [%(name)s] - [%(message)s]")
+    for handler in (logging.FileHandler(BASE_DIR / "logs" / "benchmark.log"), logging.StreamHandler()):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+
+async def login_scenario(logger: logging.Logger, requests: int, concurrency: int) -> dict:
+    """
+    Her istek /user/login'deki gibi 1-2 log kaydi uretir, araya event loop'a donus eklenir
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i: int) -> None:
+        async with semaphore:
+            extra = {"username": f"bench_user_{i}", "ip": "127.0.0.1"}
+            await asyncio.sleep(0)
+            if i % 10 == 0:
+                logger.info("User TFA code is sent", extra=extra)
+            logger.info("User direct login is successful", extra=extra)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "calls": requests,
+        "mean_us": elapsed / requests * 1_000_000,
+        "p50_us": float("nan"),
+        "p95_us": float("nan"),
+        "ops_per_sec": requests / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    legacy = legacy_logger("BENCH_LEGACY")
+    current = setup_logger("BENCH_CURRENT")
+    extra = {"username": "bench_user", "ip": "127.0.0.1"}
+
+    results = {
+        "legacy_info": measure(lambda: legacy.info("User direct login is successful", extra=extra), args.number),
+        "current_info": measure(lambda: current.info("User direct login is successful", extra=extra), args.number),
+        "legacy_login": asyncio.run(login_scenario(legacy, args.requests, args.concurrency)),
+        "current_login": asyncio.run(login_scenario(current, args.requests, args.concurrency)),
+    }
+    print_results(results)
+    # Kuyruk boyutu asildiysa kayitlar atilir, bu sayi olcumun yorumlanmasi icin yazdirilir
+    print(f"dropped records: {get_dropped_log_count()}", file=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Mail template'lerinin saniyede kac mesaj render ettigini olcer
+
+legacy: her gonderimde str.format + yeni MIMEMultipart agaci + msg.as_string() (sadece html)
+current: MailTemplate ile onceden parcalanmis template, sabit header ve boundary (html + plain-text)
+
+Kullanim: python -m benchmarks.mail_render [--number 5000]
+"""
+
+import argparse
+from collections.abc import Callable
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from benchmarks.utils import measure, print_results, setup_env
+
+setup_env()
+
+from apps.celery_app.constants import TEMPLATES_DIR  # noqa: E402
+from apps.controllers.MailController import MailController  # noqa: E402
+from config import ACCOUNT_VERIFY_TOKEN_EXP, SMTP_USER, TFA_TOKEN_EXP  # noqa: E402
+
+RECIPIENT = "bench@todoapi.local"
+USERNAME = "bench_user"
+VERIFY_LINK = "http://127.0.0.1:8000/auth/verify/eyJ1c2VyX2lkIjoxLCJqdGkiOiJiZW5jaCJ9.Z6xYzA.signature"
+
+
+def legacy_render(file_name: str, subject: str, *values) -> Callable[[], str]:
+    with open(TEMPLATES_DIR / file_name, "r", encoding="utf-8") as f:
+        template = f.read()
+
+    def render() -> str:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = f"TodoAPI Project <{SMTP_USER}>"
+        msg["To"] = RECIPIENT
+        msg.attach(MIMEText(template.format(*values), "html"))
+        return msg.as_string()
+
+    return render
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    controller = MailController(RECIPIENT, USERNAME)
+    verify_values = (USERNAME, ACCOUNT_VERIFY_TOKEN_EXP, VERIFY_LINK, VERIFY_LINK)
+    tfa_values = (USERNAME, "A1B2C3", TFA_TOKEN_EXP)
+    overdue_values = (USERNAME, "Prepare release notes", "2025-01-01 12:00:00")
+
+    print_results(
+        {
+            "legacy_verify": measure(
+                legacy_render("verify_account.html", "TodoAPI: Verify Account", *verify_values), args.number
+            ),
+            "current_verify": measure(lambda: controller.get_verify_message(VERIFY_LINK), args.number),
+            "legacy_tfa": measure(
+                legacy_render("tfa_code.html", "TodoAPI: Two-Factor Authentication", *tfa_values), args.number
+            ),
+            "current_tfa": measure(lambda: controller.get_tfa_message("A1B2C3"), args.number),
+            "legacy_overdue": measure(
+                legacy_render("task_overdue.html", "TodoAPI: Task Overdue Notification", *overdue_values), args.number
+            ),
+            "current_overdue": measure(
+                lambda: controller.get_task_overdue_message(*overdue_values[1:]), args.number
+            ),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Istemci tarafli Redis onbelleginin (ClientSideCache) dogrulugunu ve okuma maliyetini olcer
+
+Yerel bir redis-server sureci baslatilir (redis-server PATH'te olmalidir). Once gecersizlestirme kontrol edilir:
+onbellege alinan tfa_code anahtari baska bir istemciden degistirilir ve yeni degerin okunmasina kadar gecen sure
+yazdirilir. Ardindan ayni anahtar icin dogrudan GET ve cached_get sureleri ile hit orani raporlanir.
+
+Kullanim: python -m benchmarks.redis_client_cache [--number 20000] [--port 6392]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.utils import RedisServerProcess, measure_async, print_results, setup_env
+
+
+async def run(number: int) -> None:
+    from prometheus_client import REGISTRY
+
+    from apps.controllers.RedisController import ClientSideCache, RedisController, redis_key
+
+    client = await RedisController(2).get_redis()
+    writer = await RedisController(2).get_redis()
+    key = redis_key("tfa_code", 1)
+    await writer.set(key, "AAAAAA")
+
+    ClientSideCache.start()
+    deadline = time.monotonic() + 5
+    while not ClientSideCache._synced:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Client side cache did not start tracking")
+        await asyncio.sleep(0.01)
+
+    assert await client.cached_get(key) == "AAAAAA"
+    assert await client.cached_get(key) == "AAAAAA"
+    await writer.set(key, "BBBBBB")
+    start = time.perf_counter()
+    while await client.cached_get(key) != "BBBBBB":
+        if time.perf_counter() - start > 2:
+            raise RuntimeError("Cached value was not invalidated")
+        await asyncio.sleep(0)
+    print(f"invalidation visible after: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    results = {
+        "direct_get": await measure_async(lambda: client.get(key), number),
+        "cached_get": await measure_async(lambda: client.cached_get(key), number),
+    }
+    print_results(results)
+
+    def sample(name: str, **labels: str) -> float:
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    hits = sample("todoapi_redis_client_cache_requests_total", db="2", result="hit")
+    misses = sample("todoapi_redis_client_cache_requests_total", db="2", result="miss")
+    invalidations = sample("todoapi_redis_client_cache_invalidations_total", kind="key")
+    print(f"hit rate: {hits / max(hits + misses, 1):.4f} ({hits:.0f} hits, {misses:.0f} misses)")
+    print(f"invalidated keys: {invalidations:.0f}")
+
+    ClientSideCache.stop()
+    await RedisController.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--port", type=int, default=6392)
+    args = parser.parse_args()
+
+    server = RedisServerProcess(args.port).start()
+    try:
+        setup_env(
+            REDIS_PORT=str(args.port),
+            REDIS_CLIENT_CACHE_ENABLED="true",
+            REDIS_CLIENT_CACHE_PREFIXES="tfa_code:",
+            LOG_LEVEL="WARNING",
+        )
+        asyncio.run(run(args.number))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Redis Cluster ve istemci tarafli shard modunu birden fazla yerel redis-server sureci ile dogrular ve olcer
+
+sharded: --nodes kadar bagimsiz redis-server baslatilir, anahtarlar RedisController'in hash halkasi ile dagitilir
+cluster: ayni sayida node cluster modunda baslatilir ve redis-cli --cluster create ile cluster kurulur (replikasiz)
+redis-server ve (cluster icin) redis-cli PATH'te olmalidir.
+
+Anahtarlarin node'lara dagilimi, ayni hash tag'li TFA anahtarlarinin tek komutla silinmesi, token iptali ve
+AuthMiddleware'in Redis'e dustugu durumdaki iptal kontrolunun (versiyon + JTI tek pipeline) suresi raporlanir.
+revocation_check get_redis_connection maliyetini de icerir, bu maliyet ayrica get_connection olarak raporlanir.
+
+Kullanim: python -m benchmarks.redis_sharding [--topology sharded|cluster] [--nodes 3] [--base-port 7101]
+          [--keys 10000] [--number 5000]
+"""
+
+import argparse
+import asyncio
+import shutil
+import subprocess
+import time
+import uuid
+
+from benchmarks.utils import RedisServerProcess, measure_async, print_results, setup_env
+
+
+def create_cluster(ports: list[int]) -> None:
+    """
+    Cluster modunda baslatilmis node'lari replikasiz bir cluster olarak birlestirir
+    """
+    executable = shutil.which("redis-cli")
+    if executable is None:
+        raise SystemExit("redis-cli is not installed")
+    subprocess.run(
+        [executable, "--cluster", "create", *(f"127.0.0.1:{port}" for port in ports), "--cluster-replicas", "0"]
+        + ["--cluster-yes"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        info = subprocess.run(
+            [executable, "-p", str(ports[0]), "cluster", "info"], capture_output=True, text=True
+        ).stdout
+        if "cluster_state:ok" in info:
+            return
+        time.sleep(0.2)
+    raise RuntimeError("Redis cluster did not become ready")
+
+
+async def run(ports: list[int], keys: int, number: int) -> None:
+    import redis.asyncio as redis
+
+    from apps.controllers.auth.TokenRevocation import TokenRevocation
+    from apps.controllers.RedisController import RedisController, redis_key
+    from apps.controllers.utils import get_redis_connection
+    from config import JTI_REDIS_DB
+
+    client = await RedisController().get_redis()
+    for user_id in range(keys):
+        await client.set(redis_key("tfa_code", user_id), "ABCDEF", ex=300)
+
+    distribution = {}
+    for port in ports:
+        node = redis.Redis(host="127.0.0.1", port=port)
+        distribution[port] = await node.dbsize()
+        await node.aclose()
+    print("keys per node: " + ", ".join(f"{port}={count}" for port, count in distribution.items()))
+
+    # Ayni kullanicinin TFA kodu ve mail kilidi ayni hash tag'e sahiptir, tek DEL ile silinebilir
+    await client.set(redis_key("mail_dedup:tfa", 1), "", ex=60)
+    deleted = await client.delete(redis_key("tfa_code", 1), redis_key("mail_dedup:tfa", 1))
+    assert deleted == 2, deleted
+
+    payload = {"sub": "1", "jti": str(uuid.uuid4()), "ver": 0, "typ": "access"}
+    assert not await TokenRevocation.is_token_revoked(payload)
+    await TokenRevocation.blacklist_access_jti(payload["jti"])
+    assert await TokenRevocation.is_token_revoked(payload)
+    other = {"sub": "2", "jti": str(uuid.uuid4()), "ver": 0, "typ": "access"}
+    await TokenRevocation.revoke_user("2")
+    assert await TokenRevocation.is_token_revoked(other)
+    print("tfa multi-key delete, jti blacklist and user revocation: ok")
+
+    fresh = {"sub": "3", "jti": str(uuid.uuid4()), "ver": 0, "typ": "access"}
+    results = {
+        "get": await measure_async(lambda: client.get(redis_key("tfa_code", 2)), number),
+        "get_connection": await measure_async(lambda: get_redis_connection(JTI_REDIS_DB), number),
+        "revocation_check": await measure_async(lambda: TokenRevocation.is_token_revoked(fresh), number),
+    }
+    print_results(results)
+    await RedisController.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--topology", choices=("sharded", "cluster"), default="sharded")
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--base-port", type=int, default=7101)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    ports = [args.base_port + index for index in range(args.nodes)]
+    server_args = ("--cluster-enabled", "yes", "--cluster-config-file", "nodes.conf")
+    servers = []
+    try:
+        for port in ports:
+            servers.append(RedisServerProcess(port, *(server_args if args.topology == "cluster" else ())).start())
+        if args.topology == "cluster":
+            create_cluster(ports)
+
+        setup_env(
+            REDIS_KEY_MODE="prefixed",
+            REDIS_TOPOLOGY=args.topology,
+            REDIS_NODES=",".join(f"127.0.0.1:{port}" for port in ports),
+            LOG_LEVEL="WARNING",
+        )
+        asyncio.run(run(ports, args.keys, args.number))
+    finally:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
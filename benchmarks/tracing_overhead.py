@@ -0,0 +1,97 @@
+"""
+Tracing acik ve kapaliyken span instrumentation maliyetini olcer
+
+TRACING_ENABLED import aninda okundugu icin her mod ayri bir alt surecte olculur.
+Kapali modda start_span paylasilan no-op context manager'i, traced/trace_methods ise fonksiyonun kendisini doner;
+bu nedenle kapali moddaki sureler plain_call ve bos with blogu ile ayni olmalidir.
+Acik modda spanler --exporter file ile gecici bir dosyaya veya --exporter otlp ile OTLPCollectorStandIn'e yazilir.
+
+Kullanim: python -m benchmarks.tracing_overhead [--number 50000] [--exporter file|otlp]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.utils import BASE_DIR, OTLPCollectorStandIn, measure, print_results, setup_env
+
+COLLECTOR_PORT = 4319
+
+
+def run_mode(number: int) -> dict:
+    from database import db_session
+    from tracing import inject, start_span, traced
+
+    def plain() -> int:
+        return 1
+
+    traced_plain = traced("plain")(plain)
+
+    def span_block() -> None:
+        with start_span("block"):
+            pass
+
+    def nested_spans() -> None:
+        with start_span("parent", "server"):
+            with start_span("child", "client", {"db.system": "sqlite"}):
+                inject({})
+
+    def session_block() -> None:
+        with db_session():
+            pass
+
+    return {
+        "plain_call": measure(plain, number),
+        "traced_call": measure(traced_plain, number),
+        "span_block": measure(span_block, number),
+        "nested_spans": measure(nested_spans, number),
+        "db_session": measure(session_block, number // 10),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=50000)
+    parser.add_argument("--exporter", choices=("file", "otlp"), default="file")
+    parser.add_argument("--mode", choices=("enabled", "disabled"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.number)))
+        return
+
+    trace_file = os.path.join(tempfile.mkdtemp(prefix="todoapi-trace-"), "traces.jsonl")
+    collector = OTLPCollectorStandIn("127.0.0.1", COLLECTOR_PORT).start() if args.exporter == "otlp" else None
+    setup_env(
+        TRACING_EXPORTER=args.exporter,
+        TRACING_FILE=trace_file,
+        TRACING_OTLP_ENDPOINT=f"http://127.0.0.1:{COLLECTOR_PORT}/v1/traces",
+    )
+
+    results = {}
+    for mode in ("disabled", "enabled"):
+        output = subprocess.check_output(
+            [sys.executable, "-m", "benchmarks.tracing_overhead", "--mode", mode, "--number", str(args.number)],
+            cwd=BASE_DIR,
+            env={**os.environ, "TRACING_ENABLED": str(mode == "enabled").lower()},
+            text=True,
+        )
+        for name, result in json.loads(output.strip().splitlines()[-1]).items():
+            results[f"{mode}_{name}"] = result
+    print_results(results)
+
+    if collector is not None:
+        time.sleep(0.5)
+        print(f"spans received by collector: {len(collector.spans)}")
+        collector.shutdown()
+    elif os.path.exists(trace_file):
+        with open(trace_file, encoding="utf-8") as f:
+            print(f"span batches written to {trace_file}: {sum(1 for _ in f)}")
+
+
+if __name__ == "__main__":
+    main()
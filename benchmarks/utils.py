@@ -0,0 +1,608 @@
+import fnmatch
+import json
+import os
+import shutil
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_ENV = {
+    "DB_POOL_SIZE": "5",
+    "DB_MAX_OVERFLOW": "5",
+    "DB_POOL_TIMEOUT": "30",
+    "DB_POOL_RECYCLE": "1800",
+    "LOG_FILE_NAME": "benchmark.log",
+    "ACCESS_TOKEN_EXP": "15",
+    "REFRESH_TOKEN_EXP": "7",
+    "TFA_TOKEN_EXP": "5",
+    "ACCOUNT_VERIFY_TOKEN_EXP": "24",
+    "JWT_SECRET_KEY": "benchmark-secret",
+    "TFA_SECRET_KEY": "benchmark-tfa-secret",
+    "TOKEN_ALGORITHM": "HS256",
+    "REDIS_ADDR": "127.0.0.1",
+    "REDIS_PORT": "6379",
+    "REDIS_USERNAME": "",
+    "REDIS_PASSWORD": "",
+    "JTI_REDIS_DB": "1",
+    "TFA_LOGIN_REDIS_DB": "2",
+    "redis_db": "3",
+    "SMTP_SERVER": "127.0.0.1",
+    "SMTP_PORT": "2525",
+    "SMTP_USER": "benchmark@todoapi.local",
+    "SMTP_PASSWORD": "benchmark",
+    "SITE_BASE_ADDR": "http://127.0.0.1:8000",
+}
+
+
+def setup_env(**overrides: str) -> None:
+    """
+    Benchmark icin gerekli env degerlerini ayarlar
+    Uygulama modulleri import edilmeden once cagrilmalidir
+    Ortamda tanimli olan degerler ezilmez, overrides ile verilenler her zaman yazilir
+    """
+    if "DB_CONNECTION_STRING" not in os.environ and "DB_CONNECTION_STRING" not in overrides:
+        db_path = Path(tempfile.mkdtemp(prefix="todoapi-bench-")) / "bench.db"
+        os.environ["DB_CONNECTION_STRING"] = f"sqlite:///{db_path}"
+
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.update(overrides)
+
+    (BASE_DIR / "logs").mkdir(exist_ok=True)
+
+
+def measure(func: Callable[[], object], number: int, warmup: int = 10) -> dict:
+    """
+    Verilen fonksiyonu number kez calistirir, cagri basina sureleri (mikrosaniye) doner
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(number):
+        start = time.perf_counter_ns()
+        func()
+        timings.append((time.perf_counter_ns() - start) / 1000)
+
+    timings.sort()
+    return {
+        "calls": number,
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p95_us": timings[int(len(timings) * 0.95) - 1],
+        "ops_per_sec": number / (sum(timings) / 1_000_000),
+    }
+
+
+async def measure_async(func: Callable[[], Awaitable], number: int, warmup: int = 10) -> dict:
+    """
+    measure'in coroutine donduren fonksiyonlar icin olan hali
+    """
+    for _ in range(warmup):
+        await func()
+
+    timings = []
+    for _ in range(number):
+        start = time.perf_counter_ns()
+        await func()
+        timings.append((time.perf_counter_ns() - start) / 1000)
+
+    timings.sort()
+    return {
+        "calls": number,
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p95_us": timings[int(len(timings) * 0.95) - 1],
+        "ops_per_sec": 1_000_000 / statistics.fmean(timings),
+    }
+
+
+def measure_allocations(func: Callable[[], object], number: int, warmup: int = 10) -> dict:
+    """
+    Cagri basina tracemalloc ile olculen gecici bellek tepe degerini (byte) ve
+    cagrilar sonrasinda serbest birakilmayan blok sayisini doner
+    """
+    for _ in range(warmup):
+        func()
+
+    tracemalloc.start()
+    try:
+        # Degerler tek bir toplamda tutulur, olcum dongusu blok sayisina eklenmez
+        peak_total = 0
+        blocks_before = sys.getallocatedblocks()
+        for _ in range(number):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            peak_total += tracemalloc.get_traced_memory()[1] - current
+        retained = sys.getallocatedblocks() - blocks_before
+    finally:
+        tracemalloc.stop()
+
+    return {"alloc_peak_bytes": peak_total / number, "retained_blocks_per_call": retained / number}
+
+
+def git_commit() -> str | None:
+    """
+    Sonuclarin hangi commit'e ait oldugunu kaydetmek icin kisa commit hash'ini doner
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict[str, dict]) -> None:
+    """
+    Benchmark sonuclarini tablo olarak yazdirir
+    measure_allocations sonuclari eklenmisse bellek kolonlari da yazdirilir
+    """
+    name_width = max(len(name) for name in results) + 2
+    with_allocations = any("alloc_peak_bytes" in result for result in results.values())
+    header = f"{'name':<{name_width}}{'calls':>10}{'mean(us)':>12}{'p50(us)':>12}{'p95(us)':>12}{'ops/s':>14}"
+    if with_allocations:
+        header += f"{'peak(B)':>12}{'retained':>10}"
+    print(header)
+    for name, result in results.items():
+        line = (
+            f"{name:<{name_width}}{result['calls']:>10}{result['mean_us']:>12.1f}"
+            f"{result['p50_us']:>12.1f}{result['p95_us']:>12.1f}{result['ops_per_sec']:>14.0f}"
+        )
+        if with_allocations:
+            line += f"{result.get('alloc_peak_bytes', 0):>12.0f}{result.get('retained_blocks_per_call', 0):>10.2f}"
+        print(line)
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Gelen mailleri kaydedip basarili cevap donen minimal SMTP oturumu
+    STARTTLS desteklemez, worker'lar SMTP_USE_TLS=false ile calistirilmalidir
+    """
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self) -> None:
+        self.reply("220 todoapi-benchmark ESMTP")
+        while line := self.rfile.readline():
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.reply("250-todoapi-benchmark")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif command == b"AUTH":
+                self.reply("235 Authentication successful")
+            elif command == b"DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(data_line)
+                self.server.record(b"".join(data))
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """
+    Benchmarklarda gercek SMTP sunucusu yerine kullanilir
+    Alinan her mailin zamanini ve konusunu tutar
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int) -> None:
+        super().__init__((host, port), _SMTPSinkHandler)
+        self.lock = threading.Lock()
+        self.messages: list[tuple[float, str]] = []
+
+    def record(self, data: bytes) -> None:
+        subject = ""
+        for line in data.split(b"\r\n"):
+            if line.startswith(b"Subject:"):
+                subject = line[8:].strip().decode(errors="replace")
+                break
+        with self.lock:
+            self.messages.append((time.perf_counter(), subject))
+
+    @property
+    def received(self) -> int:
+        with self.lock:
+            return len(self.messages)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.messages.clear()
+
+    def wait_for(self, count: int, timeout: float) -> bool:
+        """
+        En az count adet mail gelene kadar bekler
+        """
+        deadline = time.monotonic() + timeout
+        while self.received < count:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def start(self) -> "SMTPSink":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def process_tree_rss_kib(pid: int) -> int | None:
+    """
+    Verilen surec ve alt sureclerinin toplam RSS degerini (KiB) doner
+    Sadece /proc dosya sistemi olan platformlarda calisir
+    """
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pending.extend(int(child) for child in f.read().split())
+    except (FileNotFoundError, ProcessLookupError):
+        return total or None
+    return total
+
+
+class _Status(str):
+    """
+    RESP simple string (+OK) olarak yazilacak cevap
+    """
+
+
+class _RedisStandInHandler(socketserver.StreamRequestHandler):
+    """
+    RESP2 protokolunde, API'nin kullandigi komutlari destekleyen minimal Redis oturumu
+    Abone olunan kanallara PUBLISH ile gelen mesajlar baska thread'lerden yazildigi icin yazmalar kilitlenir
+    """
+
+    def setup(self) -> None:
+        super().setup()
+        self.write_lock = threading.Lock()
+        self.channels: set[str] = set()
+
+    def read_command(self) -> list[str] | None:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.decode().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode())
+        return args
+
+    @classmethod
+    def encode(cls, value) -> bytes:
+        if isinstance(value, _Status):
+            return f"+{value}\r\n".encode()
+        if isinstance(value, Exception):
+            return f"-ERR {value}\r\n".encode()
+        if isinstance(value, bool) or isinstance(value, int):
+            return f":{int(value)}\r\n".encode()
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, list):
+            return f"*{len(value)}\r\n".encode() + b"".join(cls.encode(item) for item in value)
+        encoded = str(value).encode()
+        return b"$%d\r\n%s\r\n" % (len(encoded), encoded)
+
+    def write(self, value) -> None:
+        data = self.encode(value)
+        with self.write_lock:
+            self.wfile.write(data)
+
+    def handle(self) -> None:
+        db = 0
+        try:
+            while (command := self.read_command()) is not None:
+                if not command:
+                    continue
+                name, args = command[0].upper(), command[1:]
+                if name == "SELECT":
+                    db = int(args[0])
+                    self.write(_Status("OK"))
+                elif name == "QUIT":
+                    self.write(_Status("OK"))
+                    return
+                elif name in ("SUBSCRIBE", "UNSUBSCRIBE"):
+                    for reply in self.server.subscribe(self, name == "SUBSCRIBE", args):
+                        self.write(reply)
+                elif name == "PING" and self.channels:
+                    # Abone olunmus baglantida PING cevabi pong mesajidir
+                    self.write(["pong", args[0] if args else ""])
+                else:
+                    try:
+                        self.write(self.server.execute(db, name, args))
+                    except Exception as exc:
+                        self.write(exc)
+        finally:
+            self.server.subscribe(self, False, [])
+
+
+WRONGTYPE_ERROR = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+class _SortedSet(dict):
+    """
+    RedisStandIn'de sorted set degeri (member -> score)
+    """
+
+
+def _parse_score(value: str) -> tuple[float, bool]:
+    # ZRANGEBYSCORE/ZREMRANGEBYSCORE sinirlari, "(" ile baslayan sinir dahil degildir
+    if value.startswith("("):
+        return float(value[1:]), True
+    return float(value), False
+
+
+def _in_range(score: float, minimum: str, maximum: str) -> bool:
+    low, low_exclusive = _parse_score(minimum)
+    high, high_exclusive = _parse_score(maximum)
+    return (score > low if low_exclusive else score >= low) and (score < high if high_exclusive else score <= high)
+
+
+class RedisStandIn(socketserver.ThreadingTCPServer):
+    """
+    Benchmarklarda gercek Redis yerine kullanilan, bellekte calisan RESP2 sunucusu
+    Sadece API'nin kullandigi komutlari destekler: string/anahtar (GET, SET, SETEX, EXISTS, DEL, TTL, SCAN...),
+    hash (HGET, HGETALL, HINCRBY), sorted set (ZADD, ZRANGEBYSCORE, ZREMRANGEBYSCORE) ve pub/sub
+    (SUBSCRIBE, PUBLISH). Pipeline'lar komutlar sirayla islendigi icin ayrica desteklenmesi gerekmez
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int) -> None:
+        super().__init__((host, port), _RedisStandInHandler)
+        self.lock = threading.Lock()
+        self.dbs: dict[int, dict[str, tuple[str | dict, float | None]]] = {}
+        self.subscribers: dict[str, set[_RedisStandInHandler]] = {}
+
+    def lookup(self, db: int, key: str) -> tuple[str | dict, float | None] | None:
+        entry = self.dbs.setdefault(db, {}).get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.dbs[db][key]
+            return None
+        return entry
+
+    def container(self, db: int, key: str, kind: type[dict]) -> dict:
+        """
+        Hash veya sorted set degerini doner, anahtar yoksa bos olarak olusturur
+        """
+        entry = self.lookup(db, key)
+        if entry is None:
+            entry = self.dbs[db][key] = (kind(), None)
+        if type(entry[0]) is not kind:
+            raise ValueError(WRONGTYPE_ERROR)
+        return entry[0]
+
+    def subscribe(self, handler: _RedisStandInHandler, subscribe: bool, channels: list[str]) -> list[list]:
+        """
+        Baglantiyi kanallara abone eder veya aboneligini kaldirir, kanal verilmeyen UNSUBSCRIBE hepsini kaldirir
+        """
+        with self.lock:
+            if not subscribe and not channels:
+                channels = sorted(handler.channels)
+            replies = []
+            for channel in channels:
+                if subscribe:
+                    handler.channels.add(channel)
+                    self.subscribers.setdefault(channel, set()).add(handler)
+                else:
+                    handler.channels.discard(channel)
+                    self.subscribers.get(channel, set()).discard(handler)
+                replies.append(["subscribe" if subscribe else "unsubscribe", channel, len(handler.channels)])
+            return replies
+
+    def execute(self, db: int, name: str, args: list[str]):
+        with self.lock:
+            data = self.dbs.setdefault(db, {})
+            if name in ("PING", "AUTH", "CLIENT"):
+                return _Status("PONG") if name == "PING" else _Status("OK")
+            if name == "GET":
+                entry = self.lookup(db, args[0])
+                if entry is not None and not isinstance(entry[0], str):
+                    raise ValueError(WRONGTYPE_ERROR)
+                return entry[0] if entry else None
+            if name == "SET":
+                options = [arg.upper() for arg in args[2:]]
+                exists = self.lookup(db, args[0]) is not None
+                if ("NX" in options and exists) or ("XX" in options and not exists):
+                    return None
+                expire_at = None
+                for option, unit in (("EX", 1), ("PX", 0.001)):
+                    if option in options:
+                        expire_at = time.monotonic() + int(args[2 + options.index(option) + 1]) * unit
+                data[args[0]] = (args[1], expire_at)
+                return _Status("OK")
+            if name == "SETEX":
+                data[args[0]] = (args[2], time.monotonic() + int(args[1]))
+                return _Status("OK")
+            if name == "EXISTS":
+                return sum(self.lookup(db, key) is not None for key in args)
+            if name in ("DEL", "UNLINK"):
+                return sum(data.pop(key, None) is not None for key in args)
+            if name == "GETDEL":
+                entry = self.lookup(db, args[0])
+                data.pop(args[0], None)
+                return entry[0] if entry else None
+            if name in ("TTL", "PTTL"):
+                entry = self.lookup(db, args[0])
+                if entry is None:
+                    return -2
+                if entry[1] is None:
+                    return -1
+                remaining = entry[1] - time.monotonic()
+                return round(remaining) if name == "TTL" else round(remaining * 1000)
+            if name == "EXPIRE":
+                entry = self.lookup(db, args[0])
+                if entry is None:
+                    return 0
+                data[args[0]] = (entry[0], time.monotonic() + int(args[1]))
+                return 1
+            if name == "INCR":
+                entry = self.lookup(db, args[0])
+                value = int(entry[0]) + 1 if entry else 1
+                data[args[0]] = (str(value), entry[1] if entry else None)
+                return value
+            if name == "HGET":
+                entry = self.lookup(db, args[0])
+                return entry[0].get(args[1]) if entry else None
+            if name == "HGETALL":
+                entry = self.lookup(db, args[0])
+                return [item for pair in entry[0].items() for item in pair] if entry else []
+            if name == "HINCRBY":
+                fields = self.container(db, args[0], dict)
+                value = int(fields.get(args[1], 0)) + int(args[2])
+                fields[args[1]] = str(value)
+                return value
+            if name == "ZADD":
+                members = self.container(db, args[0], _SortedSet)
+                added = 0
+                for score, member in zip(args[1::2], args[2::2]):
+                    added += member not in members
+                    members[member] = float(score)
+                return added
+            if name == "ZRANGEBYSCORE":
+                entry = self.lookup(db, args[0])
+                members = sorted((entry[0] if entry else {}).items(), key=lambda item: (item[1], item[0]))
+                in_range = [(member, score) for member, score in members if _in_range(score, args[1], args[2])]
+                if "WITHSCORES" in (arg.upper() for arg in args[3:]):
+                    return [item for member, score in in_range for item in (member, repr(score))]
+                return [member for member, _ in in_range]
+            if name == "ZREMRANGEBYSCORE":
+                entry = self.lookup(db, args[0])
+                if entry is None:
+                    return 0
+                removed = [member for member, score in entry[0].items() if _in_range(score, args[1], args[2])]
+                for member in removed:
+                    del entry[0][member]
+                return len(removed)
+            if name == "PUBLISH":
+                receivers = list(self.subscribers.get(args[0], ()))
+                for handler in receivers:
+                    try:
+                        handler.write(["message", args[0], args[1]])
+                    except OSError:
+                        pass
+                return len(receivers)
+            if name == "SCAN":
+                # Tum anahtarlar tek seferde donulur, cursor her zaman 0'dir
+                options = [arg.upper() for arg in args[1:]]
+                pattern = args[1 + options.index("MATCH") + 1] if "MATCH" in options else "*"
+                keys = [key for key in list(data) if fnmatch.fnmatchcase(key, pattern) and self.lookup(db, key)]
+                return ["0", keys]
+            if name == "FLUSHDB":
+                data.clear()
+                return _Status("OK")
+            if name == "FLUSHALL":
+                self.dbs.clear()
+                return _Status("OK")
+            raise ValueError(f"unknown command '{name}'")
+
+    def start(self) -> "RedisStandIn":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class RedisServerProcess:
+    """
+    Gecici bir dizinde, kalicilik kapali yerel bir redis-server sureci
+    RedisStandIn'in desteklemedigi ozellikler (CLIENT TRACKING, cluster) icin kullanilir
+    """
+
+    def __init__(self, port: int, *args: str) -> None:
+        self.port = port
+        self.args = args
+        self.directory = tempfile.mkdtemp(prefix="todoapi-redis-")
+        self.process: subprocess.Popen | None = None
+
+    def start(self) -> "RedisServerProcess":
+        executable = shutil.which("redis-server")
+        if executable is None:
+            raise SystemExit("redis-server is not installed")
+        self.process = subprocess.Popen(
+            [executable, "--port", str(self.port), "--save", "", "--appendonly", "no", "--dir", self.directory]
+            + list(self.args),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.5) as conn:
+                    conn.sendall(b"PING\r\n")
+                    if conn.recv(64).startswith(b"+PONG"):
+                        return self
+            except OSError:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"redis-server did not start on port {self.port}")
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+            self.process = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class _OTLPCollectorHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.record(json.loads(body))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class OTLPCollectorStandIn(ThreadingHTTPServer):
+    """
+    OTLP/HTTP JSON (POST /v1/traces) kabul eden, spanleri bellekte tutan collector yerine gecen sunucu
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int) -> None:
+        super().__init__((host, port), _OTLPCollectorHandler)
+        self.lock = threading.Lock()
+        self.spans: list[dict] = []
+
+    def record(self, payload: dict) -> None:
+        with self.lock:
+            for resource_spans in payload.get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    self.spans.extend(scope_spans.get("spans", []))
+
+    def start(self) -> "OTLPCollectorStandIn":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
@@ -1,5 +1,7 @@
+from typing import Literal
+
 from dotenv import load_dotenv
-from pydantic import ValidationError
+from pydantic import ValidationError, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,7 +11,22 @@ class Env(BaseSettings):
     DB_MAX_OVERFLOW: int
     DB_POOL_TIMEOUT: int
     DB_POOL_RECYCLE: int
+    SLOW_QUERY_THRESHOLD: float = 0.2
+    REQUEST_QUERY_COUNT_THRESHOLD: int = 20
+    REQUEST_DB_TIME_THRESHOLD: float = 0.5
+    DB_REPLICA_CONNECTION_STRINGS: str = ""
+    DB_REPLICA_STRATEGY: Literal["round_robin", "least_connections"] = "round_robin"
+    DB_REPLICA_RETRY_INTERVAL: float = 30.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_REDIS_DB: int = 0
     LOG_FILE_NAME: str
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""
+    LOG_RATE_LIMIT: int = 100
+    LOG_RATE_WINDOW: float = 1.0
+    LOG_SAMPLE_RATES: str = ""
+    LOG_SUPPRESSED_REPORT_INTERVAL: float = 60.0
     ACCESS_TOKEN_EXP: int
     REFRESH_TOKEN_EXP: int
     TFA_TOKEN_EXP: int
@@ -21,16 +38,62 @@ class Env(BaseSettings):
     REDIS_PORT: int
     REDIS_USERNAME: str
     REDIS_PASSWORD: str
+    REDIS_KEY_MODE: Literal["databases", "prefixed"] = "databases"
+    REDIS_KEY_PREFIX: str = "todoapi"
+    REDIS_DB: int = 0
+    REDIS_TOPOLOGY: Literal["single", "cluster", "sharded"] = "single"
+    REDIS_NODES: str = ""
+    REDIS_CLIENT_CACHE_ENABLED: bool = False
+    REDIS_CLIENT_CACHE_PREFIXES: str = "tfa_code:"
+    REDIS_CLIENT_CACHE_MAX_KEYS: int = 10000
+    REDIS_CLIENT_CACHE_TTL: float = 60.0
     JTI_REDIS_DB: int
     TFA_LOGIN_REDIS_DB: int
+    MAIL_DEDUP_WINDOW: int = 60
+    REVOCATION_PING_INTERVAL: float = 1.0
+    REVOCATION_MAX_LAG: float = 3.0
     redis_db: int
+    CELERY_WORKER_MAX_TASKS_PER_CHILD: int = 1000
+    CELERY_WORKER_MAX_MEMORY_PER_CHILD: int = 100000
+    CELERY_WORKER_PREFETCH_MULTIPLIER: int = 1
+    CELERY_RESULT_EXPIRES: int = 3600
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 0.5
+    OUTBOX_MAX_ATTEMPTS: int = 10
     SMTP_SERVER: str
     SMTP_PORT: int
     SMTP_USER: str
     SMTP_PASSWORD: str
+    SMTP_USE_TLS: bool = True
     SITE_BASE_ADDR: str
+    STARTUP_TIME_TARGET: float = 2.0
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    MAIL_HEALTH_CHECK_INTERVAL: float = 60.0
+    METRICS_ENABLED: bool = True
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_FORMAT: Literal["speedscope", "pstats"] = "speedscope"
+    PROFILING_INTERVAL: float = 0.001
+    PROFILING_STORAGE: Literal["directory", "redis"] = "directory"
+    PROFILING_DIR: str = "profiles"
+    PROFILING_REDIS_DB: int = 0
+    PROFILING_TTL: int = 86400
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: Literal["file", "otlp"] = "file"
+    TRACING_FILE: str = "logs/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://127.0.0.1:4318/v1/traces"
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_SERVICE_NAME: str = "todoapi"
+
+    @model_validator(mode="after")
+    def check_redis_topology(self) -> "Env":
+        # Redis Cluster ve shard modunda birden fazla DB kullanilamaz, anahtarlar onekle ayrilmalidir
+        if self.REDIS_TOPOLOGY != "single" and (self.REDIS_KEY_MODE != "prefixed" or not self.REDIS_NODES):
+            raise ValueError("REDIS_TOPOLOGY cluster/sharded requires REDIS_KEY_MODE=prefixed and REDIS_NODES")
+        return self
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", env_ignore_empty=True)
 
 
 try:
@@ -46,8 +109,23 @@ DB_POOL_SIZE = env.DB_POOL_SIZE
 DB_MAX_OVERFLOW = env.DB_MAX_OVERFLOW
 DB_POOL_TIMEOUT = env.DB_POOL_TIMEOUT
 DB_POOL_RECYCLE = env.DB_POOL_RECYCLE
+SLOW_QUERY_THRESHOLD = env.SLOW_QUERY_THRESHOLD
+REQUEST_QUERY_COUNT_THRESHOLD = env.REQUEST_QUERY_COUNT_THRESHOLD
+REQUEST_DB_TIME_THRESHOLD = env.REQUEST_DB_TIME_THRESHOLD
+DB_REPLICA_CONNECTION_STRINGS = env.DB_REPLICA_CONNECTION_STRINGS
+DB_REPLICA_STRATEGY = env.DB_REPLICA_STRATEGY
+DB_REPLICA_RETRY_INTERVAL = env.DB_REPLICA_RETRY_INTERVAL
+DB_READ_YOUR_WRITES_SECONDS = env.DB_READ_YOUR_WRITES_SECONDS
+DB_READ_YOUR_WRITES_REDIS_DB = env.DB_READ_YOUR_WRITES_REDIS_DB
 
 LOG_FILE_NAME = env.LOG_FILE_NAME
+LOG_QUEUE_SIZE = env.LOG_QUEUE_SIZE
+LOG_LEVEL = env.LOG_LEVEL
+LOG_LEVELS = env.LOG_LEVELS
+LOG_RATE_LIMIT = env.LOG_RATE_LIMIT
+LOG_RATE_WINDOW = env.LOG_RATE_WINDOW
+LOG_SAMPLE_RATES = env.LOG_SAMPLE_RATES
+LOG_SUPPRESSED_REPORT_INTERVAL = env.LOG_SUPPRESSED_REPORT_INTERVAL
 
 ACCESS_TOKEN_EXP = env.ACCESS_TOKEN_EXP
 REFRESH_TOKEN_EXP = env.REFRESH_TOKEN_EXP
@@ -58,11 +136,32 @@ REDIS_ADDR = env.REDIS_ADDR
 REDIS_PORT = env.REDIS_PORT
 REDIS_USERNAME = env.REDIS_USERNAME
 REDIS_PASSWORD = env.REDIS_PASSWORD
+REDIS_KEY_MODE = env.REDIS_KEY_MODE
+REDIS_KEY_PREFIX = env.REDIS_KEY_PREFIX
+REDIS_DB = env.REDIS_DB
+REDIS_TOPOLOGY = env.REDIS_TOPOLOGY
+REDIS_NODES = env.REDIS_NODES
+REDIS_CLIENT_CACHE_ENABLED = env.REDIS_CLIENT_CACHE_ENABLED
+REDIS_CLIENT_CACHE_PREFIXES = env.REDIS_CLIENT_CACHE_PREFIXES
+REDIS_CLIENT_CACHE_MAX_KEYS = env.REDIS_CLIENT_CACHE_MAX_KEYS
+REDIS_CLIENT_CACHE_TTL = env.REDIS_CLIENT_CACHE_TTL
 
 JTI_REDIS_DB = env.JTI_REDIS_DB
 TFA_LOGIN_REDIS_DB = env.TFA_LOGIN_REDIS_DB
+MAIL_DEDUP_WINDOW = env.MAIL_DEDUP_WINDOW
+REVOCATION_PING_INTERVAL = env.REVOCATION_PING_INTERVAL
+REVOCATION_MAX_LAG = env.REVOCATION_MAX_LAG
 redis_db = env.redis_db
 
+CELERY_WORKER_MAX_TASKS_PER_CHILD = env.CELERY_WORKER_MAX_TASKS_PER_CHILD
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = env.CELERY_WORKER_MAX_MEMORY_PER_CHILD
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.CELERY_WORKER_PREFETCH_MULTIPLIER
+CELERY_RESULT_EXPIRES = env.CELERY_RESULT_EXPIRES
+
+OUTBOX_BATCH_SIZE = env.OUTBOX_BATCH_SIZE
+OUTBOX_POLL_INTERVAL = env.OUTBOX_POLL_INTERVAL
+OUTBOX_MAX_ATTEMPTS = env.OUTBOX_MAX_ATTEMPTS
+
 JWT_SECRET_KEY = env.JWT_SECRET_KEY
 TFA_SECRET_KEY = env.TFA_SECRET_KEY
 TOKEN_ALGORITHM = env.TOKEN_ALGORITHM
@@ -71,5 +170,27 @@ SMTP_SERVER = env.SMTP_SERVER
 SMTP_PORT = env.SMTP_PORT
 SMTP_USER = env.SMTP_USER
 SMTP_PASSWORD = env.SMTP_PASSWORD
+SMTP_USE_TLS = env.SMTP_USE_TLS
 
 SITE_BASE_ADDR = env.SITE_BASE_ADDR
+STARTUP_TIME_TARGET = env.STARTUP_TIME_TARGET
+HEALTH_CHECK_INTERVAL = env.HEALTH_CHECK_INTERVAL
+MAIL_HEALTH_CHECK_INTERVAL = env.MAIL_HEALTH_CHECK_INTERVAL
+METRICS_ENABLED = env.METRICS_ENABLED
+
+PROFILING_ENABLED = env.PROFILING_ENABLED
+PROFILING_TOKEN = env.PROFILING_TOKEN
+PROFILING_SAMPLE_RATE = env.PROFILING_SAMPLE_RATE
+PROFILING_FORMAT = env.PROFILING_FORMAT
+PROFILING_INTERVAL = env.PROFILING_INTERVAL
+PROFILING_STORAGE = env.PROFILING_STORAGE
+PROFILING_DIR = env.PROFILING_DIR
+PROFILING_REDIS_DB = env.PROFILING_REDIS_DB
+PROFILING_TTL = env.PROFILING_TTL
+
+TRACING_ENABLED = env.TRACING_ENABLED
+TRACING_EXPORTER = env.TRACING_EXPORTER
+TRACING_FILE = env.TRACING_FILE
+TRACING_OTLP_ENDPOINT = env.TRACING_OTLP_ENDPOINT
+TRACING_SAMPLE_RATE = env.TRACING_SAMPLE_RATE
+TRACING_SERVICE_NAME = env.TRACING_SERVICE_NAME
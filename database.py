@@ -1,6 +1,12 @@
+import itertools
+import time
 from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 
-from sqlalchemy.engine import create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, create_engine
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from collections.abc import Generator
 from typing import Any
@@ -10,17 +16,145 @@ from config import (
     DB_POOL_RECYCLE,
     DB_POOL_SIZE,
     DB_POOL_TIMEOUT,
+    DB_REPLICA_CONNECTION_STRINGS,
+    DB_REPLICA_RETRY_INTERVAL,
+    DB_REPLICA_STRATEGY,
+    SLOW_QUERY_THRESHOLD,
 )
+from logger import setup_logger
+from metrics import InstrumentedQueuePool
+from tracing import start_span
+
+logger = setup_logger("DATABASE")
 
 Base = declarative_base()
-engine = create_engine(
-    url=DB_CONNECTION_STRING,
-    pool_size=DB_POOL_SIZE,
-    max_overflow=DB_MAX_OVERFLOW,
-    pool_recycle=DB_POOL_RECYCLE,
-    pool_timeout=DB_POOL_TIMEOUT,
-    echo=False,
-)
+
+
+@dataclass
+class QueryStats:
+    """
+    Bir istek (veya olcum blogu) boyunca calisan sorgularin sayisi ve toplam suresi
+    """
+
+    count: int = 0
+    duration: float = 0.0
+
+
+# QueryStatsMiddleware her istek icin yeni bir QueryStats atar
+# asyncio.to_thread context'i kopyaladigi icin thread'lerdeki sorgular da ayni nesneye yazilir
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+# assert_max_queries tarafindan kullanilir, context'ten bagimsiz oldugu icin
+# TestClient gibi istegi baska bir thread'de calistiran araclarla da sorgular sayilir
+query_collectors: list[QueryStats] = []
+
+
+# Bir baglantida cursor execute'lar ic ice calismaz, tek bir baslangic zamani yeterlidir
+# Hata veren sorgunun degeri after_cursor_execute'a ulasmaz, bir sonraki sorguda uzerine yazilir
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_start")
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    for collector in query_collectors:
+        collector.count += 1
+        collector.duration += elapsed
+
+    if elapsed > SLOW_QUERY_THRESHOLD:
+        logger.warning("Slow query", extra={"statement": statement[:500], "duration": round(elapsed, 4)})
+
+
+def _create_engine(url: str, label: str) -> Engine:
+    """
+    Ayni havuz ayarlari ve sorgu olcumleri ile engine olusturur, label havuz metriklerinde kullanilir
+    """
+    new_engine = create_engine(
+        url=url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+        echo=False,
+    )
+    new_engine.pool.label = label
+    event.listen(new_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(new_engine, "after_cursor_execute", after_cursor_execute)
+    return new_engine
+
+
+engine = _create_engine(DB_CONNECTION_STRING, "primary")
+# Sadece okuma yapan controller metotlari db_read_session ile bu engine'lere yonlendirilir
+replica_engines = [
+    _create_engine(url.strip(), f"replica{index}")
+    for index, url in enumerate(url for url in DB_REPLICA_CONNECTION_STRINGS.split(",") if url.strip())
+]
+SessionLocal = sessionmaker(bind=engine)
+
+_replica_counter = itertools.count()
+# Baglanilamayan replika bu zamana (monotonic) kadar secilmez
+_replica_down_until: dict[Engine, float] = {}
+
+
+@contextmanager
+def assert_max_queries(max_count: int) -> Generator[QueryStats, Any, None]:
+    """
+    Blok icinde max_count'tan fazla sorgu calisirsa AssertionError yukseltir
+    Testlerde bir endpoint'in veya controller'in sorgu sayisini sinirlamak icin kullanilir
+    Blok suresince surecteki tum sorgular sayilir, eszamanli trafik altinda kullanilmamalidir
+    """
+    stats = QueryStats()
+    query_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        query_collectors.remove(stats)
+
+    if stats.count > max_count:
+        raise AssertionError(f"Expected at most {max_count} queries, {stats.count} queries executed")
+
+
+def replica_candidates() -> list[Engine]:
+    """
+    Kullanilabilir replikalari DB_REPLICA_STRATEGY'ye gore deneme sirasinda doner
+    round_robin her cagrida baslangici bir kaydirir, least_connections kullanimdaki baglanti sayisina gore siralar
+    """
+    now = time.monotonic()
+    healthy = [replica for replica in replica_engines if _replica_down_until.get(replica, 0.0) <= now]
+    if not healthy:
+        return []
+    if DB_REPLICA_STRATEGY == "least_connections":
+        return sorted(healthy, key=lambda replica: replica.pool.checkedout())
+    start = next(_replica_counter) % len(healthy)
+    return healthy[start:] + healthy[:start]
+
+
+def _mark_replica_down(replica: Engine) -> None:
+    _replica_down_until[replica] = time.monotonic() + DB_REPLICA_RETRY_INTERVAL
+    logger.warning("Database replica is unavailable", extra={"replica": replica.pool.label}, exc_info=True)
+
+
+def _connect_replica() -> Session | None:
+    """
+    Siradaki replikaya baglanmis bir oturum doner, hicbirine baglanilamazsa None doner
+    Havuzu dolu (pool_timeout) replika isaretlenmez, sadece bu okuma icin atlanir
+    """
+    for replica in replica_candidates():
+        session = SessionLocal(bind=replica)
+        try:
+            session.connection()
+            return session
+        except PoolTimeoutError:
+            session.close()
+            logger.warning("Database replica pool is exhausted", extra={"replica": replica.pool.label})
+        except DBAPIError:
+            session.close()
+            _mark_replica_down(replica)
+    return None
 
 
 @contextmanager
@@ -28,18 +162,46 @@ def db_session() -> Generator[Session, Any, None]:
     """
     Veritabaninda oturum olusturur
     """
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    try:
-        session.expire_on_commit = False
-        yield session
-        session.commit()
+    with start_span("db_session", "client", {"db.system": engine.dialect.name}):
+        session = SessionLocal()
+        try:
+            session.expire_on_commit = False
+            yield session
+            session.commit()
 
-    except Exception as exc:
-        session.expire_on_commit = True
-        session.rollback()
-        session.expire_all()
-        raise exc
+        except Exception as exc:
+            session.expire_on_commit = True
+            session.rollback()
+            session.expire_all()
+            raise exc
 
-    finally:
-        session.close()
+        finally:
+            session.close()
+
+
+@contextmanager
+def db_read_session(primary: bool = False) -> Generator[Session, Any, None]:
+    """
+    Sadece okuma yapan islemler icin oturum olusturur
+    Replika tanimliysa DB_REPLICA_STRATEGY ile secilen replikaya gider. Baglanilamayan replika
+    DB_REPLICA_RETRY_INTERVAL saniye secilmez, siradaki replika ve en son primary denenir
+    primary True ise (kullanici yeni yazma yaptiysa, bkz. ReadYourWrites) dogrudan primary kullanilir
+    """
+    session = None
+    if replica_engines and not primary:
+        session = _connect_replica()
+    if session is None:
+        with db_session() as session:
+            yield session
+        return
+
+    replica = session.get_bind()
+    with start_span("db_session", "client", {"db.system": replica.dialect.name, "db.replica": replica.pool.label}):
+        try:
+            yield session
+        except DBAPIError as exc:
+            if exc.connection_invalidated:
+                _mark_replica_down(replica)
+            raise
+        finally:
+            session.close()
@@ -1,7 +1,24 @@
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pythonjsonlogger import jsonlogger
+import atexit
+import copy
 import logging
 import os
+import queue
+import threading
+import time
+
+from config import (
+    LOG_FILE_NAME,
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_QUEUE_SIZE,
+    LOG_RATE_LIMIT,
+    LOG_RATE_WINDOW,
+    LOG_SAMPLE_RATES,
+    LOG_SUPPRESSED_REPORT_INTERVAL,
+)
 
 
 class LoggerJsonFormatter(jsonlogger.JsonFormatter):
@@ -14,7 +31,7 @@ class LoggerJsonFormatter(jsonlogger.JsonFormatter):
         super().add_fields(log_record, record, message_dict)
 
         if not log_record.get("timestamp"):
-            log_record["timestamp"] = datetime.now(timezone.utc).isoformat()
+            log_record["timestamp"] = datetime.fromtimestamp(record.created, timezone.utc).isoformat()
 
         if log_record.get("level"):
             log_record["level"] = log_record["level"].upper()
@@ -23,30 +40,276 @@ class LoggerJsonFormatter(jsonlogger.JsonFormatter):
             log_record["level"] = record.levelname
 
 
-def setup_logger(name: str, file_name: str = ""):
+class _KeyState:
+    __slots__ = ("window_start", "count", "seen", "suppressed")
+
+    def __init__(self, now: float) -> None:
+        self.window_start = now
+        self.count = 0
+        self.seen = 0
+        self.suppressed = 0
+
+
+class RateLimitFilter(logging.Filter):
     """
-    Yeni bir logger nesnesi olusturur
-    Bu sekilde her dosyada loglama yapilabilir
+    Ayni mesaj anahtari (logger adi + formatlanmamis mesaj) icin ornekleme ve pencere basina sinir uygular
+    ERROR ve ustu kayitlar her zaman gecer. Bastirilan kayitlar sayilir, pop_suppressed ile toplu alinir
     """
-    file_name = "process.log" if not file_name else file_name
 
-    base_dir = os.path.dirname(__file__)
-    log_path = os.path.join(base_dir, "logs", file_name)
+    def __init__(self, limit: int, window: float, sample_rates: dict[str, float]) -> None:
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        # 0.1 -> her 10 kayittan biri yazilir, 0 -> hic yazilmaz
+        self.sample_every = {msg: round(1 / rate) if rate > 0 else 0 for msg, rate in sample_rates.items()}
+        self.keys: dict[tuple[str, str], _KeyState] = {}
+        self.lock = threading.Lock()
 
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        msg = str(record.msg)
+        every = self.sample_every.get(msg, 1)
+        now = time.monotonic()
+        with self.lock:
+            state = self.keys.get((record.name, msg))
+            if state is None:
+                state = self.keys[(record.name, msg)] = _KeyState(now)
+            elif now - state.window_start >= self.window:
+                state.window_start = now
+                state.count = 0
+
+            state.seen += 1
+            if every != 1 and (every == 0 or (state.seen - 1) % every):
+                state.suppressed += 1
+                return False
+
+            if self.limit and state.count >= self.limit:
+                state.suppressed += 1
+                return False
+
+            state.count += 1
+            return True
+
+    def pop_suppressed(self) -> dict[tuple[str, str], int]:
+        """
+        Bastirilan kayit sayilarini doner ve sifirlar, penceresi biten anahtarlari temizler
+        """
+        now = time.monotonic()
+        suppressed = {}
+        with self.lock:
+            for key, state in list(self.keys.items()):
+                if state.suppressed:
+                    suppressed[key] = state.suppressed
+                    state.suppressed = 0
+                elif now - state.window_start >= self.window and key[1] not in self.sample_every:
+                    del self.keys[key]
+        return suppressed
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Log kayitlarini sinirli bir kuyruga birakir, yazma islemi QueueListener thread'inde yapilir
+    Kuyruk doluysa istek beklemez, kayit atilir ve sayilir
+    Atilan kayit sayisi, kuyrukta yer acildiginda bir uyari kaydi olarak yazilir
+    Rate limit ile bastirilan kayitlarin sayilari LOG_SUPPRESSED_REPORT_INTERVAL'da bir yazilir
+    """
+
+    def __init__(self, log_queue: queue.Queue, rate_limiter: RateLimitFilter) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.reported = 0
+        self.rate_limiter = rate_limiter
+        self.addFilter(rate_limiter)
+        self.next_suppressed_report = time.monotonic() + LOG_SUPPRESSED_REPORT_INTERVAL
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # args sonradan degisebilecegi icin mesaj burada birlestirilir
+        # JSON formatlama ve traceback formatlama listener thread'inde yapilir
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        if self.dropped != self.reported:
+            dropped = self.dropped - self.reported
+            if self.put_summary("Log records dropped, log queue is full", dropped=dropped, total_dropped=self.dropped):
+                self.reported += dropped
+
+        if time.monotonic() >= self.next_suppressed_report:
+            self.report_suppressed()
+
+    def report_suppressed(self) -> None:
+        """
+        Son rapordan beri bastirilan kayitlari anahtar basina bir uyari kaydi olarak yazar
+        """
+        self.next_suppressed_report = time.monotonic() + LOG_SUPPRESSED_REPORT_INTERVAL
+        for (logger_name, msg), suppressed in self.rate_limiter.pop_suppressed().items():
+            self.put_summary("Log records suppressed", logger=logger_name, message_key=msg, suppressed=suppressed)
+
+    def put_summary(self, msg: str, **fields) -> bool:
+        """
+        Pipeline'in kendi uyari kaydini kuyruga ekler, kuyruk doluysa False doner
+        """
+        summary = logging.makeLogRecord(
+            {"name": "LOGGER", "levelno": logging.WARNING, "levelname": "WARNING", "msg": msg, **fields}
+        )
+        try:
+            self.queue.put_nowait(summary)
+            return True
+        except queue.Full:
+            return False
+
+
+class LogPipeline:
+    """
+    Surec basina tek kuyruk + listener
+    Dosya ve konsol handler'lari tum logger'lar tarafindan paylasilir ve sadece listener thread'inden cagrilir
+    """
+
+    def __init__(self, log_path: str) -> None:
+        formatter = LoggerJsonFormatter("%(timestamp)s | [%(level)s] - [%(name)s] - [%(message)s]")
+
+        file_handler = logging.FileHandler(log_path)
+        file_handler.setFormatter(formatter)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        self.handlers = (file_handler, console_handler)
+        rate_limiter = RateLimitFilter(LOG_RATE_LIMIT, LOG_RATE_WINDOW, parse_sample_rates(LOG_SAMPLE_RATES))
+        self.queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE), rate_limiter)
+        # Modul yeniden yuklendiginde eski handler'in pipeline'i bulunup kapatilabilsin diye tutulur
+        self.queue_handler.pipeline = self
+        self.listener = QueueListener(self.queue_handler.queue, *self.handlers)
+        self.listener.start()
+
+    def restart(self) -> None:
+        """
+        Fork sonrasi cocuk surecte listener thread'i yoktur, kuyruk ve listener yeniden olusturulur
+        """
+        self.queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        self.listener = QueueListener(self.queue_handler.queue, *self.handlers)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """
+        Kuyrukta kalan kayitlari yazip listener'i durdurur
+        """
+        self.queue_handler.report_suppressed()
+        self.listener.stop()
 
-    formatter = LoggerJsonFormatter("%(timestamp)s | [%(level)s] - [%(name)s] - [%(message)s]")
+    def close(self) -> None:
+        """
+        Listener'i durdurup dosya tanimlayicilarini kapatir
+        """
+        self.stop()
+        for handler in self.handlers:
+            handler.close()
 
-    file_handler = logging.FileHandler(log_path)
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
 
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(formatter)
+def parse_level(level: str) -> int:
+    """
+    "INFO" veya "20" gibi bir degeri logging seviyesine cevirir
+    """
+    level = level.strip().upper()
+    if level.isdigit():
+        return int(level)
+    try:
+        return logging.getLevelNamesMapping()[level]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level}") from None
+
+
+def parse_logger_levels(levels: str) -> dict[str, int]:
+    """
+    "DATABASE=WARNING,MAIL_CONTROLLER=DEBUG" bicimindeki degeri logger bazli seviyelere cevirir
+    """
+    logger_levels = {}
+    for item in levels.split(","):
+        if not item.strip():
+            continue
+        name, _, level = item.partition("=")
+        logger_levels[name.strip()] = parse_level(level)
+    return logger_levels
+
+
+def parse_sample_rates(rates: str) -> dict[str, float]:
+    """
+    "User direct login is successful=0.1,Task not found=0.1" bicimindeki degeri mesaj bazli orneklere cevirir
+    """
+    sample_rates = {}
+    for item in rates.split(","):
+        if not item.strip():
+            continue
+        msg, _, rate = item.rpartition("=")
+        sample_rates[msg.strip()] = float(rate)
+    return sample_rates
+
+
+_pipeline: LogPipeline | None = None
+_default_level = parse_level(LOG_LEVEL)
+_logger_levels = parse_logger_levels(LOG_LEVELS)
+
+
+def _restart_pipeline() -> None:
+    if _pipeline is not None:
+        _pipeline.restart()
+
+
+def _stop_pipeline() -> None:
+    if _pipeline is not None:
+        _pipeline.stop()
+
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+# Celery prefork worker'lari gibi fork ile olusan sureclerde listener thread'i yeniden baslatilir
+os.register_at_fork(after_in_child=_restart_pipeline)
+atexit.register(_stop_pipeline)
+
+
+def configure_logging() -> LogPipeline:
+    """
+    Surec icin log pipeline'ini bir kez olusturur, sonraki cagrilarda ayni pipeline'i doner
+    """
+    global _pipeline
+    if _pipeline is None:
+        base_dir = os.path.dirname(__file__)
+        _pipeline = LogPipeline(os.path.join(base_dir, "logs", LOG_FILE_NAME))
+    return _pipeline
+
+
+def get_dropped_log_count() -> int:
+    """
+    Bu surecte kuyruk dolu oldugu icin atilan toplam log kaydi sayisi
+    """
+    return _pipeline.queue_handler.dropped if _pipeline is not None else 0
+
+
+def setup_logger(name: str):
+    """
+    Yeni bir logger nesnesi olusturur
+    Bu sekilde her dosyada loglama yapilabilir
+    Ayni isimle tekrar cagrilmasi handler eklemez, tum logger'lar ayni kuyruk handler'ini paylasir
+    """
+    queue_handler = configure_logging().queue_handler
+
+    logger = logging.getLogger(name)
+    logger.setLevel(_logger_levels.get(name, _default_level))
+    for handler in list(logger.handlers):
+        stale_pipeline = getattr(handler, "pipeline", None)
+        if stale_pipeline is not None and handler is not queue_handler:
+            logger.removeHandler(handler)
+            stale_pipeline.close()
+    logger.addHandler(queue_handler)
+    # Celery root logger'a kendi handler'ini ekler, kayitlarin iki kez yazilmamasi icin yayilim kapatilir
+    logger.propagate = False
 
     return logger
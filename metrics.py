@@ -0,0 +1,114 @@
+import os
+import time
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from sqlalchemy.pool import QueuePool
+
+# PROMETHEUS_MULTIPROC_DIR tanimliysa prometheus_client metrikleri surec basina mmap dosyalarina yazar
+# /metrics endpointi bu dizindeki tum uvicorn/celery sureclerinin degerlerini birlestirir
+MULTIPROCESS_MODE = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_COUNT = Counter(
+    "todoapi_http_requests_total",
+    "HTTP istek sayisi",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "todoapi_http_request_duration_seconds",
+    "HTTP istek suresi",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "todoapi_db_pool_checkout_wait_seconds",
+    "SQLAlchemy havuzundan baglanti alma bekleme suresi",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "todoapi_db_pool_checked_out",
+    "Kullanimdaki veritabani baglantisi sayisi",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "todoapi_db_pool_overflow",
+    "pool_size disinda acilmis (overflow) baglanti sayisi",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+REDIS_COMMAND_LATENCY = Histogram(
+    "todoapi_redis_command_duration_seconds",
+    "Redis komut suresi",
+    ["db", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1),
+)
+REDIS_CLIENT_CACHE_REQUESTS = Counter(
+    "todoapi_redis_client_cache_requests_total",
+    "Istemci tarafli Redis onbellegi okumalari (hit, miss, bypass)",
+    ["db", "result"],
+)
+REDIS_CLIENT_CACHE_INVALIDATIONS = Counter(
+    "todoapi_redis_client_cache_invalidations_total",
+    "Redis'ten gelen istemci tarafli onbellek gecersizlestirme mesajlari",
+    ["kind"],
+)
+REDIS_CLIENT_CACHE_SIZE = Gauge(
+    "todoapi_redis_client_cache_keys",
+    "Istemci tarafli Redis onbellegindeki anahtar sayisi",
+    multiprocess_mode="livesum",
+)
+CELERY_ENQUEUE_LATENCY = Histogram(
+    "todoapi_celery_enqueue_duration_seconds",
+    "Celery task mesajinin broker'a yayinlanma suresi",
+    ["task"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5),
+)
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    /metrics icin kullanilacak registry'i doner
+    Multiprocess modda her istekte dizindeki dosyalar okunarak toplanir
+    """
+    if MULTIPROCESS_MODE:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Kapanan surecin livesum gauge degerlerini birlestirmeden cikarir
+    """
+    if MULTIPROCESS_MODE:
+        multiprocess.mark_process_dead(pid)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    Baglanti alma bekleme suresini ve havuz doluluk bilgisini olcen QueuePool
+    Metrikler "pool" etiketi ile ayrilir (primary, replica0, replica1...)
+    """
+
+    label: str = "primary"
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.label).observe(time.perf_counter() - start)
+            DB_POOL_CHECKED_OUT.labels(self.label).set(self.checkedout())
+            DB_POOL_OVERFLOW.labels(self.label).set(max(self.overflow(), 0))
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        DB_POOL_CHECKED_OUT.labels(self.label).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self.label).set(max(self.overflow(), 0))
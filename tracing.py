@@ -0,0 +1,320 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from config import (
+    TRACING_ENABLED,
+    TRACING_EXPORTER,
+    TRACING_FILE,
+    TRACING_OTLP_ENDPOINT,
+    TRACING_SAMPLE_RATE,
+    TRACING_SERVICE_NAME,
+)
+from logger import setup_logger
+
+logger = setup_logger("TRACING")
+
+# OTLP SpanKind degerleri
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL = 1.0
+
+
+@dataclass(slots=True)
+class SpanContext:
+    """
+    W3C trace context bilgisi, traceparent basligi ile surecler arasinda tasinir
+    """
+
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+@dataclass(slots=True)
+class Span:
+    """
+    OTLP span modeline karsilik gelen, bir islemin suresi ve ozellikleri
+    """
+
+    name: str
+    context: SpanContext
+    parent_id: str | None
+    kind: str = "internal"
+    attributes: dict = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    error: str | None = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict:
+        """
+        Span'i OTLP/JSON bicimine cevirir
+        """
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS[self.kind],
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """
+    Tracing kapaliyken donen, hicbir sey yapmayan span
+    """
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+# Tracing kapaliyken start_span her cagrida ayni nesneyi doner, yeni nesne olusturulmaz
+_NOOP_SPAN = nullcontext(_NoopSpan())
+
+current_context: ContextVar[SpanContext | None] = ContextVar("current_span_context", default=None)
+
+
+def otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def extract(traceparent: str | None) -> SpanContext | None:
+    """
+    traceparent basligini cozumler, gecersizse None doner
+    """
+    if not traceparent:
+        return None
+    parts = traceparent.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return SpanContext(parts[1], parts[2], parts[3] == "01")
+
+
+def inject(headers: dict) -> dict:
+    """
+    Aktif span varsa traceparent basligini verilen sozluge ekler
+    """
+    context = current_context.get()
+    if context is not None:
+        headers["traceparent"] = context.to_traceparent()
+    return headers
+
+
+def create_span(
+    name: str, kind: str = "internal", attributes: dict | None = None, parent: SpanContext | None = None
+) -> Span:
+    """
+    Aktif span'in (veya verilen parent'in) altinda yeni bir span olusturur, span aktif yapilmaz
+    with kullanilamayan yerlerde (Celery sinyalleri) finish_span ile kapatilir
+    """
+    parent = parent if parent is not None else current_context.get()
+    if parent is None:
+        context = SpanContext(os.urandom(16).hex(), os.urandom(8).hex(), random.random() < TRACING_SAMPLE_RATE)
+    else:
+        context = SpanContext(parent.trace_id, os.urandom(8).hex(), parent.sampled)
+    return Span(name, context, parent.span_id if parent else None, kind, dict(attributes or {}))
+
+
+def finish_span(span: Span, error: BaseException | None = None) -> None:
+    """
+    Span'i kapatir ve ornekleniyorsa export kuyruguna ekler
+    """
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    if span.context.sampled and _exporter is not None:
+        _exporter.export(span)
+
+
+@contextmanager
+def _span(name: str, kind: str, attributes: dict | None, parent: SpanContext | None) -> Iterator[Span]:
+    span = create_span(name, kind, attributes, parent)
+    token = current_context.set(span.context)
+    error = None
+    try:
+        yield span
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        current_context.reset(token)
+        finish_span(span, error)
+
+
+def start_span(name: str, kind: str = "internal", attributes: dict | None = None, parent: SpanContext | None = None):
+    """
+    with ile kullanilan span. Tracing kapaliyken paylasilan no-op context manager doner
+    """
+    if not TRACING_ENABLED:
+        return _NOOP_SPAN
+    return _span(name, kind, attributes, parent)
+
+
+def traced(name: str | None = None, kind: str = "internal") -> Callable:
+    """
+    Fonksiyonu span ile sarar. Tracing kapaliyken fonksiyonu degistirmeden doner
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if not TRACING_ENABLED:
+            return func
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _span(span_name, kind, None, None):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _span(span_name, kind, None, None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(cls: type) -> type:
+    """
+    Controller siniflarinin "_" ile baslamayan metotlarini span ile sarar
+    Tracing kapaliyken sinifi degistirmeden doner
+    """
+    if not TRACING_ENABLED:
+        return cls
+
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_"):
+            continue
+        span_name = f"{cls.__name__}.{attr}"
+        if isinstance(value, staticmethod):
+            setattr(cls, attr, staticmethod(traced(span_name)(value.__func__)))
+        elif isinstance(value, classmethod):
+            setattr(cls, attr, classmethod(traced(span_name)(value.__func__)))
+        elif inspect.isfunction(value):
+            setattr(cls, attr, traced(span_name)(value))
+    return cls
+
+
+class SpanExporter:
+    """
+    Tamamlanan spanleri sinirli bir kuyrukta toplar, arka plan thread'i toplu olarak
+    TRACING_FILE'a (satir basina bir OTLP/JSON istek govdesi) veya TRACING_OTLP_ENDPOINT'e (OTLP/HTTP JSON) yazar
+    """
+
+    def __init__(self) -> None:
+        self.queue: queue.Queue[Span | None] = queue.Queue(maxsize=EXPORT_BATCH_SIZE * 20)
+        self.dropped = 0
+        self.start()
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.run, name="span-exporter", daemon=True)
+        self.thread.start()
+
+    def restart(self) -> None:
+        """
+        Fork sonrasi cocuk surecte export thread'i yoktur, kuyruk ve thread yeniden olusturulur
+        """
+        self.queue = queue.Queue(maxsize=EXPORT_BATCH_SIZE * 20)
+        self.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: list[Span] = []
+            deadline = time.monotonic() + EXPORT_INTERVAL
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    span = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+
+            if batch:
+                try:
+                    self.flush(batch)
+                except Exception:
+                    logger.warning("Spans could not be exported", exc_info=True, extra={"spans": len(batch)})
+
+    def flush(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": TRACING_SERVICE_NAME}},
+                            {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "todoapi"}, "spans": [span.to_otlp() for span in spans]}],
+                }
+            ]
+        }
+        body = json.dumps(payload).encode()
+        if TRACING_EXPORTER == "otlp":
+            request = urllib.request.Request(
+                TRACING_OTLP_ENDPOINT, data=body, headers={"Content-Type": "application/json"}, method="POST"
+            )
+            with urllib.request.urlopen(request, timeout=5):
+                pass
+        else:
+            with open(os.path.join(os.path.dirname(__file__), TRACING_FILE), "ab") as f:
+                f.write(body + b"\n")
+
+    def stop(self) -> None:
+        """
+        Kuyrukta kalan spanleri yazip thread'i durdurur
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout=10)
+
+
+_exporter: SpanExporter | None = None
+if TRACING_ENABLED:
+    _exporter = SpanExporter()
+    # Celery prefork worker'lari gibi fork ile olusan sureclerde export thread'i yeniden baslatilir
+    os.register_at_fork(after_in_child=_exporter.restart)
+    atexit.register(_exporter.stop)